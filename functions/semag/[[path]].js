@@ -7,10 +7,17 @@ export async function onRequest({ params, env }) {
     return new Response("Not found", { status: 404 })
   }
 
-  return new Response(object.body, {
-    headers: {
-      "Content-Type": object.httpMetadata?.contentType || "application/octet-stream",
-      "Cache-Control": "public, max-age=31536000, immutable"
-    }
-  })
-}
\ No newline at end of file
+  const headers = {
+    "Content-Type": object.httpMetadata?.contentType || "application/octet-stream",
+    "Cache-Control": "public, max-age=31536000, immutable"
+  }
+  // Precompressed Unity builds (*.br / *.gz) are stored with their Content-Encoding;
+  // pass the bytes through as-is instead of letting the runtime re-encode them
+  const contentEncoding = object.httpMetadata?.contentEncoding
+  if (contentEncoding) {
+    headers["Content-Encoding"] = contentEncoding
+    return new Response(object.body, { headers, encodeBody: "manual" })
+  }
+
+  return new Response(object.body, { headers })
+}
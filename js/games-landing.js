@@ -1,39 +1,51 @@
 // Games Landing Page Script
 const GAMES_BASE_URL = window.location.origin;
-let gamelist = [];
+// Tiny index of the sharded catalog (scripts/catalog_shards.py)
+const CATALOG_INDEX = "/data/catalog.json";
+const CATALOG_DIR = "/data/catalog/";
+let catalogIndex = null;
+
+function loadCatalogIndex() {
+    if (catalogIndex) {
+        return Promise.resolve(catalogIndex);
+    }
+    return fetch(CATALOG_INDEX)
+        .then(response => response.json())
+        .then(index => {
+            catalogIndex = index;
+            return index;
+        });
+}
+
+// Pick a game uniformly from the whole catalog but only download the shard it's in
+function randomGame(index) {
+    let n = Math.floor(Math.random() * index.count);
+    const shard = index.alpha.find(s => (n -= s.count) < 0);
+    return fetch(CATALOG_DIR + shard.file)
+        .then(response => response.json())
+        .then(games => games[n + shard.count]);
+}
 
 // Load games data and redirect to random game
 function redirectToRandomGame() {
-    if (gamelist.length > 0) {
-        const randomGame = gamelist[Math.floor(Math.random() * gamelist.length)];
-        const gameData = [randomGame.directory, randomGame.image, randomGame.name];
-        const encoded = btoa(encodeURIComponent(JSON.stringify(gameData)));
-        window.location.href = "loader.html#" + encoded;
-    } else {
-        // Load games first
-        fetch("/data/games.json")
-            .then(response => response.json())
-            .then(data => {
-                gamelist = data;
-                const randomGame = gamelist[Math.floor(Math.random() * gamelist.length)];
-                const gameData = [randomGame.directory, randomGame.image, randomGame.name];
-                const encoded = btoa(encodeURIComponent(JSON.stringify(gameData)));
-                window.location.href = "loader.html#" + encoded;
-            })
-            .catch(error => {
-                console.error("Error loading games:", error);
-                alert("Failed to load games. Please try again.");
-            });
-    }
+    loadCatalogIndex()
+        .then(randomGame)
+        .then(game => {
+            const gameData = [game.directory, game.image, game.name, game.source || "semag", game];
+            const encoded = btoa(encodeURIComponent(JSON.stringify(gameData)));
+            window.location.href = "loader.html#" + encoded;
+        })
+        .catch(error => {
+            console.error("Error loading games:", error);
+            alert("Failed to load games. Please try again.");
+        });
 }
 
 // Load games count for stats
 document.addEventListener("DOMContentLoaded", function() {
-    fetch("/data/games.json")
-        .then(response => response.json())
-        .then(data => {
-            gamelist = data;
-            const gamesCount = data.length;
+    loadCatalogIndex()
+        .then(index => {
+            const gamesCount = index.count;
             
             // Update games count in stats
             const gamesStat = document.getElementById("games-count");
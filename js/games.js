@@ -1,19 +1,58 @@
 const GAMES_BASE_URL = window.location.origin;
+// Prebuilt by scripts/search_index.py; js/search.js loads it on the first search
+window.GAME_SEARCH_INDEX = "/data/search-index.json";
 
-$.getJSON("/data/games.json", function (data) {
+// Sharded catalog written by scripts/catalog_shards.py; shard names are content-hashed
+const CATALOG_INDEX = "/data/catalog.json";
+const CATALOG_DIR = "/data/catalog/";
+
+function whenReady(callback) {
 	if (document.readyState === "complete") {
-		loadGames(data);
+		callback();
 	} else {
 		let areGamesReady = setInterval(() => {
 			if (document.readyState === "complete") {
-				loadGames(data);
+				callback();
 				clearInterval(areGamesReady);
 			}
 		}, 50);
 	}
-});
+}
+
+// Draw the first page as soon as it arrives, then the full catalog from the alphabetical shards
+function loadCatalog() {
+	let fullCatalogLoaded = false;
+	$.getJSON(CATALOG_INDEX)
+		.done(function (index) {
+			$.getJSON(CATALOG_DIR + index.first.file, function (page) {
+				whenReady(() => {
+					if (!fullCatalogLoaded) {
+						loadGames(page, index.count);
+					}
+				});
+			});
+			Promise.all(index.alpha.map((shard) => fetch(CATALOG_DIR + shard.file).then((response) => response.json())))
+				.then((shards) => {
+					const data = [].concat(...shards);
+					whenReady(() => {
+						fullCatalogLoaded = true;
+						// js/search.js only trusts a search index built from this same games.json
+						window.GAME_CATALOG_HASH = index.catalog;
+						loadGames(data);
+					});
+				})
+				.catch((error) => {
+					console.error("Error loading catalog shards:", error);
+					$.getJSON("/data/games.json", (data) => whenReady(() => loadGames(data)));
+				});
+		})
+		.fail(function () {
+			$.getJSON("/data/games.json", (data) => whenReady(() => loadGames(data)));
+		});
+}
+loadCatalog();
 
-function loadGames(data) {
+function loadGames(data, total) {
 	starredgames = getCookie("starred");
 	if (!starredgames) {
 		starredgames = [];
@@ -30,10 +69,12 @@ function loadGames(data) {
 		}
 	}
 	$("#gamesearch").prop({
-		placeholder: "Click here to search through our " + data.length + " games!",
+		placeholder: "Click here to search through our " + (total || data.length) + " games!",
 	});
 	data.sort(dynamicSort("name"));
 	gamelist = data;
+	// Replaces the first page when the full catalog arrives
+	$("#games .game").remove();
 	for (let i = 0; i < data.length; i++) {
 		const source = data[i].source || "semag";
 		// semag uses hardcoded external URL, non-semag uses local paths for local development
@@ -104,10 +145,12 @@ function loadGames(data) {
 
 	// starred games
 	let starred;
-	$(document).on("click", "img.star", function (event) {
+	// Namespaced so a second loadGames (first page, then full catalog) doesn't bind twice
+	$(document).off("click.games");
+	$(document).on("click.games", "img.star", function (event) {
 
 	});
-	$(document).on("click", ".game", function (event) {
+	$(document).on("click.games", ".game", function (event) {
 		if ($(event.target).is("img.star")) {
 			event.preventDefault();
 			event.stopPropagation();
@@ -202,7 +245,7 @@ function loadGames(data) {
 			}
 		}
 	});
-	$(document).on("click", "#game img .star", function (event) {
+	$(document).on("click.games", "#game img .star", function (event) {
 		event.stopPropagation();
 		$(this).prop({ class: "material-symbols-outlined fill" });
 	});
@@ -272,64 +315,72 @@ function recommendedGames() {
 	}
 }
 
+// Category -> game directories, precomputed by scripts/category_tagger.py
+const CATEGORY_INDEX = "/data/categories.json";
+let categoryIndex = null;
+function loadCategoryIndex(callback) {
+	if (categoryIndex) {
+		callback(categoryIndex);
+		return;
+	}
+	$.getJSON(CATEGORY_INDEX)
+		.done(function (index) {
+			categoryIndex = index;
+			callback(index);
+		})
+		.fail(function () {
+			console.error("Failed to load " + CATEGORY_INDEX);
+		});
+}
+
 // Category changer function - shows/hides category filter
 let categoryViewOpen = false;
 function categoryChanger() {
 	if (!categoryViewOpen) {
-		// Create category modal/overlay
-		const categories = ['Action', 'Adventure', 'Puzzle', 'Racing', 'Sports', 'Strategy', 'Shooter', 'RPG'];
-		let categoryHTML = '<div id="categoryModal" style="position: fixed; top: 0; left: 0; right: 0; bottom: 0; background: rgba(0, 0, 0, 0.95); z-index: 10000; display: flex; align-items: center; justify-content: center;">';
-		categoryHTML += '<div style="background: rgba(0, 0, 0, 0.98); border: 1px solid rgba(0, 255, 0, 0.3); border-radius: 10px; padding: 2rem; max-width: 600px; width: 90%; box-shadow: 0 0 30px rgba(0, 255, 0, 0.3);">';
-		categoryHTML += '<h2 style="color: #00ff00; margin-bottom: 1.5rem; text-align: center; text-shadow: 0 0 10px rgba(0, 255, 0, 0.5);">Game Categories</h2>';
-		categoryHTML += '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 1rem;">';
-		
-		// Add "All Games" option
-		categoryHTML += '<button onclick="filterByCategory(\'\'); document.getElementById(\'categoryModal\').remove(); categoryViewOpen = false;" style="padding: 1rem; background: rgba(0, 255, 0, 0.1); border: 1px solid rgba(0, 255, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer; transition: all 0.3s;">All Games</button>';
-		
-		categories.forEach(cat => {
-			categoryHTML += `<button onclick="filterByCategory('${cat}'); document.getElementById('categoryModal').remove(); categoryViewOpen = false;" style="padding: 1rem; background: rgba(0, 255, 0, 0.1); border: 1px solid rgba(0, 255, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer; transition: all 0.3s;" onmouseover="this.style.background='rgba(0, 255, 0, 0.2)'; this.style.boxShadow='0 0 10px rgba(0, 255, 0, 0.5)';" onmouseout="this.style.background='rgba(0, 255, 0, 0.1)'; this.style.boxShadow='none';">${cat}</button>`;
-		});
-		
-		categoryHTML += '</div>';
-		categoryHTML += '<button onclick="document.getElementById(\'categoryModal\').remove(); categoryViewOpen = false;" style="margin-top: 1.5rem; width: 100%; padding: 0.75rem; background: rgba(255, 0, 0, 0.2); border: 1px solid rgba(255, 0, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer;">Close</button>';
-		categoryHTML += '</div></div>';
-		
-		$('body').append(categoryHTML);
-		categoryViewOpen = true;
+		loadCategoryIndex(showCategoryModal);
 	} else {
 		$('#categoryModal').remove();
 		categoryViewOpen = false;
 	}
 }
 
-// Filter games by category (basic implementation - can be enhanced with actual category data)
+function showCategoryModal(index) {
+	if (categoryViewOpen) {
+		return;
+	}
+	// Create category modal/overlay
+	const categories = Object.keys(index.categories);
+	let categoryHTML = '<div id="categoryModal" style="position: fixed; top: 0; left: 0; right: 0; bottom: 0; background: rgba(0, 0, 0, 0.95); z-index: 10000; display: flex; align-items: center; justify-content: center;">';
+	categoryHTML += '<div style="background: rgba(0, 0, 0, 0.98); border: 1px solid rgba(0, 255, 0, 0.3); border-radius: 10px; padding: 2rem; max-width: 600px; width: 90%; box-shadow: 0 0 30px rgba(0, 255, 0, 0.3);">';
+	categoryHTML += '<h2 style="color: #00ff00; margin-bottom: 1.5rem; text-align: center; text-shadow: 0 0 10px rgba(0, 255, 0, 0.5);">Game Categories</h2>';
+	categoryHTML += '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 1rem;">';
+	
+	// Add "All Games" option
+	categoryHTML += '<button onclick="filterByCategory(\'\'); document.getElementById(\'categoryModal\').remove(); categoryViewOpen = false;" style="padding: 1rem; background: rgba(0, 255, 0, 0.1); border: 1px solid rgba(0, 255, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer; transition: all 0.3s;">All Games</button>';
+	
+	categories.forEach(cat => {
+		categoryHTML += `<button onclick="filterByCategory('${cat}'); document.getElementById('categoryModal').remove(); categoryViewOpen = false;" style="padding: 1rem; background: rgba(0, 255, 0, 0.1); border: 1px solid rgba(0, 255, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer; transition: all 0.3s;" onmouseover="this.style.background='rgba(0, 255, 0, 0.2)'; this.style.boxShadow='0 0 10px rgba(0, 255, 0, 0.5)';" onmouseout="this.style.background='rgba(0, 255, 0, 0.1)'; this.style.boxShadow='none';">${cat}</button>`;
+	});
+	
+	categoryHTML += '</div>';
+	categoryHTML += '<button onclick="document.getElementById(\'categoryModal\').remove(); categoryViewOpen = false;" style="margin-top: 1.5rem; width: 100%; padding: 0.75rem; background: rgba(255, 0, 0, 0.2); border: 1px solid rgba(255, 0, 0, 0.3); color: #fff; border-radius: 8px; cursor: pointer;">Close</button>';
+	categoryHTML += '</div></div>';
+	
+	$('body').append(categoryHTML);
+	categoryViewOpen = true;
+}
+
+// Filter games by category: one lookup in the category index instead of matching card titles
 function filterByCategory(category) {
 	if (!category || category === '') {
 		$("#games .game").show();
 		return;
 	}
 	
-	// Simple filter based on game name keywords
-	$("#games .game").each(function() {
-		const gameName = $(this).find('h1').text().toLowerCase();
-		const categoryLower = category.toLowerCase();
-		let show = false;
-		
-		// Basic keyword matching (this is a simple implementation)
-		if (categoryLower === 'action' && (gameName.includes('war') || gameName.includes('fight') || gameName.includes('battle'))) {
-			show = true;
-		} else if (categoryLower === 'puzzle' && (gameName.includes('puzzle') || gameName.includes('2048') || gameName.includes('lines'))) {
-			show = true;
-		} else if (categoryLower === 'racing' && (gameName.includes('race') || gameName.includes('car') || gameName.includes('drive'))) {
-			show = true;
-		} else if (categoryLower === 'sports' && (gameName.includes('soccer') || gameName.includes('football') || gameName.includes('basketball'))) {
-			show = true;
-		}
-		
-		if (show) {
-			$(this).show();
-		} else {
-			$(this).hide();
-		}
+	loadCategoryIndex(function (index) {
+		const ids = new Set(index.categories[category] || []);
+		$("#games .game").each(function () {
+			$(this).toggle(ids.has(this.id));
+		});
 	});
 }
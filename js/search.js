@@ -4,6 +4,148 @@
     
     var searchInitialized = false;
     
+    // Prebuilt index (scripts/search_index.py); pages opt in by setting window.GAME_SEARCH_INDEX
+    var searchIndex = null;
+    var indexLoading = null;
+    var decodedPostings = {};
+    var cardsById = null;
+    var cardCount = -1;
+    var visibleCards = {};
+    var scanned = false;
+    
+    // Must match normalize() in scripts/search_index.py
+    function normalize(text) {
+        text = String(text || '');
+        if (text.normalize) {
+            text = text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+        }
+        return text.toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+    }
+    
+    function loadIndex() {
+        if (!indexLoading && window.GAME_SEARCH_INDEX && window.fetch) {
+            indexLoading = fetch(window.GAME_SEARCH_INDEX)
+                .then(function(response) {
+                    if (!response.ok) throw new Error('HTTP ' + response.status);
+                    return response.json();
+                })
+                .then(function(index) {
+                    searchIndex = index;
+                    performSearch();
+                })
+                .catch(function(e) {
+                    console.warn('Search index unavailable, scanning cards instead:', e);
+                });
+        }
+        return indexLoading;
+    }
+    
+    function postings(i) {
+        if (!decodedPostings[i]) {
+            var docs = [], current = 0;
+            searchIndex.docs[i].split('.').forEach(function(part) {
+                current += parseInt(part, 36);
+                docs.push(current);
+            });
+            decodedPostings[i] = docs;
+        }
+        return decodedPostings[i];
+    }
+    
+    function lowerBound(tokens, value) {
+        var lo = 0, hi = tokens.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >>> 1;
+            if (tokens[mid] < value) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+    
+    // Games with a token starting with word, else with a token containing it
+    function wordDocs(word) {
+        var tokens = searchIndex.tokens;
+        var lo = lowerBound(tokens, word), hi = lowerBound(tokens, word + '{');
+        var positions = [];
+        if (lo < hi) {
+            for (var i = lo; i < hi; i++) positions.push(i);
+        } else {
+            tokens.forEach(function(token, i) {
+                if (token.indexOf(word) !== -1) positions.push(i);
+            });
+        }
+        var docs = {};
+        positions.forEach(function(i) {
+            postings(i).forEach(function(doc) { docs[doc] = true; });
+        });
+        return docs;
+    }
+    
+    function indexSearch(term) {
+        var words = normalize(term).split(' ').filter(Boolean);
+        words.sort(function(a, b) { return b.length - a.length; });
+        var matched = null;
+        for (var w = 0; w < words.length; w++) {
+            var docs = wordDocs(words[w]);
+            if (matched) {
+                Object.keys(matched).forEach(function(doc) {
+                    if (!docs[doc]) delete matched[doc];
+                });
+            } else {
+                matched = docs;
+            }
+            if (!Object.keys(matched).length) break;
+        }
+        return Object.keys(matched || {}).map(function(doc) { return searchIndex.ids[doc]; });
+    }
+    
+    function cardIndex(container) {
+        if (!cardsById || container.children.length !== cardCount) {
+            cardsById = {};
+            container.querySelectorAll('.game').forEach(function(card) {
+                if (card.id) cardsById[card.id] = card;
+            });
+            cardCount = container.children.length;
+        }
+        return cardsById;
+    }
+    
+    // Only the cards whose state changes are touched; the rest are hidden by #games.search-active
+    function showMatches(container, ids) {
+        var cards = cardIndex(container);
+        var next = {};
+        ids.forEach(function(id) {
+            if (cards[id]) next[id] = cards[id];
+        });
+        Object.keys(visibleCards).forEach(function(id) {
+            if (!next[id]) visibleCards[id].classList.remove('search-visible');
+        });
+        Object.keys(next).forEach(function(id) {
+            if (!visibleCards[id]) next[id].classList.add('search-visible');
+        });
+        visibleCards = next;
+        container.classList.add('search-active');
+        return ids.length;
+    }
+    
+    // Undo the inline styles and classes left by a card scan (e.g. one made before the index loaded)
+    function resetScan(container) {
+        container.querySelectorAll('.game').forEach(function(game) {
+            game.classList.remove('search-hidden', 'search-visible');
+            game.style.removeProperty('display');
+            game.style.removeProperty('visibility');
+            game.style.removeProperty('opacity');
+        });
+        scanned = false;
+    }
+    
+    function clearIndexSearch(container) {
+        Object.keys(visibleCards).forEach(function(id) {
+            visibleCards[id].classList.remove('search-visible');
+        });
+        visibleCards = {};
+        container.classList.remove('search-active');
+    }
+    
     // Main search function
     function performSearch() {
         var searchInput = document.getElementById('gamesearch');
@@ -20,9 +162,37 @@
             return;
         }
         
-        var allGames = gamesContainer.querySelectorAll('.game');
         var suggestCard = gamesContainer.querySelector('.suggest');
         
+        if (searchTerm !== '') {
+            loadIndex();
+        }
+        // A stale index (built from another games.json than the cards) falls back to scanning the cards
+        if (searchIndex && searchIndex.catalog && searchIndex.catalog === window.GAME_CATALOG_HASH &&
+            searchIndex.count === Object.keys(cardIndex(gamesContainer)).length) {
+            if (scanned) {
+                resetScan(gamesContainer);
+            }
+            if (searchTerm === '') {
+                clearIndexSearch(gamesContainer);
+                if (suggestCard) {
+                    suggestCard.style.removeProperty('display');
+                    suggestCard.removeAttribute('hidden');
+                }
+                return;
+            }
+            if (suggestCard) {
+                suggestCard.style.display = 'none';
+            }
+            var found = showMatches(gamesContainer, indexSearch(searchTerm));
+            console.log('Search complete: ' + found + ' matches (index) for "' + searchTerm + '"');
+            return;
+        }
+        clearIndexSearch(gamesContainer);
+        scanned = true;
+        
+        var allGames = gamesContainer.querySelectorAll('.game');
+        
         console.log('Searching for: "' + searchTerm + '", found ' + allGames.length + ' games');
         
         // If search is empty, show everything
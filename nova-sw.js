@@ -0,0 +1,121 @@
+/**
+ * Nova Hub game precache Service Worker.
+ *
+ * loader.html registers this when the opened game has a list in
+ * /precache/index.json (generated by scripts/precache_manifest.py) and posts
+ * the list here. Each game gets its own cache; files whose revision changed
+ * are re-fetched, files dropped from the list are deleted, and only the
+ * MAX_GAMES most recently played games keep a cache. Requests under
+ * /semag/ and /non-semag/ are answered from those caches (ignoring query
+ * strings like the loader's ?_t= cache-buster); everything else, and any miss,
+ * goes to the network untouched.
+ */
+
+const CACHE_PREFIX = "nova-game:";
+const META_NAME = "__nova-precache__";
+const CONCURRENCY = 6;
+// Older game caches are evicted, least recently played first
+const MAX_GAMES = 5;
+const GAME_PATHS = ["/semag/", "/non-semag/"];
+
+let gameDirs = null;
+
+function loadGameDirs() {
+  if (!gameDirs) {
+    gameDirs = caches.keys().then(names =>
+      names.filter(name => name.startsWith(CACHE_PREFIX)).map(name => name.slice(CACHE_PREFIX.length))
+    );
+  }
+  return gameDirs;
+}
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", event => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("message", event => {
+  const data = event.data || {};
+  if (data.type === "precache" && typeof data.dir === "string" && Array.isArray(data.files)) {
+    event.waitUntil(precache(data.dir, data.version, data.files));
+  }
+});
+
+async function precache(dir, version, files) {
+  const cache = await caches.open(CACHE_PREFIX + dir);
+  gameDirs = null;
+  const metaResponse = await cache.match(dir + META_NAME);
+  const meta = metaResponse ? await metaResponse.json() : { version: null, revisions: {} };
+  if (meta.version === version) {
+    await saveMeta(cache, dir, meta);
+    return evictOldGames();
+  }
+
+  const revisions = {};
+  const todo = [];
+  for (const [url, revision] of files) {
+    revisions[url] = revision;
+    if (meta.revisions[url] !== revision || !(await cache.match(url))) todo.push(url);
+  }
+  for (const url of Object.keys(meta.revisions)) {
+    if (!(url in revisions)) await cache.delete(url);
+  }
+
+  let complete = true;
+  async function worker() {
+    while (todo.length) {
+      const url = todo.shift();
+      try {
+        const response = await fetch(url, { cache: "no-cache" });
+        if (!response.ok) throw new Error(response.status);
+        await cache.put(url, response);
+      } catch (e) {
+        // Retried on the next launch
+        complete = false;
+        delete revisions[url];
+      }
+    }
+  }
+  await Promise.all(Array.from({ length: CONCURRENCY }, worker));
+  await saveMeta(cache, dir, { version: complete ? version : null, revisions });
+  await evictOldGames();
+}
+
+function saveMeta(cache, dir, meta) {
+  return cache.put(dir + META_NAME, new Response(
+    JSON.stringify(Object.assign({}, meta, { played: Date.now() })),
+    { headers: { "Content-Type": "application/json" } }
+  ));
+}
+
+async function evictOldGames() {
+  const names = (await caches.keys()).filter(name => name.startsWith(CACHE_PREFIX));
+  if (names.length <= MAX_GAMES) return;
+  const played = await Promise.all(names.map(async name => {
+    const dir = name.slice(CACHE_PREFIX.length);
+    const response = await (await caches.open(name)).match(dir + META_NAME);
+    const meta = response ? await response.json() : {};
+    return { name, played: meta.played || 0 };
+  }));
+  played.sort((a, b) => b.played - a.played);
+  await Promise.all(played.slice(MAX_GAMES).map(entry => caches.delete(entry.name)));
+  gameDirs = null;
+}
+
+async function fromCache(request, url) {
+  const dirs = await loadGameDirs();
+  const dir = dirs.find(d => url.pathname.startsWith(d));
+  if (dir) {
+    const cache = await caches.open(CACHE_PREFIX + dir);
+    const cached = await cache.match(request, { ignoreSearch: true, ignoreVary: true });
+    if (cached) return cached;
+  }
+  return fetch(request);
+}
+
+self.addEventListener("fetch", event => {
+  const request = event.request;
+  if (request.method !== "GET" || request.headers.has("range")) return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin || !GAME_PATHS.some(p => url.pathname.startsWith(p))) return;
+  if (url.pathname.endsWith(META_NAME)) return;
+  event.respondWith(fromCache(request, url));
+});
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Pack a game's small asset files into one bundle to save round-trips.
+
+HTML5 games often load hundreds of tiny sprites, JSON and sound files, each
+its own request; on a high-latency network the round-trips cost more than the
+bytes. `pack` concatenates a game's small files into nova-bundle.<hash>.bin
+and writes nova-bundle.js, a shim holding the {path: [offset, length, type]}
+index that downloads the bundle once and answers fetch(), XMLHttpRequest and
+Image.src loads of those paths from it (as Blob slices, no copies). The shim
+is injected as the first script of the game's top-level HTML files.
+
+The original files stay where they are: anything the shim doesn't intercept
+(CSS url(), <img> in markup, sync XHR before the bundle arrived) still loads
+from the network, and a missing bundle just means no speed-up.
+
+Usage:
+    python scripts/asset_bundler.py scan
+    python scripts/asset_bundler.py pack non-semag/some-game --dry-run
+    python scripts/asset_bundler.py pack --all --max-file 65536
+    python scripts/asset_bundler.py unpack non-semag/some-game
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from for_each_game import SKIP_DIRS, iter_games
+from local_server import content_type
+from novahub_config import ROOT_DIR
+from verified_download import MANIFEST_NAME
+
+SHIM_NAME = 'nova-bundle.js'
+BUNDLE_PREFIX = 'nova-bundle.'
+BUNDLE_MARKER = 'data-nova-bundle'
+# Files at most this big are bundled
+MAX_FILE = 32 * 1024
+# Stop adding files once the bundle reaches this size
+MAX_BUNDLE = 8 * 1024 * 1024
+# Fewer small files than this isn't worth a bundle
+MIN_FILES = 20
+# Asset types games fetch at runtime; scripts, styles and pages stay separate
+BUNDLE_EXTS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg',
+    '.json', '.txt', '.xml', '.csv', '.atlas', '.fnt', '.plist', '.tmx', '.tsx',
+    '.ogg', '.mp3', '.m4a', '.wav',
+    '.glsl', '.frag', '.vert', '.bin',
+}
+
+TAG_RE = re.compile(rf'<script\b[^>]*\b{BUNDLE_MARKER}\b[^>]*>\s*</script>\s*', re.IGNORECASE)
+HEAD_RE = re.compile(r'<head\b[^>]*>', re.IGNORECASE)
+EXTERNAL_BASE_RE = re.compile(r'<base\b[^>]*\bhref\s*=\s*["\']?(?:https?:)?//', re.IGNORECASE)
+
+SHIM = r"""/* Generated by scripts/asset_bundler.py; do not edit. */
+(function () {
+  var BUNDLE = %(bundle)s;
+  var FILES = %(files)s;
+  var script = document.currentScript;
+  var base = new URL('.', script ? script.src : location.href);
+  var blob = null, urls = {};
+  var ready = fetch(new URL(BUNDLE, base).href).then(function (r) {
+    if (!r.ok) throw new Error('HTTP ' + r.status);
+    return r.blob();
+  }).then(function (b) { blob = b; }, function () { FILES = {}; });
+
+  function lookup(url) {
+    var u, key;
+    try {
+      u = new URL(url, document.baseURI);
+      if (u.origin !== base.origin || u.pathname.indexOf(base.pathname) !== 0) return null;
+      key = decodeURIComponent(u.pathname.slice(base.pathname.length));
+    } catch (e) {
+      return null;
+    }
+    return Object.prototype.hasOwnProperty.call(FILES, key) ? key : null;
+  }
+  function part(key) {
+    var e = FILES[key];
+    return blob.slice(e[0], e[0] + e[1], e[2]);
+  }
+  function blobUrl(key) {
+    return urls[key] || (urls[key] = URL.createObjectURL(part(key)));
+  }
+
+  var nativeFetch = window.fetch;
+  window.fetch = function (input, init) {
+    var request = typeof Request !== 'undefined' && input instanceof Request ? input : null;
+    var method = (init && init.method) || (request ? request.method : 'GET');
+    var key = String(method).toUpperCase() === 'GET' && lookup(request ? request.url : String(input));
+    var args = arguments;
+    if (!key) return nativeFetch.apply(window, args);
+    return ready.then(function () {
+      if (!blob) return nativeFetch.apply(window, args);
+      return new Response(part(key), {
+        status: 200,
+        headers: { 'Content-Type': FILES[key][2], 'Content-Length': String(FILES[key][1]) }
+      });
+    });
+  };
+
+  // XHR: point bundled GETs at a blob: URL; async requests made before the
+  // bundle arrived are opened (with their headers) once it has
+  var XHR = XMLHttpRequest.prototype;
+  var open = XHR.open, send = XHR.send, setRequestHeader = XHR.setRequestHeader;
+  XHR.open = function (method, url, async) {
+    var key = String(method).toUpperCase() === 'GET' && lookup(url);
+    this.__novaPending = null;
+    if (key && blob) {
+      var args = Array.prototype.slice.call(arguments);
+      args[1] = blobUrl(key);
+      return open.apply(this, args);
+    }
+    if (key && async !== false) {
+      this.__novaPending = { key: key, args: Array.prototype.slice.call(arguments), headers: [] };
+      return;
+    }
+    return open.apply(this, arguments);
+  };
+  XHR.setRequestHeader = function () {
+    if (this.__novaPending) return this.__novaPending.headers.push(arguments);
+    return setRequestHeader.apply(this, arguments);
+  };
+  XHR.send = function (body) {
+    var xhr = this, pending = this.__novaPending;
+    if (!pending) return send.apply(this, arguments);
+    this.__novaPending = null;
+    ready.then(function () {
+      if (blob) pending.args[1] = blobUrl(pending.key);
+      open.apply(xhr, pending.args);
+      pending.headers.forEach(function (h) { setRequestHeader.apply(xhr, h); });
+      send.call(xhr, body);
+    });
+  };
+
+  var imageSrc = Object.getOwnPropertyDescriptor(HTMLImageElement.prototype, 'src');
+  if (imageSrc && imageSrc.set) {
+    Object.defineProperty(HTMLImageElement.prototype, 'src', {
+      configurable: true,
+      enumerable: imageSrc.enumerable,
+      get: imageSrc.get,
+      set: function (value) {
+        var key = blob && lookup(value);
+        imageSrc.set.call(this, key ? blobUrl(key) : value);
+      }
+    });
+  }
+
+  window.__novaBundle = { files: Object.keys(FILES).length, ready: ready };
+})();
+"""
+
+
+def entry_pages(game_dir):
+    return sorted(p for p in game_dir.iterdir() if p.is_file() and p.suffix.lower() in ('.html', '.htm'))
+
+
+def small_files(game_dir, max_file=MAX_FILE, exts=BUNDLE_EXTS):
+    """[(relative path, Path, size)] of bundleable files, in path order"""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(game_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if filename == MANIFEST_NAME or filename.startswith(BUNDLE_PREFIX):
+                continue
+            if path.suffix.lower() not in exts:
+                continue
+            size = path.stat().st_size
+            if 0 < size <= max_file:
+                found.append((path.relative_to(game_dir).as_posix(), path, size))
+    return found
+
+
+def inject_tag(text, src):
+    """HTML with the shim <script> as the first thing in <head> (replacing an older one)"""
+    text = TAG_RE.sub('', text)
+    tag = f'<script src="{src}" {BUNDLE_MARKER}></script>'
+    head = HEAD_RE.search(text)
+    if head:
+        return text[:head.end()] + tag + text[head.end():]
+    return tag + text
+
+
+def write_atomic(path, data):
+    # Pages are read with surrogateescape, so non-UTF-8 bytes round-trip unchanged
+    tmp_path = path.with_name(path.name + '.tmp')
+    if isinstance(data, str):
+        tmp_path.write_text(data, encoding='utf-8', errors='surrogateescape', newline='')
+    else:
+        tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def remove_bundle_files(game_dir, keep=None):
+    for path in game_dir.glob(BUNDLE_PREFIX + '*.bin'):
+        if path.name != keep:
+            path.unlink()
+
+
+def pack_game(game_dir, max_file=MAX_FILE, max_bundle=MAX_BUNDLE, min_files=MIN_FILES, dry_run=False):
+    """Bundle one game's small files. Returns a result dict; 'skipped' holds the reason when nothing was done."""
+    game_dir = Path(game_dir)
+    result = {'game': game_dir.name, 'files': 0, 'bytes': 0, 'bundle': None, 'pages': [], 'skipped': None}
+    pages = entry_pages(game_dir)
+    if not pages:
+        result['skipped'] = 'no top-level HTML page'
+        return result
+    if any(EXTERNAL_BASE_RE.search(p.read_text(encoding='utf-8', errors='ignore')) for p in pages):
+        result['skipped'] = 'assets resolve against an external <base>'
+        return result
+
+    index, chunks, offset = {}, [], 0
+    for rel, path, size in small_files(game_dir, max_file):
+        if offset + size > max_bundle:
+            break
+        index[rel] = [offset, size, content_type(path.name).split(';')[0]]
+        chunks.append(path.read_bytes())
+        offset += size
+    result['files'], result['bytes'] = len(index), offset
+    if len(index) < min_files:
+        result['skipped'] = f"only {len(index)} small files"
+        return result
+
+    data = b''.join(chunks)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    bundle_name = f"{BUNDLE_PREFIX}{digest}.bin"
+    result['bundle'] = bundle_name
+    shim = SHIM % {'bundle': json.dumps(bundle_name), 'files': json.dumps(index, separators=(',', ':'))}
+    src = f"{SHIM_NAME}?v={digest}"
+    for page in pages:
+        with open(page, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            text = f.read()
+        new_text = inject_tag(text, src)
+        if new_text != text:
+            result['pages'].append(page.name)
+            if not dry_run:
+                write_atomic(page, new_text)
+    if not dry_run:
+        write_atomic(game_dir / bundle_name, data)
+        write_atomic(game_dir / SHIM_NAME, shim)
+        remove_bundle_files(game_dir, keep=bundle_name)
+    return result
+
+
+def unpack_game(game_dir):
+    """Remove a game's bundle, shim and injected tags. Returns True if anything was removed."""
+    game_dir = Path(game_dir)
+    changed = False
+    for page in entry_pages(game_dir):
+        with open(page, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            text = f.read()
+        new_text = TAG_RE.sub('', text)
+        if new_text != text:
+            write_atomic(page, new_text)
+            changed = True
+    shim = game_dir / SHIM_NAME
+    if shim.exists():
+        shim.unlink()
+        changed = True
+    bundles = list(game_dir.glob(BUNDLE_PREFIX + '*.bin'))
+    remove_bundle_files(game_dir)
+    return changed or bool(bundles)
+
+
+def game_dirs(paths, all_games=False):
+    dirs = [Path(p) for p in paths]
+    if all_games:
+        dirs += [game.path for game in iter_games() if game.is_dir]
+    return dirs
+
+
+def display(path):
+    path = Path(path).resolve()
+    return path.relative_to(ROOT_DIR) if path.is_relative_to(ROOT_DIR) else path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bundle small game assets into one request')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('scan', 'Report games that would benefit from a bundle'),
+                            ('pack', 'Write bundles and inject the loader shim'),
+                            ('unpack', 'Remove bundles and the loader shim')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('dirs', nargs='*', help='Game directories')
+        p.add_argument('--all', action='store_true', help='Every directory game under non-semag/')
+        if name != 'unpack':
+            p.add_argument('--max-file', type=int, default=MAX_FILE, help=f'Largest file to bundle (default {MAX_FILE})')
+            p.add_argument('--max-bundle', type=int, default=MAX_BUNDLE, help='Bundle size cap in bytes')
+            p.add_argument('--min-files', type=int, default=MIN_FILES, help='Skip games with fewer small files')
+        if name == 'pack':
+            p.add_argument('--dry-run', action='store_true', help="Don't write files")
+    args = parser.parse_args()
+
+    dirs = game_dirs(args.dirs, args.all or (args.command == 'scan' and not args.dirs))
+    if not dirs:
+        parser.error('give game directories or --all')
+    missing = [d for d in dirs if not d.is_dir()]
+    if missing:
+        print(f"✗ Not a directory: {', '.join(map(str, missing))}")
+        sys.exit(1)
+
+    if args.command == 'unpack':
+        for game_dir in dirs:
+            if unpack_game(game_dir):
+                print(f"  ✓ {display(game_dir)}: bundle removed")
+        return
+
+    packed = requests_saved = 0
+    for game_dir in dirs:
+        result = pack_game(game_dir, args.max_file, args.max_bundle, args.min_files,
+                           dry_run=args.command == 'scan' or args.dry_run)
+        if result['skipped']:
+            if args.dirs:
+                print(f"  - {display(game_dir)}: skipped ({result['skipped']})")
+            continue
+        packed += 1
+        requests_saved += result['files'] - 1
+        mark = '~' if args.command == 'scan' or args.dry_run else '✓'
+        print(f"  {mark} {display(game_dir)}: {result['files']} files, {result['bytes']:,} bytes -> {result['bundle']}"
+              f"{' (' + ', '.join(result['pages']) + ')' if result['pages'] else ''}")
+    print(f"\n{packed} of {len(dirs)} games bundled, ~{requests_saved} requests saved per cold load")
+
+
+if __name__ == "__main__":
+    main()
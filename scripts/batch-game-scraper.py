@@ -8,6 +8,7 @@ import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 import os
+from crawl_frontier import canonicalize_url
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -73,6 +74,7 @@ def find_game_links(base_url, max_games=50):
         soup = BeautifulSoup(response.text, 'html.parser')
         
         game_links = []
+        seen = set()
         
         # Common patterns for game links
         # Lagged.com pattern
@@ -80,20 +82,22 @@ def find_game_links(base_url, max_games=50):
             href = link.get('href', '')
             # Look for game URLs
             if '/g/' in href or '/games/' in href or '/en/g/' in href:
-                full_url = urljoin(base_url, href)
+                full_url = canonicalize_url(href, base=base_url)
                 # Avoid duplicates and non-game pages
-                if full_url not in game_links and 'category' not in href.lower():
+                if full_url not in seen and 'category' not in href.lower():
+                    seen.add(full_url)
                     game_links.append(full_url)
         
         # Kongregate pattern
         for link in soup.find_all('a', href=re.compile(r'/games/|/en/games/')):
             href = link.get('href', '')
-            full_url = urljoin(base_url, href)
-            if full_url not in game_links:
+            full_url = canonicalize_url(href, base=base_url)
+            if full_url not in seen:
+                seen.add(full_url)
                 game_links.append(full_url)
         
-        # Filter to unique games and limit
-        unique_links = list(set(game_links))[:max_games]
+        # Limit, keeping page order
+        unique_links = game_links[:max_games]
         print(f"✓ Found {len(unique_links)} game links")
         return unique_links
         
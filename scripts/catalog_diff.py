@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Structural diff of data/games.json between git revisions.
+
+Entries are keyed by directory (gameUrl or name when there is none), so a diff lists
+games added, removed and, per game, which fields changed, instead of
+comparing counts or name lists. Revisions are read through one long-lived
+`git cat-file --batch`, and every games.json blob ever seen is summarized
+once (key -> entry hash + name) in .cache/catalog-history.json, keyed by
+blob id. Walking the whole history therefore only parses blobs that are
+new since the last run, and --history/--bisect answer from that index.
+
+    OLD [NEW]        diff two revisions; NEW defaults to the work tree
+                     (use ":" for the staged catalog)
+    --history        +added -removed ~modified for every commit that
+                     touched games.json
+    --bisect KEY     every commit that added, changed or removed KEY
+                     (a directory or a name), e.g. which commit dropped it
+
+--match narrows any mode to entries whose directory or name contains the
+text (what check-removed-games.py did for "escape").
+
+Usage:
+    python scripts/catalog_diff.py
+    python scripts/catalog_diff.py origin/main --summary
+    python scripts/catalog_diff.py HEAD~5 HEAD --match escape
+    python scripts/catalog_diff.py --history
+    python scripts/catalog_diff.py --bisect escape-road
+"""
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+
+from novahub_config import CACHE_DIR, GAMES_JSON_PATH, ROOT_DIR
+
+CATALOG_PATH = GAMES_JSON_PATH.relative_to(ROOT_DIR).as_posix()
+CACHE_PATH = CACHE_DIR / "catalog-history.json"
+CACHE_VERSION = 2
+WORKTREE = 'work tree'
+
+
+def catalog_key(game):
+    """Identity of a games.json entry: directory, else gameUrl, else name"""
+    if game.get('directory'):
+        return game['directory']
+    if game.get('gameUrl'):
+        return 'url:' + str(game['gameUrl'])
+    return 'name:' + str(game.get('name', '')).strip().lower()
+
+
+def entries_of(data):
+    # Old revisions may predate the bare-list layout catalog_lint.py enforces
+    if isinstance(data, dict):
+        data = data.get('games', [])
+    return [game for game in data if isinstance(game, dict)] if isinstance(data, list) else []
+
+
+def entry_hash(game):
+    text = json.dumps(game, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def blob_id(data):
+    """The id git gives these bytes, so the work tree shares the blob cache"""
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class GitCatalogs:
+    """Reads games.json at any revision through long-lived git cat-file processes"""
+
+    def __init__(self):
+        self.batch = self.spawn('--batch')
+        self.check = self.spawn('--batch-check')
+        self.parsed = {}
+
+    @staticmethod
+    def spawn(mode):
+        return subprocess.Popen(['git', 'cat-file', mode], cwd=ROOT_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def close(self):
+        for proc in (self.batch, self.check):
+            proc.stdin.close()
+            proc.wait()
+
+    @staticmethod
+    def request(proc, spec):
+        proc.stdin.write(spec.encode('utf-8') + b'\n')
+        proc.stdin.flush()
+        header = proc.stdout.readline().split()
+        # "<spec> missing" / "<spec> ambiguous"
+        return header if len(header) == 3 else None
+
+    @staticmethod
+    def spec(revision):
+        return f":{CATALOG_PATH}" if revision == ':' else f"{revision}:{CATALOG_PATH}"
+
+    def oid(self, revision):
+        """Blob id of games.json at revision (None if it has none), without reading the blob"""
+        if revision == WORKTREE:
+            return blob_id(GAMES_JSON_PATH.read_bytes())
+        header = self.request(self.check, self.spec(revision))
+        return header[0].decode('ascii') if header else None
+
+    def blob(self, revision):
+        """-> (blob id, bytes), or (None, None) if the revision has no games.json"""
+        if revision == WORKTREE:
+            data = GAMES_JSON_PATH.read_bytes()
+            return blob_id(data), data
+        header = self.request(self.batch, self.spec(revision))
+        if not header:
+            return None, None
+        data = self.batch.stdout.read(int(header[2]))
+        self.batch.stdout.read(1)
+        return header[0].decode('ascii'), data
+
+    def load(self, revision):
+        """-> (blob id, {key: entry}); a revision without games.json counts as empty"""
+        oid, data = self.blob(revision)
+        if oid is None:
+            return None, {}
+        if oid not in self.parsed:
+            self.parsed[oid] = parse(data, revision)
+        return oid, self.parsed[oid]
+
+
+def parse(data, revision):
+    """games.json bytes -> {key: entry}; an unreadable catalog counts as empty"""
+    try:
+        games = entries_of(json.loads(data.decode('utf-8')))
+    except ValueError:
+        print(f"  ⚠ {revision}: games.json isn't valid JSON; treating it as empty")
+        games = []
+    return {catalog_key(game): game for game in games}
+
+
+def load_index():
+    if CACHE_PATH.exists():
+        index = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+        if index.get('version') == CACHE_VERSION:
+            return index
+    return {'version': CACHE_VERSION, 'blobs': {}}
+
+
+def save_index(index):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(index, separators=(',', ':')), encoding='utf-8')
+    tmp_path.replace(CACHE_PATH)
+
+
+def summarize(catalogs, index, revision):
+    """-> {key: [entry hash, name]} for the catalog at revision; only unseen blobs are read"""
+    oid = catalogs.oid(revision)
+    if oid is None:
+        return {}
+    if oid not in index['blobs']:
+        _, entries = catalogs.load(revision)
+        index['blobs'][oid] = {key: [entry_hash(game), game.get('name', '')] for key, game in entries.items()}
+    return index['blobs'][oid]
+
+
+def diff_catalogs(old, new):
+    """Keyed structural diff of two {key: entry} maps:
+    {'added': [key], 'removed': [key], 'modified': {key: {field: [old, new]}}}"""
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    modified = {}
+    for key, game in new.items():
+        before = old.get(key)
+        if before is None or before == game:
+            continue
+        fields = list(before) + [f for f in game if f not in before]
+        modified[key] = {f: [before.get(f), game.get(f)] for f in fields if before.get(f) != game.get(f)}
+    return {'added': added, 'removed': removed, 'modified': modified}
+
+
+def matches(text, key, name):
+    return text is None or text in key.lower() or text in str(name).lower()
+
+
+def is_revision(revision):
+    """True for the work tree, the index (":") and anything git resolves to a commit"""
+    if revision in (WORKTREE, ':'):
+        return True
+    return subprocess.run(['git', 'rev-parse', '--verify', '--quiet', f'{revision}^{{commit}}'], cwd=ROOT_DIR,
+                          capture_output=True).returncode == 0
+
+
+def history(revision):
+    """Commits that touched games.json, oldest first: [(sha, short sha, date, subject)]"""
+    output = subprocess.run(['git', 'log', '--reverse', '--format=%H%x09%h%x09%cs%x09%s', revision,
+                             '--', CATALOG_PATH], cwd=ROOT_DIR, capture_output=True, text=True,
+                            encoding='utf-8', errors='replace', check=True).stdout
+    return [tuple(line.split('\t', 3)) for line in output.splitlines() if line]
+
+
+def walk(catalogs, index, revision, match=None):
+    """Yield (commit, added, removed, modified key lists) along the history, from the index"""
+    previous = {}
+    for commit in history(revision):
+        current = summarize(catalogs, index, commit[0])
+        added = [k for k in current if k not in previous and matches(match, k, current[k][1])]
+        removed = [k for k in previous if k not in current and matches(match, k, previous[k][1])]
+        modified = [k for k, v in current.items()
+                    if k in previous and previous[k][0] != v[0] and matches(match, k, v[1])]
+        yield commit, added, removed, modified
+        previous = current
+
+
+def resolve_key(catalogs, index, revision, text):
+    """A directory as given, or the key of the entry with that name anywhere in the history"""
+    lowered = text.strip().lower()
+    for commit in reversed(history(revision)):
+        entries = summarize(catalogs, index, commit[0])
+        if text in entries:
+            return text
+        for key, (_, name) in entries.items():
+            if str(name).strip().lower() == lowered:
+                return key
+    return text
+
+
+def show(value):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= 60 else text[:57] + '...'
+
+
+def print_diff(label, old, new, diff, match=None, summary=False):
+    added = [k for k in diff['added'] if matches(match, k, new[k].get('name', ''))]
+    removed = [k for k in diff['removed'] if matches(match, k, old[k].get('name', ''))]
+    modified = {k: v for k, v in diff['modified'].items() if matches(match, k, new[k].get('name', ''))}
+    print(f"{label}: +{len(added)} -{len(removed)} ~{len(modified)} ({len(old)} → {len(new)} games)")
+    if summary:
+        return
+    for key in added:
+        print(f"  + {key:<30} {new[key].get('name', '')}")
+    for key in removed:
+        print(f"  - {key:<30} {old[key].get('name', '')}")
+    for key, fields in modified.items():
+        for i, (field, (before, after)) in enumerate(fields.items()):
+            print(f"  {'~' if i == 0 else ' '} {key if i == 0 else '':<30} {field}: {show(before)} → {show(after)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyed structural diff of games.json across git history')
+    parser.add_argument('old', nargs='?', default='HEAD', help='Revision to diff from (default HEAD)')
+    parser.add_argument('new', nargs='?', default=WORKTREE, help='Revision to diff to (default: the work tree)')
+    parser.add_argument('--match', help='Only entries whose directory or name contains this text')
+    parser.add_argument('--summary', action='store_true', help='Counts only')
+    parser.add_argument('--json', action='store_true', help='Print the diff as JSON')
+    parser.add_argument('--history', action='store_true', help='Summarize every commit that touched games.json')
+    parser.add_argument('--bisect', metavar='KEY', help='Find the commits that added, changed or removed KEY')
+    parser.add_argument('--rev', default='HEAD', help='Where --history/--bisect start walking back from')
+    args = parser.parse_args()
+
+    revisions = [args.rev] if args.history or args.bisect else [args.old, args.new]
+    for revision in revisions:
+        if not is_revision(revision):
+            print(f"✗ Unknown revision '{revision}'")
+            sys.exit(1)
+
+    start = time.time()
+    match = args.match.lower() if args.match else None
+    catalogs = GitCatalogs()
+    index = load_index()
+    known = len(index['blobs'])
+    try:
+        if args.history:
+            for (_, short, date, subject), added, removed, modified in walk(catalogs, index, args.rev, match):
+                if match and not (added or removed or modified):
+                    continue
+                print(f"{short} {date} +{len(added):<4} -{len(removed):<4} ~{len(modified):<4} {subject}")
+        elif args.bisect:
+            key = resolve_key(catalogs, index, args.rev, args.bisect)
+            events = []
+            for (_, short, date, subject), added, removed, modified in walk(catalogs, index, args.rev):
+                for kind, keys in (('added', added), ('changed', modified), ('removed', removed)):
+                    if key in keys:
+                        events.append((kind, short))
+                        print(f"  {kind:<8} {short} {date} {subject}")
+            if not events:
+                print(f"✗ '{args.bisect}' isn't in any revision of {CATALOG_PATH} reachable from {args.rev}")
+                sys.exit(1)
+            kind, short = events[-1]
+            state = f'removed in {short}' if kind == 'removed' else f'present at {args.rev}'
+            print(f"\n{key}: {state}")
+        else:
+            _, old = catalogs.load(args.old)
+            _, new = catalogs.load(args.new)
+            diff = diff_catalogs(old, new)
+            if args.json:
+                print(json.dumps(diff, indent=2, ensure_ascii=False))
+            else:
+                print_diff(f"{args.old} → {args.new}", old, new, diff, match, args.summary)
+    finally:
+        catalogs.close()
+        if len(index['blobs']) != known:
+            save_index(index)
+    if args.history or args.bisect:
+        print(f"\n({len(index['blobs']) - known} new catalog revisions indexed, {time.time() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Validate and normalize data/games.json against one schema.
+
+Entries come from a dozen scrapers and hand edits, so the tools and the
+frontend used to guard every lookup (`url` or `gameUrl`, a missing
+imagePath, games.json as a dict with a "games" key). This lints the whole
+catalog in a single pass and reports each problem with its entry index:
+
+    error    missing/mistyped required field, duplicate directory, bad
+             directory name, unknown source
+    warning  unknown field, duplicate name, imagePath that isn't next to
+             the game page (allowed, e.g. for local favicons)
+    fixable  anything --fix can normalize: `url` -> gameUrl, derived
+             gameUrl/imagePath/image, stripped whitespace, canonical key
+             order, the file's tab-indented layout
+
+With --fix the normalized catalog is written back with save_games(). The
+exit status is 1 while errors (or, without --fix, fixable problems)
+remain, so it can gate commits: `--install-hook` adds a git pre-commit
+hook that lints the staged games.json and checks that the catalog shards
+and search index were regenerated from it (scripts/pages-build.js
+rebuilds them too). Standard library only; a full run takes a few
+milliseconds.
+
+Usage:
+    python scripts/catalog_lint.py
+    python scripts/catalog_lint.py --fix
+    git show :data/games.json | python scripts/catalog_lint.py --games-json -
+    python scripts/catalog_lint.py --install-hook
+"""
+import argparse
+import json
+import posixpath
+import re
+import stat
+import sys
+import time
+from collections import defaultdict
+
+from novahub_config import GAMES_JSON_PATH, ROOT_DIR, save_games
+
+SOURCES = ('semag', 'non-semag', 'Hypackel')
+DIRECTORY_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+URL_RE = re.compile(r'^(/|https?://)')
+
+# field -> (type, required); order is the canonical key order
+SCHEMA = {
+    'name': (str, True),
+    'directory': (str, True),
+    'image': (str, True),
+    'source': (str, True),
+    'gameUrl': (str, True),
+    'imagePath': (str, True),
+    'categories': (list, False),
+    'tags': (list, False),
+    'aliases': (list, False),
+    'description': (str, False),
+    'recommended': (bool, False),
+    'popular': (bool, False),
+}
+# Old or scraper-specific names for schema fields
+ALIASES = {'url': 'gameUrl', 'game_url': 'gameUrl', 'image_path': 'imagePath', 'title': 'name'}
+
+HOOK = """#!/bin/sh
+# Installed by scripts/catalog_lint.py --install-hook
+if git diff --cached --name-only | grep -qx 'data/games.json'; then
+    git show :data/games.json | python3 scripts/catalog_lint.py --games-json - || {
+        echo "games.json failed the catalog lint; run: python3 scripts/catalog_lint.py --fix" >&2
+        exit 1
+    }
+    python3 scripts/catalog_shards.py --check || {
+        echo "regenerate the catalog shards: python3 scripts/catalog_shards.py && git add data/catalog.json data/catalog" >&2
+        exit 1
+    }
+    python3 scripts/search_index.py --check || {
+        echo "regenerate the search index: python3 scripts/search_index.py && git add data/search-index.json" >&2
+        exit 1
+    }
+fi
+"""
+
+
+class Lint:
+    def __init__(self):
+        self.issues = []
+
+    def report(self, index, severity, message):
+        self.issues.append((index, severity, message))
+
+    def count(self, severity):
+        return sum(1 for issue in self.issues if issue[1] == severity)
+
+
+def derived_game_url(entry):
+    if entry.get('source', 'semag') == 'semag' and entry.get('directory'):
+        return f"/semag/{entry['directory']}/index.html"
+    return None
+
+
+def check_entry(i, entry, lint):
+    """Lint one entry -> its normalized copy; errors are judged after the fixable changes"""
+    entry = dict(entry)
+    for old, new in ALIASES.items():
+        if old in entry:
+            if new not in entry:
+                lint.report(i, 'fixable', f"'{old}' should be '{new}'")
+                entry[new] = entry[old]
+            else:
+                lint.report(i, 'fixable', f"'{old}' duplicates '{new}'")
+            del entry[old]
+
+    for field, (kind, _) in SCHEMA.items():
+        value = entry.get(field)
+        if isinstance(value, str) and value != value.strip():
+            lint.report(i, 'fixable', f"{field} has surrounding whitespace")
+            entry[field] = value.strip()
+        if kind is list and isinstance(value, list) and not all(isinstance(v, str) for v in value):
+            lint.report(i, 'error', f"{field} must be a list of strings")
+
+    if 'source' not in entry:
+        lint.report(i, 'fixable', "source missing (defaults to semag)")
+        entry['source'] = 'semag'
+    if not entry.get('gameUrl') and derived_game_url(entry):
+        lint.report(i, 'fixable', "gameUrl missing (derivable from directory)")
+        entry['gameUrl'] = derived_game_url(entry)
+    page_dir = posixpath.dirname(entry['gameUrl']) if isinstance(entry.get('gameUrl'), str) else None
+    if page_dir and not entry.get('imagePath') and isinstance(entry.get('image'), str) and entry['image']:
+        lint.report(i, 'fixable', "imagePath missing (derivable from gameUrl and image)")
+        entry['imagePath'] = f"{page_dir}/{entry['image']}"
+    if page_dir and not entry.get('image') and isinstance(entry.get('imagePath'), str) \
+            and entry['imagePath'].startswith(page_dir + '/'):
+        lint.report(i, 'fixable', "image missing (derivable from imagePath)")
+        entry['image'] = entry['imagePath'][len(page_dir) + 1:]
+
+    for field, (kind, required) in SCHEMA.items():
+        if field not in entry:
+            if required:
+                lint.report(i, 'error', f"{field} missing")
+        elif not isinstance(entry[field], kind):
+            lint.report(i, 'error', f"{field} should be {kind.__name__}, not {type(entry[field]).__name__}")
+        elif required and not entry[field]:
+            lint.report(i, 'error', f"{field} is empty")
+    for field in entry:
+        if field not in SCHEMA and field not in ALIASES:
+            lint.report(i, 'warning', f"unknown field '{field}'")
+
+    directory, source = entry.get('directory'), entry.get('source')
+    if isinstance(directory, str) and directory and not DIRECTORY_RE.match(directory):
+        lint.report(i, 'error', f"directory '{directory}' has characters that break URLs")
+    if isinstance(source, str) and source not in SOURCES:
+        lint.report(i, 'error', f"unknown source '{source}' (known: {', '.join(SOURCES)})")
+    for field in ('gameUrl', 'imagePath'):
+        if isinstance(entry.get(field), str) and entry[field] and not URL_RE.match(entry[field]):
+            lint.report(i, 'error', f"{field} must be absolute ('/...' or http(s)://)")
+    if page_dir and isinstance(entry.get('imagePath'), str) and isinstance(entry.get('image'), str) \
+            and entry['imagePath'] != f"{page_dir}/{entry['image']}":
+        lint.report(i, 'warning', "imagePath isn't gameUrl's folder + image (custom cover?)")
+
+    order = [f for f in SCHEMA if f in entry] + [f for f in entry if f not in SCHEMA]
+    if list(entry) != order:
+        lint.report(i, 'fixable', "keys out of canonical order")
+        entry = {f: entry[f] for f in order}
+    return entry
+
+
+def lint_catalog(data, fix=False):
+    """-> (entries, Lint); entries are normalized when fix is set"""
+    lint = Lint()
+    if isinstance(data, dict) and isinstance(data.get('games'), list):
+        lint.report(None, 'fixable', "catalog is wrapped in {\"games\": [...]}; it should be a bare list")
+        data = data['games']
+    if not isinstance(data, list):
+        lint.report(None, 'error', "catalog must be a JSON list of game objects")
+        return [], lint
+
+    entries = []
+    directories = {}
+    names = defaultdict(list)
+    for i, entry in enumerate(data):
+        if not isinstance(entry, dict):
+            lint.report(i, 'error', f"entry is a {type(entry).__name__}, not an object")
+            entries.append(entry)
+            continue
+        normalized = check_entry(i, entry, lint)
+        entries.append(normalized if fix else entry)
+        entry = normalized
+        directory = entry.get('directory')
+        if isinstance(directory, str) and directory:
+            key = directory.lower()
+            if key in directories:
+                lint.report(i, 'error', f"directory '{directory}' duplicates entry [{directories[key]}]")
+            else:
+                directories[key] = i
+        if isinstance(entry.get('name'), str):
+            names[entry['name'].strip().lower()].append(i)
+    for indexes in names.values():
+        for i in indexes[1:]:
+            lint.report(i, 'warning', f"same name as entry [{indexes[0]}]")
+    return entries, lint
+
+
+def canonical_text(entries):
+    """What save_games() writes"""
+    return json.dumps(entries, indent='\t', ensure_ascii=False) + '\n'
+
+
+def install_hook():
+    hooks_dir = ROOT_DIR / ".git" / "hooks"
+    if not hooks_dir.is_dir():
+        print(f"✗ {hooks_dir} not found; is this a git checkout?")
+        sys.exit(1)
+    path = hooks_dir / "pre-commit"
+    if path.exists() and 'catalog_lint.py' not in path.read_text(encoding='utf-8', errors='replace'):
+        print(f"✗ {path} already exists; add this to it:\n\n{HOOK}")
+        sys.exit(1)
+    path.write_text(HOOK, encoding='utf-8')
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    print(f"✓ Installed {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lint (and optionally normalize) games.json')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help="Path to games.json, or - for stdin")
+    parser.add_argument('--fix', action='store_true', help='Apply the fixable changes and write the file back')
+    parser.add_argument('--quiet', action='store_true', help='Only print errors and the summary')
+    parser.add_argument('--install-hook', action='store_true', help='Install a git pre-commit hook that runs the lint')
+    args = parser.parse_args()
+
+    if args.install_hook:
+        install_hook()
+        return
+    if args.fix and args.games_json == '-':
+        parser.error("--fix needs a file, not stdin")
+
+    start = time.perf_counter()
+    if args.games_json == '-':
+        text = sys.stdin.buffer.read().decode('utf-8')
+    else:
+        with open(args.games_json, 'r', encoding='utf-8') as f:
+            text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        print(f"✗ {args.games_json} is not valid JSON: {e}")
+        sys.exit(1)
+
+    entries, lint = lint_catalog(data, fix=args.fix)
+    if text != canonical_text(entries if args.fix else data):
+        lint.report(None, 'fixable', "file layout differs from save_games() (tab indent, UTF-8, trailing newline)")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for index, severity, message in lint.issues:
+        if args.quiet and severity != 'error':
+            continue
+        where = f"[{index}]" if index is not None else "[-]"
+        name = entries[index].get('directory', '') if index is not None and isinstance(entries[index], dict) else ''
+        print(f"  {severity:<8} {where:<7} {name:<30} {message}")
+
+    errors, fixable = lint.count('error'), lint.count('fixable')
+    if args.fix and fixable:
+        save_games(entries, args.games_json)
+    print(f"\n{len(entries)} entries: {errors} errors, {lint.count('warning')} warnings, "
+          f"{fixable} {'fixed' if args.fix else 'fixable'} ({elapsed:.1f} ms)")
+    if errors or (fixable and not args.fix):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Three-way merge of data/games.json, usable as a git merge driver.
+
+Scraper branches all rewrite the same tab-indented array, so git's line
+merge conflicts on almost every parallel edit. This merges by entry
+instead: entries are matched on directory (gameUrl, then name, when there
+is none; see catalog_diff.catalog_key), and each field is merged against
+the common ancestor, so one branch adding games while another retags or
+fixes covers merges cleanly. categories/tags/aliases merge as sets (both
+sides' additions kept, either side's removals applied). New entries keep
+the position the branch that added them gave them.
+
+What can't be merged automatically is reported and exits 1, which git
+treats as a conflict:
+  - both sides changed the same field to different values (ours is kept)
+  - one side removed an entry the other changed (the changed entry is kept)
+  - both sides added the same key with different values for a field
+The file is still valid JSON, so fix it by hand (or re-run with
+--favor ours|theirs) and `git add` it. The result is written with
+save_games(), in the layout catalog_lint.py checks.
+
+`--install` registers the driver in .git/config; .gitattributes already
+routes data/games.json to it.
+
+Usage:
+    python scripts/catalog_merge.py --install
+    python scripts/catalog_merge.py BASE OURS THEIRS            (git: %O %A %B)
+    python scripts/catalog_merge.py BASE OURS THEIRS --output merged.json --favor theirs
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from catalog_diff import catalog_key, entries_of, show
+from novahub_config import ROOT_DIR, save_games
+
+DRIVER_NAME = 'novacatalog'
+DRIVER_COMMAND = 'python3 scripts/catalog_merge.py %O %A %B'
+# List fields where order doesn't matter, merged item by item
+SET_FIELDS = ('categories', 'tags', 'aliases')
+MISSING = object()
+
+
+def load(path):
+    """-> {key: entry} in file order; an empty file (no common ancestor) is an empty catalog"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if not text.strip():
+        return {}
+    return {catalog_key(game): game for game in entries_of(json.loads(text))}
+
+
+def merge_set(base, ours, theirs):
+    base, theirs_set = base or [], theirs or []
+    removed = (set(base) - set(theirs_set)) | (set(base) - set(ours or []))
+    merged = [item for item in ours or [] if item not in removed]
+    merged += [item for item in theirs_set if item not in merged and item not in removed]
+    return merged
+
+
+class Merge:
+    def __init__(self, favor=None):
+        self.favor = favor
+        self.conflicts = []
+        self.stats = {'ours': 0, 'theirs': 0, 'fields': 0, 'removed': 0}
+
+    def conflict(self, key, message, ours, theirs):
+        """Keep ours (or the favored side) and record the conflict unless a side is favored"""
+        if self.favor is None:
+            self.conflicts.append(f"{key}: {message}")
+        return theirs if self.favor == 'theirs' else ours
+
+    def removal_conflict(self, key, removed_by, entry):
+        """One side removed key while the other edited it: keep the edit unless the removing side is favored"""
+        edited_by = 'theirs' if removed_by == 'ours' else 'ours'
+        if self.favor is None:
+            self.conflicts.append(f"{key}: removed by {removed_by} but changed by {edited_by}")
+        return None if self.favor == removed_by else entry
+
+    def entry(self, key, base, ours, theirs):
+        """Field-level merge of one entry present on both sides"""
+        base = base or {}
+        merged = {}
+        for field in list(ours) + [f for f in theirs if f not in ours]:
+            b, o, t = base.get(field, MISSING), ours.get(field, MISSING), theirs.get(field, MISSING)
+            if o == t or t == b:
+                value = o
+            elif o == b:
+                value = t
+                self.stats['fields'] += 1
+            elif field in SET_FIELDS and all(isinstance(v, list) or v is MISSING for v in (b, o, t)):
+                value = merge_set(None if b is MISSING else b, None if o is MISSING else o,
+                                  None if t is MISSING else t)
+                self.stats['fields'] += 1
+            else:
+                ours_text, theirs_text = (show(None if v is MISSING else v) for v in (o, t))
+                value = self.conflict(key, f"{field} changed on both sides (ours {ours_text}, theirs {theirs_text})",
+                                      o, t)
+            if value is not MISSING:
+                merged[field] = value
+        return merged
+
+    def catalogs(self, base, ours, theirs):
+        """-> merged [entry]: ours' order, with entries only theirs has placed after their predecessor"""
+        merged = {}
+        for key, o in ours.items():
+            b, t = base.get(key), theirs.get(key)
+            if t is None and b is not None:
+                if o == b:
+                    self.stats['removed'] += 1
+                    continue
+                o = self.removal_conflict(key, 'theirs', o)
+                if o is None:
+                    continue
+            elif t is not None and o != t:
+                o = self.entry(key, b, o, t)
+            merged[key] = o
+
+        # Entries only theirs has go after the nearest preceding entry both keep
+        inserts = {}
+        anchor = None
+        for key, t in theirs.items():
+            if key in ours:
+                if key in merged:
+                    anchor = key
+                continue
+            b = base.get(key)
+            if b is None:
+                self.stats['theirs'] += 1
+            elif t == b:
+                self.stats['removed'] += 1
+                continue
+            else:
+                t = self.removal_conflict(key, 'ours', t)
+                if t is None:
+                    continue
+            inserts.setdefault(anchor, []).append(t)
+        self.stats['ours'] = sum(1 for key in ours if key not in base)
+
+        result = list(inserts.get(None, []))
+        for key, game in merged.items():
+            result.append(game)
+            result.extend(inserts.get(key, []))
+        return result
+
+
+def install():
+    git_dir = ROOT_DIR / ".git"
+    if not git_dir.exists():
+        print(f"✗ {git_dir} not found; is this a git checkout?")
+        sys.exit(1)
+    for name, value in (('name', 'games.json three-way catalog merge'), ('driver', DRIVER_COMMAND)):
+        subprocess.run(['git', 'config', f'merge.{DRIVER_NAME}.{name}', value], cwd=ROOT_DIR, check=True)
+    print(f"✓ Registered merge driver '{DRIVER_NAME}': {DRIVER_COMMAND}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Three-way merge of games.json (git merge driver)')
+    parser.add_argument('base', nargs='?', help='Common ancestor (git: %%O)')
+    parser.add_argument('ours', nargs='?', help='Our version, overwritten with the result (git: %%A)')
+    parser.add_argument('theirs', nargs='?', help='Their version (git: %%B)')
+    parser.add_argument('--output', help='Write the result here instead of over OURS')
+    parser.add_argument('--favor', choices=('ours', 'theirs'), help='Resolve conflicts toward one side')
+    parser.add_argument('--install', action='store_true', help='Register the merge driver in .git/config')
+    args = parser.parse_args()
+
+    if args.install:
+        install()
+        return
+    if not args.theirs:
+        parser.error("BASE, OURS and THEIRS are required")
+
+    try:
+        base, ours, theirs = load(args.base), load(args.ours), load(args.theirs)
+    except ValueError as e:
+        # Leave the file alone; git falls back to a plain conflict
+        print(f"✗ games.json merge: a side isn't valid JSON ({e})")
+        sys.exit(2)
+
+    merge = Merge(args.favor)
+    result = merge.catalogs(base, ours, theirs)
+    save_games(result, args.output or args.ours)
+
+    stats = merge.stats
+    print(f"games.json merge: {len(result)} entries, +{stats['ours']} ours, +{stats['theirs']} theirs, "
+          f"{stats['fields']} fields merged, -{stats['removed']} removed")
+    if merge.conflicts:
+        print(f"✗ {len(merge.conflicts)} conflicts (kept ours for fields, the edit for removals; fix, then git add it):")
+        for line in merge.conflicts:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
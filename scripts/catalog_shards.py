@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Split games.json into small, content-hashed catalog shards.
+
+games-list.html used to download the whole games.json before drawing a single
+card. This writes data/catalog/ instead:
+
+    first.<hash>.json        the first page: games flagged recommended/popular,
+                             topped up with the alphabetically first games
+    alpha-<a..z|0>.<hash>.json   every game, by the first character of its name
+    source-<source>.<hash>.json  every game, by source (semag, non-semag, ...)
+
+and data/catalog.json, a tiny index with the total count, catalog_hash() of
+games.json (js/search.js compares it with the search index's) and each
+shard's file name and size. Shard names change only when their content does, so they
+can be cached forever (see _headers); only the index is revalidated.
+
+Runs are incremental: shards whose hashed file already exists aren't
+rewritten, shards no longer referenced are deleted, and the index is only
+touched when it changes. Every shard entry is a games.json object as-is.
+
+Usage:
+    python scripts/catalog_shards.py
+    python scripts/catalog_shards.py --check       # Exit 1 if the shards are stale
+    python scripts/catalog_shards.py --page-size 48
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+
+from novahub_config import DATA_DIR, GAMES_JSON_PATH, catalog_hash, load_games
+from search_index import normalize
+
+CATALOG_DIR = DATA_DIR / "catalog"
+INDEX_PATH = DATA_DIR / "catalog.json"
+INDEX_VERSION = 2
+PAGE_SIZE = 60
+
+
+def sort_key(game):
+    return (game.get('name') or '').casefold()
+
+
+def alpha_key(game):
+    """a-z for names starting with a letter, 0 for everything else"""
+    name = normalize(game.get('name'))
+    return name[0] if name[:1].isalpha() else '0'
+
+
+def first_page(games, size=PAGE_SIZE):
+    flagged = [g for g in games if g.get('recommended') or g.get('popular')]
+    page = flagged[:size]
+    seen = {g.get('directory') for g in page}
+    page.extend(g for g in games if g.get('directory') not in seen)
+    return sorted(page[:size], key=sort_key)
+
+
+def serialize(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+def build_shards(games, page_size=PAGE_SIZE):
+    """-> (index dict, {file name: text})"""
+    digest = catalog_hash(games)
+    games = sorted(games, key=sort_key)
+    groups = {'alpha': defaultdict(list), 'source': defaultdict(list)}
+    for game in games:
+        groups['alpha'][alpha_key(game)].append(game)
+        groups['source'][game.get('source') or 'semag'].append(game)
+
+    files = {}
+
+    def add(prefix, entries):
+        text = serialize(entries)
+        name = f"{prefix}.{hashlib.sha256(text.encode('utf-8')).hexdigest()[:10]}.json"
+        files[name] = text
+        return {'file': name, 'count': len(entries)}
+
+    index = {'v': INDEX_VERSION, 'count': len(games), 'catalog': digest, 'first': add('first', first_page(games, page_size))}
+    for kind, shards in groups.items():
+        index[kind] = [dict(key=key, **add(f"{kind}-{key}", shards[key])) for key in sorted(shards)]
+    return index, files
+
+
+def write_text(path, text):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def read_text(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write sharded catalog files from games.json')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help='Path to games.json')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help=f'Games on the first page (default {PAGE_SIZE})')
+    parser.add_argument('--check', action='store_true', help="Don't write; exit 1 if anything is out of date")
+    args = parser.parse_args()
+
+    index, files = build_shards(load_games(args.games_json), args.page_size)
+    index_text = json.dumps(index, indent='\t', ensure_ascii=False) + '\n'
+    existing = {p.name for p in CATALOG_DIR.glob('*.json')} if CATALOG_DIR.is_dir() else set()
+    missing = [name for name in files if name not in existing]
+    stale = sorted(existing - set(files))
+    index_changed = read_text(INDEX_PATH) != index_text
+
+    if args.check:
+        if missing or stale or index_changed:
+            print(f"✗ Catalog shards are out of date ({len(missing)} missing, {len(stale)} stale); "
+                  f"run scripts/catalog_shards.py")
+            sys.exit(1)
+        print(f"✓ {len(files)} catalog shards are up to date")
+        return
+
+    CATALOG_DIR.mkdir(parents=True, exist_ok=True)
+    for name in missing:
+        write_text(CATALOG_DIR / name, files[name])
+        print(f"  + {name}")
+    # Written before the old shards go, so the index never points at a missing file
+    if index_changed:
+        write_text(INDEX_PATH, index_text)
+    for name in stale:
+        (CATALOG_DIR / name).unlink()
+        print(f"  - {name}")
+
+    first_bytes = len(files[index['first']['file']].encode('utf-8'))
+    print(f"\n{index['count']} games in {len(files)} shards: {len(missing)} written, {len(stale)} removed, "
+          f"index {'updated' if index_changed else 'unchanged'}; first page {index['first']['count']} games, "
+          f"{first_bytes:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Incremental sync against upstream game catalogs.
+
+Stores the last-seen snapshot of each upstream list (gn-math zones.json,
+the GameMonetize RSS feed, Lagged lists) under .cache/sync/, fetches with
+conditional requests so an unchanged feed costs one 304, and computes a
+keyed diff (added / changed / removed). Only the delta is scheduled: new
+upstream entries that are not in games.json yet become downloads, changed
+entries we already host become updates.
+
+Usage:
+    python scripts/catalog_sync.py plan gn-math          # preview, snapshot untouched
+    python scripts/catalog_sync.py plan --all
+    python scripts/catalog_sync.py apply gn-math --limit 20
+    python scripts/catalog_sync.py status
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import http_client
+from novahub_config import CACHE_DIR, GAMES_JSON_PATH, ROOT_DIR, SCRIPTS_DIR, USER_AGENT, load_games, save_games
+
+SYNC_DIR = CACHE_DIR / "sync"
+HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': '*/*',
+}
+
+
+def gn_math_slug(entry):
+    """Directory name download-gn-math-games-local.py would use"""
+    name = entry.get('name') or f"zone-{entry.get('id')}"
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    return slug if len(slug) >= 2 else f"zone-{entry.get('id')}"
+
+
+def gamemonetize_slug(entry):
+    """Directory scrape-gamemonetize-rss-games.py would use: <url path id>-<title>"""
+    path_id = urlparse(entry.get('url', '').rstrip('/')).path.strip('/').split('/')[-1] or 'game'
+    safe = re.sub(r'[^\w\s\-]', '', entry.get('title', 'Unknown Game')).strip()
+    safe = re.sub(r'\s+', '-', safe).lower()[:40]
+    return f"{path_id}-{safe}" if safe else path_id
+
+
+def lagged_slug(entry):
+    return entry.get('slug') or urlparse(entry.get('url', '')).path.rstrip('/').split('/')[-1]
+
+
+def gn_math_keep(entry):
+    """Skip the suggestion/comment pseudo-zones and Discord links"""
+    name = entry.get('name', '')
+    if entry.get('id') == -1 or name.startswith('[!]'):
+        return False
+    if 'suggest' in name.lower() or 'comment' in name.lower():
+        return False
+    return 'discord.' not in entry.get('url', '')
+
+
+# Upstream sources. "key" must be stable across fetches; "slug" maps an entry
+# to the directory name the matching download script would create, under
+# "site_dir" with its cover saved as "cover".
+SOURCES = {
+    'gn-math': {
+        'url': "https://raw.githubusercontent.com/gn-math/assets/main/zones.json",
+        'key': lambda e: str(e.get('id')),
+        'slug': gn_math_slug,
+        'name': lambda e: e.get('name', ''),
+        'keep': gn_math_keep,
+        'script': 'download-gn-math-games-local.py',
+        'site_dir': 'non-semag',
+        'cover': 'cover.png',
+    },
+    'gamemonetize': {
+        'url': "https://rss.gamemonetize.com/rssfeed.php?format=json&category=All&type=html5&popularity=newest&company=All&amount=All",
+        'key': lambda e: str(e.get('id') or e.get('url', '')),
+        'slug': gamemonetize_slug,
+        'name': lambda e: e.get('title', ''),
+        'keep': lambda e: 'gamemonetize.com' in e.get('url', ''),
+        'script': 'scrape-gamemonetize-rss-games.py',
+        'site_dir': 'scraped-gamemonetize-games',
+        'cover': 'cover.jpg',
+    },
+    'lagged': {
+        # Produced by scrape-lagged-category.py / crawl_frontier.py export
+        'path': ROOT_DIR / "lagged-games-list.json",
+        'key': lambda e: lagged_slug(e).lower(),
+        'slug': lagged_slug,
+        'name': lambda e: e.get('name') or lagged_slug(e),
+        'keep': lambda e: e.get('status', 'success') != 'error',
+        'script': None,
+    },
+}
+
+
+def entry_hash(entry):
+    """Stable content hash of an upstream entry (key order independent)"""
+    blob = json.dumps(entry, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+
+
+def snapshot_path(source):
+    return SYNC_DIR / f"{source}.json"
+
+
+def plan_path(source):
+    return SYNC_DIR / f"{source}-plan.json"
+
+
+def load_snapshot(source):
+    """Last committed snapshot: {'etag', 'last_modified', 'entries': {key: {'hash', 'entry'}}}"""
+    path = snapshot_path(source)
+    if path.exists():
+        return json.loads(path.read_text(encoding='utf-8'))
+    return {'etag': None, 'last_modified': None, 'entries': {}}
+
+
+def save_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def fetch_upstream(source, snapshot, force=False):
+    """Fetch an upstream list. Returns (entries, etag, last_modified), entries=None on 304."""
+    config = SOURCES[source]
+    if 'path' in config:
+        path = config['path']
+        if not path.exists():
+            raise FileNotFoundError(f"{path} not found")
+        stamp = str(path.stat().st_mtime_ns)
+        if not force and snapshot.get('etag') == stamp:
+            return None, stamp, None
+        return json.loads(path.read_text(encoding='utf-8')), stamp, None
+
+    headers = dict(HEADERS)
+    if not force:
+        if snapshot.get('etag'):
+            headers['If-None-Match'] = snapshot['etag']
+        if snapshot.get('last_modified'):
+            headers['If-Modified-Since'] = snapshot['last_modified']
+    response = http_client.get(config['url'], headers=headers, timeout=30)
+    if response.status_code == 304:
+        return None, snapshot.get('etag'), snapshot.get('last_modified')
+    response.raise_for_status()
+    data = response.json()
+    if isinstance(data, dict):
+        data = [dict(v, id=k) if isinstance(v, dict) else v for k, v in data.items()]
+    return data, response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+
+def index_entries(source, entries):
+    """Key upstream entries -> {key: {'hash', 'entry'}}, dropping filtered ones"""
+    config = SOURCES[source]
+    indexed = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not config['keep'](entry):
+            continue
+        indexed[config['key'](entry)] = {'hash': entry_hash(entry), 'entry': entry}
+    return indexed
+
+
+def diff_entries(old, new):
+    """Keyed diff of two indexed snapshots -> (added, changed, removed) key lists"""
+    old_keys = old.keys()
+    new_keys = new.keys()
+    added = sorted(new_keys - old_keys)
+    removed = sorted(old_keys - new_keys)
+    changed = sorted(k for k in new_keys & old_keys if new[k]['hash'] != old[k]['hash'])
+    return added, changed, removed
+
+
+def load_local_index(games_json_path=GAMES_JSON_PATH):
+    """Directories and lowercase names already in games.json"""
+    if not Path(games_json_path).exists():
+        return set(), set()
+    with open(games_json_path, 'r', encoding='utf-8') as f:
+        games = json.load(f)
+    return ({g.get('directory', '').lower() for g in games},
+            {g.get('name', '').lower() for g in games})
+
+
+def changed_fields(old_entry, new_entry):
+    return sorted(k for k in set(old_entry) | set(new_entry) if old_entry.get(k) != new_entry.get(k))
+
+
+def build_plan(source, force=False):
+    """Fetch upstream, diff it against the snapshot and schedule the delta.
+
+    Returns (plan, new_snapshot); new_snapshot is None when upstream is unchanged.
+    """
+    config = SOURCES[source]
+    snapshot = load_snapshot(source)
+    entries, etag, last_modified = fetch_upstream(source, snapshot, force)
+    plan = {
+        'source': source,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'unchanged': entries is None,
+        'added': [], 'changed': [], 'removed': [],
+        'download': [], 'update': [],
+    }
+    if entries is None:
+        return plan, None
+
+    old = snapshot.get('entries', {})
+    new = index_entries(source, entries)
+    added, changed, removed = diff_entries(old, new)
+    existing_dirs, existing_names = load_local_index()
+
+    def is_local(entry):
+        return (config['slug'](entry).lower() in existing_dirs
+                or config['name'](entry).lower() in existing_names)
+
+    plan['added'] = added
+    plan['changed'] = changed
+    plan['removed'] = [{'key': k, 'name': config['name'](old[k]['entry'])} for k in removed]
+    for key in added:
+        entry = new[key]['entry']
+        if not is_local(entry):
+            plan['download'].append({'key': key, 'slug': config['slug'](entry), 'entry': entry})
+    for key in changed:
+        entry = new[key]['entry']
+        if is_local(entry):
+            plan['update'].append({
+                'key': key,
+                'slug': config['slug'](entry),
+                'fields': changed_fields(old[key]['entry'], entry),
+                'entry': entry,
+            })
+
+    new_snapshot = {
+        'etag': etag,
+        'last_modified': last_modified,
+        'synced_at': plan['generated_at'],
+        'entries': new,
+    }
+    return plan, new_snapshot
+
+
+def print_plan(plan):
+    source = plan['source']
+    if plan['unchanged']:
+        print(f"  {source}: upstream unchanged (not modified)")
+        return
+    print(f"  {source}: +{len(plan['added'])} added, ~{len(plan['changed'])} changed, -{len(plan['removed'])} removed")
+    print(f"    → {len(plan['download'])} to download, {len(plan['update'])} to update")
+    for item in plan['download'][:10]:
+        print(f"      + {item['slug']}")
+    if len(plan['download']) > 10:
+        print(f"      ... and {len(plan['download']) - 10} more")
+    for item in plan['update'][:10]:
+        print(f"      ~ {item['slug']} ({', '.join(item['fields'])})")
+    for item in plan['removed'][:10]:
+        print(f"      - {item['name']} (gone upstream)")
+
+
+def load_script(filename):
+    """Import a hyphenated sibling script as a module"""
+    spec = importlib.util.spec_from_file_location(filename.replace('-', '_')[:-3], SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def register_games(source, items):
+    """Add games.json entries for freshly downloaded items (the scripts do this in main(), not download_game())"""
+    config = SOURCES[source]
+    games = load_games()
+    existing = {g.get('directory', '').lower() for g in games}
+    added = 0
+    for item in items:
+        directory = item['slug']
+        if directory.lower() in existing:
+            continue
+        base = f"/{config['site_dir']}/{directory}"
+        games.append({
+            'name': config['name'](item['entry']) or directory,
+            'directory': directory,
+            'image': config['cover'],
+            'source': 'non-semag',
+            'gameUrl': f"{base}/index.html",
+            'imagePath': f"{base}/{config['cover']}",
+        })
+        existing.add(directory.lower())
+        added += 1
+    if added:
+        save_games(games)
+        print(f"    ✓ Added {added} games to games.json ({len(games)} total)")
+    return added
+
+
+def apply_plan(plan, limit=None):
+    """Download/update only the scheduled delta using the source's download script.
+
+    Returns the set of keys that were handled.
+    """
+    source = plan['source']
+    script = SOURCES[source]['script']
+    work = plan['download'] + plan['update']
+    if limit:
+        work = work[:limit]
+    if not work:
+        print(f"  {source}: nothing to do")
+        return set()
+    if not script:
+        print(f"  {source}: no downloader; {len(work)} entries listed in {plan_path(source)}")
+        return {item['key'] for item in work}
+
+    module = load_script(script)
+    done = set()
+    for i, item in enumerate(work, 1):
+        entry = item['entry']
+        print(f"  [{i}/{len(work)}] {item['slug']}", flush=True)
+        try:
+            if source == 'gn-math':
+                ok = module.download_game(entry.get('id'), entry, module.GAMES_DIR / item['slug'])
+            else:
+                ok = module.download_game(entry)
+        except Exception as e:
+            print(f"    ✗ {e}")
+            ok = False
+        if ok:
+            done.add(item['key'])
+        time.sleep(0.5)  # Be polite
+    print(f"    ✓ {len(done)} done, ✗ {len(work) - len(done)} failed")
+    # Before cmd_plan advances the snapshot, or these would never be scheduled again
+    register_games(source, [item for item in plan['download'] if item['key'] in done])
+    return done
+
+
+def cmd_plan(args, apply=False):
+    """Preview (plan) or execute (apply) the delta for each source.
+
+    Only apply advances the stored snapshot, and entries that failed or were
+    cut off by --limit keep their old snapshot state so the next run
+    schedules them again.
+    """
+    sources = list(SOURCES) if args.all else args.sources
+    if not sources:
+        print("❌ Give one or more sources or --all")
+        sys.exit(1)
+    for source in sources:
+        if source not in SOURCES:
+            print(f"❌ Unknown source '{source}' (known: {', '.join(SOURCES)})")
+            sys.exit(1)
+
+    for source in sources:
+        started = time.time()
+        try:
+            plan, new_snapshot = build_plan(source, force=args.force)
+        except Exception as e:
+            print(f"  ✗ {source}: {e}")
+            continue
+        print_plan(plan)
+        print(f"    ({time.time() - started:.2f}s)")
+        if plan['unchanged']:
+            continue
+
+        save_json(plan_path(source), plan)
+        if not apply:
+            continue
+        done = apply_plan(plan, args.limit)
+        old_entries = load_snapshot(source)['entries']
+        for item in plan['download'] + plan['update']:
+            if item['key'] in done:
+                continue
+            if item['key'] in old_entries:
+                new_snapshot['entries'][item['key']] = old_entries[item['key']]
+            else:
+                new_snapshot['entries'].pop(item['key'], None)
+        if len(done) < len(plan['download']) + len(plan['update']):
+            # Unfinished entries must be re-diffed even if upstream returns 304
+            new_snapshot['etag'] = new_snapshot['last_modified'] = None
+        save_json(snapshot_path(source), new_snapshot)
+
+
+def cmd_status(args):
+    for source in SOURCES:
+        snapshot = load_snapshot(source)
+        synced = snapshot.get('synced_at', 'never')
+        print(f"  {source:<14} {len(snapshot.get('entries', {})):>6} entries, last sync {synced}")
+        if plan_path(source).exists():
+            plan = json.loads(plan_path(source).read_text(encoding='utf-8'))
+            print(f"  {'':<14} last plan: {len(plan['download'])} downloads, {len(plan['update'])} updates")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental sync against upstream game catalogs')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('plan', 'Diff upstream against the last snapshot'),
+                            ('apply', 'Diff, then download/update only the delta')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('sources', nargs='*', help=f"Sources ({', '.join(SOURCES)})")
+        p.add_argument('--all', action='store_true', help='All sources')
+        p.add_argument('--force', action='store_true', help='Ignore ETag/Last-Modified and refetch')
+        if name == 'apply':
+            p.add_argument('--limit', type=int, help='Max downloads/updates this run')
+    sub.add_parser('status', help='Show stored snapshots')
+
+    args = parser.parse_args()
+    if args.command == 'status':
+        cmd_status(args)
+    else:
+        cmd_plan(args, apply=args.command == 'apply')
+
+
+if __name__ == "__main__":
+    main()
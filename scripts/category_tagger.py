@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Infer categories and tags for games.json entries.
+
+The category filter in js/games.js used to guess categories by matching a
+few words against card titles at click time. This assigns them ahead of
+time from three kinds of evidence, strongest first:
+
+    upstream   genre/category/tags fields of the game's entry in the
+               catalog_sync.py snapshots (.cache/sync/: gn-math zones,
+               GameMonetize RSS, Lagged lists)
+    page       JSON-LD genre/keywords and meta keywords/og:description in
+               the game's local index.html, as the Poki/CrazyGames/Y8
+               scrapers save it
+    name       the game's name and directory
+
+Each source is run through the same keyword model (CATEGORIES below) and
+weighted; a category needs MIN_SCORE to stick and a game keeps at most
+MAX_CATEGORIES. Results are written to each entry's "categories" (and, when
+upstream/page metadata has them, "tags") field, and data/categories.json
+maps each category to the directories in it, so filtering is one lookup.
+search_index.py already indexes both fields.
+
+Only missing fields are filled: an entry that already has categories or
+tags keeps them, so hand corrections (and branch edits catalog_merge.py
+merges) survive re-runs. --retag DIRECTORY recomputes one game's fields,
+replacing what it has.
+
+Usage:
+    python scripts/category_tagger.py                 # Tag games.json and write the index
+    python scripts/category_tagger.py --dry-run       # Show what would change
+    python scripts/category_tagger.py --retag slope   # Re-infer one game, replacing its fields
+    python scripts/category_tagger.py --explain slope # Show the evidence for one game
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+from catalog_sync import SOURCES, load_snapshot
+from for_each_game import iter_games
+from novahub_config import DATA_DIR, GAMES_JSON_PATH, SEMAG_DIR, load_games, save_games
+from search_index import normalize
+
+INDEX_PATH = DATA_DIR / "categories.json"
+INDEX_VERSION = 1
+
+# Category -> words/phrases (normalized; matched as whole words). Upstream
+# genre names ("Shooting", "Puzzles", ".io") go through the same table.
+CATEGORIES = {
+    'Action': ['action', 'fight', 'fighting', 'fighter', 'battle', 'war', 'smash', 'ninja', 'sword',
+               'brawl', 'combat', 'attack', 'beat em up', 'ragdoll', 'stickman', 'stickmin'],
+    'Adventure': ['adventure', 'quest', 'escape', 'explore', 'exploration', 'story', 'point and click',
+                  'henry stickmin', 'fancy pants', 'hobo', 'riddle school', 'zelda', 'minecraft'],
+    'Puzzle': ['puzzle', 'puzzles', 'logic', 'brain', 'match 3', 'match3', 'sort', 'sorting', '2048',
+               'sudoku', 'tetris', 'riddle', 'physics', 'cut the rope', 'draw', 'maze', 'block', 'blocks',
+               'wordle', 'word', 'chess', 'solitaire', 'mahjong', 'cards', 'board', 'telekinesis'],
+    'Racing': ['racing', 'race', 'racer', 'car', 'cars', 'drift', 'drive', 'driving', 'driver', 'moto',
+               'motorcycle', 'bike', 'truck', 'kart', 'highway', 'traffic', 'hill climb', 'road', 'moto x3m'],
+    'Sports': ['sports', 'sport', 'soccer', 'football', 'basketball', 'basket', 'baseball', 'golf',
+               'tennis', 'hockey', 'bowling', 'volleyball', 'boxing', 'skate', 'skateboard', 'ski',
+               'pool', 'billiards', 'penalty', 'retro bowl', 'dunk'],
+    'Strategy': ['strategy', 'defense', 'defence', 'tower defense', 'td', 'bloons', 'tactics', 'tactical',
+                 'kingdom', 'empire', 'conquer', 'army', 'territory', 'management'],
+    'Shooter': ['shooter', 'shooting', 'shoot', 'gun', 'guns', 'sniper', 'fps', 'bullet', 'cannon',
+                'zombie', 'zombies', 'doom', 'half life', 'krunker', 'archer', 'bow'],
+    'RPG': ['rpg', 'role playing', 'pokemon', 'dungeon', 'undertale', 'deltarune', 'final fantasy',
+            'earthbound', 'mother', 'level up', 'loot'],
+    'Platformer': ['platformer', 'platform', 'jump', 'jumping', 'mario', 'sonic', 'vex', 'ovo', 'dadish',
+                   'geometry dash', 'fireboy', 'watergirl', 'celeste', 'run', 'runner', 'parkour',
+                   'obby', 'super meat boy', 'kirby', 'megaman', 'mega man', 'metroid'],
+    'Horror': ['horror', 'scary', 'fnaf', 'five nights', 'freddy', 'freddys', 'granny', 'backrooms',
+               'creepy', 'exe', 'baldi', 'ghost', 'haunted'],
+    'Idle': ['idle', 'clicker', 'click', 'incremental', 'tycoon', 'cookie clicker', 'merge'],
+    'Rhythm': ['rhythm', 'music', 'friday night funkin', 'funkin', 'fnf', 'piano', 'dance'],
+    'Simulation': ['simulation', 'simulator', 'sim', 'papa', 'papas', 'cooking', 'restaurant', 'farm',
+                   'farming', 'duck life', 'bitlife', 'pet', 'sandbox', 'builder', 'building', 'craft'],
+    'Multiplayer': ['multiplayer', 'io', 'online', '2 player', 'two player', '2p', 'pvp'],
+}
+
+# Evidence weights; a category needs MIN_SCORE in total
+WEIGHTS = {'upstream': 3, 'page': 1, 'name': 2}
+MIN_SCORE = 2
+MAX_CATEGORIES = 3
+MAX_TAGS = 10
+
+# Upstream entry fields that hold genres or tags
+META_FIELDS = ('genre', 'genres', 'category', 'categories', 'tags', 'keywords', 'special')
+LD_JSON_RE = re.compile(r'<script[^>]+application/ld\+json[^>]*>(.*?)</script>', re.I | re.S)
+META_RE = re.compile(r'<meta\s[^>]*(?:name|property)=["\'](keywords|description|og:description)["\'][^>]*>', re.I)
+CONTENT_RE = re.compile(r'content=["\']([^"\']*)["\']', re.I)
+PAGE_LIMIT = 512 * 1024
+
+
+def _phrase_re(phrases):
+    alternatives = sorted((re.escape(p) for p in phrases), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b')
+
+
+CATEGORY_RES = {category: _phrase_re(words) for category, words in CATEGORIES.items()}
+
+
+def split_values(value):
+    """Field value (string, comma/pipe separated, or list) -> normalized strings"""
+    if isinstance(value, str):
+        value = re.split(r'[,|;/]', value)
+    if not isinstance(value, list):
+        return []
+    return [v for v in (normalize(str(item)) for item in value) if v]
+
+
+def classify(text):
+    """Categories whose keywords occur in normalized text"""
+    return [category for category, pattern in CATEGORY_RES.items() if pattern.search(text)]
+
+
+def upstream_metadata():
+    """{lowercase directory or name: [normalized genre/tag values]} from the sync snapshots"""
+    found = defaultdict(list)
+    for source, config in SOURCES.items():
+        for item in load_snapshot(source).get('entries', {}).values():
+            entry = item.get('entry') or {}
+            values = [v for field in META_FIELDS for v in split_values(entry.get(field))]
+            if not values:
+                continue
+            for key in (config['slug'](entry), config['name'](entry)):
+                if key:
+                    found[key.lower()].extend(values)
+    return found
+
+
+def page_metadata(index_html):
+    """(genres/keywords, description text) from a saved game page"""
+    try:
+        with open(index_html, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read(PAGE_LIMIT)
+    except OSError:
+        return [], ''
+    values, descriptions = [], []
+    for block in LD_JSON_RE.findall(text):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict):
+                for field in ('genre', 'keywords', 'applicationSubCategory'):
+                    values.extend(split_values(item.get(field)))
+                descriptions.append(str(item.get('description') or ''))
+    for match in META_RE.finditer(text):
+        content = CONTENT_RE.search(match.group(0))
+        if not content:
+            continue
+        if match.group(1).lower() == 'keywords':
+            values.extend(split_values(html.unescape(content.group(1))))
+        else:
+            descriptions.append(html.unescape(content.group(1)))
+    return values, normalize(' '.join(descriptions))
+
+
+def local_pages():
+    """{lowercase directory: index.html path} for directory games we host"""
+    pages = {}
+    for game in iter_games():
+        if game.is_dir and (game.path / 'index.html').is_file():
+            pages[game.name.lower()] = game.path / 'index.html'
+    if SEMAG_DIR.is_dir():
+        for path in SEMAG_DIR.iterdir():
+            if (path / 'index.html').is_file():
+                pages.setdefault(path.name.lower(), path / 'index.html')
+    return pages
+
+
+def evidence(game, upstream, pages):
+    """{'upstream'|'page'|'name': normalized text} for one game"""
+    directory = game.get('directory', '')
+    name = game.get('name', '')
+    sources = {'name': normalize(f"{name} {directory.replace('-', ' ').replace('_', ' ')}")}
+    meta = upstream.get(directory.lower(), []) + upstream.get(name.lower(), [])
+    page = pages.get(directory.lower())
+    page_values, description = page_metadata(page) if page else ([], '')
+    if meta or page_values:
+        sources['upstream'] = ' '.join(dict.fromkeys(meta + page_values))
+    if description:
+        sources['page'] = description
+    return sources, list(dict.fromkeys(meta + page_values))
+
+
+def infer(game, upstream, pages):
+    """-> (categories best first, tags, {category: score})"""
+    sources, tags = evidence(game, upstream, pages)
+    scores = defaultdict(int)
+    for kind, text in sources.items():
+        for category in classify(text):
+            scores[category] += WEIGHTS[kind]
+    ranked = sorted((c for c, s in scores.items() if s >= MIN_SCORE), key=lambda c: (-scores[c], c))
+    return ranked[:MAX_CATEGORIES], tags[:MAX_TAGS], dict(scores)
+
+
+def build_index(games):
+    categories = defaultdict(list)
+    for game in games:
+        for category in game.get('categories') or []:
+            categories[category].append(game.get('directory', ''))
+    return {'v': INDEX_VERSION, 'count': len(games),
+            'categories': {c: categories[c] for c in sorted(categories, key=lambda c: (-len(categories[c]), c))}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Infer categories/tags for games.json and write data/categories.json')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help='Path to games.json')
+    parser.add_argument('--dry-run', action='store_true', help="Print the changes, write nothing")
+    parser.add_argument('--explain', metavar='DIRECTORY', help='Show the evidence and scores for one game')
+    parser.add_argument('--retag', metavar='DIRECTORY', action='append', default=[],
+                        help='Replace these games\' categories/tags instead of only filling missing ones (repeatable)')
+    args = parser.parse_args()
+
+    games = load_games(args.games_json)
+    upstream = upstream_metadata()
+    pages = local_pages()
+
+    if args.explain:
+        game = next((g for g in games if g.get('directory') == args.explain), None)
+        if not game:
+            print(f"✗ No game with directory '{args.explain}'")
+            sys.exit(1)
+        sources, _ = evidence(game, upstream, pages)
+        for kind, text in sources.items():
+            print(f"  {kind:<9} (x{WEIGHTS[kind]}) {text[:100]}")
+        categories, tags, scores = infer(game, upstream, pages)
+        print(f"\n  scores: {', '.join(f'{c} {s}' for c, s in sorted(scores.items(), key=lambda i: -i[1])) or 'none'}")
+        print(f"  categories: {', '.join(categories) or 'none'}")
+        if tags:
+            print(f"  tags: {', '.join(tags)}")
+        return
+
+    unknown = set(args.retag) - {g.get('directory') for g in games}
+    if unknown:
+        print(f"✗ No game with directory {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    changed = 0
+    for game in games:
+        retag = game.get('directory') in args.retag
+        if not retag and game.get('categories') and game.get('tags'):
+            continue
+        categories, tags, _ = infer(game, upstream, pages)
+        before = (game.get('categories'), game.get('tags'))
+        for field, value in (('categories', categories), ('tags', tags)):
+            # Existing values are hand-edited or merged in; only --retag replaces them
+            if game.get(field) and not retag:
+                continue
+            if value:
+                game[field] = value
+            else:
+                game.pop(field, None)
+        if (game.get('categories'), game.get('tags')) != before:
+            changed += 1
+            if args.dry_run:
+                print(f"  ~ {game.get('directory')}: {', '.join(categories) or '(none)'}")
+
+    index = build_index(games)
+    tagged = sum(1 for g in games if g.get('categories'))
+    print(f"\n{tagged}/{len(games)} games categorized, {changed} changed, "
+          f"{len(upstream)} upstream entries and {len(pages)} local pages read")
+    for category, ids in index['categories'].items():
+        print(f"  {category:<12} {len(ids):>4}")
+    if args.dry_run:
+        return
+    if changed:
+        save_games(games, args.games_json)
+    tmp_path = INDEX_PATH.with_name(INDEX_PATH.name + '.tmp')
+    tmp_path.write_text(json.dumps(index, separators=(',', ':'), ensure_ascii=False) + '\n', encoding='utf-8')
+    os.replace(tmp_path, INDEX_PATH)
+    if changed:
+        print("\nRe-run search_index.py and catalog_shards.py to pick up the new fields")
+
+
+if __name__ == "__main__":
+    main()
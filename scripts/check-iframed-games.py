@@ -2,19 +2,17 @@
 """
 Check which games use iframes to load external content
 """
-import json
 import os
 import re
 from pathlib import Path
 
-GAMES_JSON_PATH = Path(__file__).parent.parent / "data" / "games.json"
-NON_SEMAG_DIR = Path(__file__).parent.parent / "non-semag"
+from novahub_config import ROOT_DIR, load_games
+
+NON_SEMAG_DIR = ROOT_DIR / "non-semag"
 
 def main():
-    # Load games.json
-    with open(GAMES_JSON_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    games = data if isinstance(data, list) else data.get('games', [])
+    # games.json is a list of entries with a gameUrl (enforced by catalog_lint.py)
+    games = load_games()
     
     print("Checking for iframed games...")
     print("=" * 60, flush=True)
@@ -24,7 +22,7 @@ def main():
     
     # Check games.json for external URLs
     for game in games:
-        url = game.get('url', '')
+        url = game['gameUrl']
         if url and 'http' in url and 'non-semag' not in url and 'semag' not in url:
             external_iframe_games.append({
                 'name': game.get('name', 'Unknown'),
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Split assets over the Cloudflare Pages 25 MiB file limit into parts.
+
+`split` cuts every oversized file in a game directory (typically Unity
+.data/.wasm/.unityweb builds) into <name>.chunk000, .chunk001, ... of at most
+--part-size bytes, records them in <game>/nova-chunks.json and writes
+nova-chunks.js, a shim injected as the first script of the game's top-level
+pages. The shim answers fetch() and XMLHttpRequest for the original URL by
+downloading all parts in parallel: fetch() gets a streamed Response (so
+WebAssembly.instantiateStreaming still works), XHR gets the reassembled
+bytes through a blob: URL. The bytes are exactly the original file's, as
+Pages would have served it.
+
+The originals stay on disk for local play; pages-build.js deploys the parts
+and skips files listed in nova-chunks.json.
+
+Usage:
+    python scripts/chunk_splitter.py scan
+    python scripts/chunk_splitter.py split non-semag/EscapeRoad
+    python scripts/chunk_splitter.py split --all --part-size 20971520
+    python scripts/chunk_splitter.py verify non-semag/EscapeRoad
+    python scripts/chunk_splitter.py unsplit non-semag/EscapeRoad
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from asset_bundler import HEAD_RE, display, entry_pages, write_atomic
+from for_each_game import SKIP_DIRS, iter_games
+from local_server import content_type
+from verified_download import file_sha256
+
+CHUNKS_NAME = 'nova-chunks.json'
+SHIM_NAME = 'nova-chunks.js'
+CHUNKS_MARKER = 'data-nova-chunks'
+# Cloudflare Pages rejects files over 25 MiB
+PAGES_LIMIT = 25 * 1024 * 1024
+# Parts stay well under the limit and are small enough to fetch in parallel
+PART_SIZE = 20 * 1024 * 1024
+CHUNK_RE = re.compile(r'\.chunk\d{3}$')
+READ_SIZE = 1024 * 1024
+
+TAG_RE = re.compile(rf'<script\b[^>]*\b{CHUNKS_MARKER}\b[^>]*>\s*</script>\s*', re.IGNORECASE)
+
+SHIM = r"""/* Generated by scripts/chunk_splitter.py; do not edit. */
+(function () {
+  var FILES = %(files)s;
+  var script = document.currentScript;
+  var base = new URL('.', script ? script.src : location.href);
+
+  function lookup(url) {
+    var u, key;
+    try {
+      u = new URL(url, document.baseURI);
+      if (u.origin !== base.origin || u.pathname.indexOf(base.pathname) !== 0) return null;
+      key = decodeURIComponent(u.pathname.slice(base.pathname.length));
+    } catch (e) {
+      return null;
+    }
+    return Object.prototype.hasOwnProperty.call(FILES, key) ? key : null;
+  }
+
+  var nativeFetch = window.fetch;
+  // Start every part at once; callers consume them in order
+  function fetchParts(key) {
+    var dir = key.slice(0, key.lastIndexOf('/') + 1);
+    return FILES[key].parts.map(function (name) {
+      return nativeFetch.call(window, new URL(dir + name, base).href).then(function (r) {
+        if (!r.ok) throw new Error(name + ': HTTP ' + r.status);
+        return r;
+      });
+    });
+  }
+
+  function streamed(key) {
+    var parts = fetchParts(key), index = 0, reader = null;
+    // Each pull enqueues one chunk or closes; part boundaries are crossed inside it
+    function next(controller) {
+      if (index >= parts.length) return controller.close();
+      var current = reader ? Promise.resolve(reader) : parts[index].then(function (r) {
+        return (reader = r.body.getReader());
+      });
+      return current.then(function (rd) {
+        return rd.read();
+      }).then(function (chunk) {
+        if (!chunk.done) return controller.enqueue(chunk.value);
+        reader = null;
+        index++;
+        return next(controller);
+      });
+    }
+    var body = new ReadableStream({ pull: next });
+    return new Response(body, {
+      status: 200,
+      headers: { 'Content-Type': FILES[key].type, 'Content-Length': String(FILES[key].size) }
+    });
+  }
+
+  function blobUrl(key) {
+    return Promise.all(fetchParts(key).map(function (p) {
+      return p.then(function (r) { return r.blob(); });
+    })).then(function (blobs) {
+      return URL.createObjectURL(new Blob(blobs, { type: FILES[key].type }));
+    });
+  }
+
+  window.fetch = function (input, init) {
+    var request = typeof Request !== 'undefined' && input instanceof Request ? input : null;
+    var method = (init && init.method) || (request ? request.method : 'GET');
+    var key = String(method).toUpperCase() === 'GET' && lookup(request ? request.url : String(input));
+    return key ? Promise.resolve(streamed(key)) : nativeFetch.apply(window, arguments);
+  };
+
+  var XHR = XMLHttpRequest.prototype;
+  var open = XHR.open, send = XHR.send, setRequestHeader = XHR.setRequestHeader;
+  XHR.open = function (method, url, async) {
+    var key = String(method).toUpperCase() === 'GET' && async !== false && lookup(url);
+    this.__novaChunks = key ? { key: key, args: Array.prototype.slice.call(arguments), headers: [] } : null;
+    if (!key) return open.apply(this, arguments);
+  };
+  XHR.setRequestHeader = function () {
+    if (this.__novaChunks) return this.__novaChunks.headers.push(arguments);
+    return setRequestHeader.apply(this, arguments);
+  };
+  XHR.send = function (body) {
+    var xhr = this, pending = this.__novaChunks;
+    if (!pending) return send.apply(this, arguments);
+    this.__novaChunks = null;
+    blobUrl(pending.key).then(function (url) {
+      pending.args[1] = url;
+      open.apply(xhr, pending.args);
+      pending.headers.forEach(function (h) { setRequestHeader.apply(xhr, h); });
+      send.call(xhr, body);
+    }, function (e) {
+      console.error('nova-chunks: ' + pending.key + ': ' + e);
+      open.apply(xhr, pending.args);
+      send.call(xhr, body);
+    });
+  };
+})();
+"""
+
+
+def oversized_files(game_dir, limit=PAGES_LIMIT):
+    found = []
+    for dirpath, dirnames, filenames in os.walk(game_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if not CHUNK_RE.search(filename) and path.stat().st_size > limit:
+                found.append(path)
+    return found
+
+
+def load_chunks(game_dir):
+    """{relative path: {'size', 'sha256', 'type', 'parts'}} from nova-chunks.json"""
+    path = Path(game_dir) / CHUNKS_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8')).get('files', {})
+
+
+def remove_parts(path):
+    for part in path.parent.glob(path.name + '.chunk*'):
+        if CHUNK_RE.search(part.name):
+            part.unlink()
+
+
+def split_file(path, part_size=PART_SIZE):
+    """Write path's parts next to it; -> manifest entry"""
+    remove_parts(path)
+    digest = hashlib.sha256()
+    parts = []
+    with open(path, 'rb') as src:
+        while True:
+            name = f"{path.name}.chunk{len(parts):03d}"
+            written = 0
+            with open(path.with_name(name + '.tmp'), 'wb') as dst:
+                while written < part_size:
+                    data = src.read(min(READ_SIZE, part_size - written))
+                    if not data:
+                        break
+                    digest.update(data)
+                    dst.write(data)
+                    written += len(data)
+            if not written:
+                path.with_name(name + '.tmp').unlink()
+                break
+            os.replace(path.with_name(name + '.tmp'), path.with_name(name))
+            parts.append(name)
+    return {'size': path.stat().st_size, 'sha256': digest.hexdigest(), 'type': content_type(path.name).split(';')[0],
+            'parts': parts}
+
+
+def parts_current(path, entry, part_size):
+    """True when an earlier split of path is still complete and matches its bytes"""
+    if not entry or entry['size'] != path.stat().st_size:
+        return False
+    parts = [path.parent / name for name in entry['parts']]
+    if not all(p.exists() for p in parts):
+        return False
+    sizes = [p.stat().st_size for p in parts]
+    return sum(sizes) == entry['size'] and max(sizes) <= part_size and entry['sha256'] == file_sha256(path)
+
+
+def inject_tag(text, src):
+    """HTML with the shim <script> as the first thing in <head> (replacing an older one)"""
+    text = TAG_RE.sub('', text)
+    tag = f'<script src="{src}" {CHUNKS_MARKER}></script>'
+    head = HEAD_RE.search(text)
+    if head:
+        return text[:head.end()] + tag + text[head.end():]
+    return tag + text
+
+
+def write_shim(game_dir, files):
+    """Write nova-chunks.json + nova-chunks.js and (re)inject the shim tag; -> changed page names"""
+    game_dir = Path(game_dir)
+    write_atomic(game_dir / CHUNKS_NAME, json.dumps({'version': 1, 'files': files}, indent=2) + '\n')
+    shim_files = {rel: {'size': e['size'], 'type': e['type'], 'parts': e['parts']} for rel, e in files.items()}
+    shim = SHIM % {'files': json.dumps(shim_files, separators=(',', ':'))}
+    write_atomic(game_dir / SHIM_NAME, shim)
+    version = hashlib.sha256(shim.encode()).hexdigest()[:10]
+    changed = []
+    for page in entry_pages(game_dir):
+        with open(page, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            text = f.read()
+        new_text = inject_tag(text, f"{SHIM_NAME}?v={version}")
+        if new_text != text:
+            write_atomic(page, new_text)
+            changed.append(page.name)
+    return changed
+
+
+def split_game(game_dir, part_size=PART_SIZE, limit=PAGES_LIMIT, dry_run=False):
+    """Split a game's oversized files. -> {'game', 'split': [rel], 'pages': [names], 'skipped'}"""
+    game_dir = Path(game_dir)
+    result = {'game': game_dir.name, 'split': [], 'bytes': 0, 'pages': [], 'skipped': None}
+    oversized = oversized_files(game_dir, limit)
+    if not oversized:
+        result['skipped'] = 'no files over the limit'
+        return result
+    if not entry_pages(game_dir):
+        result['skipped'] = 'no top-level HTML page to load the shim'
+        return result
+    files = load_chunks(game_dir)
+    for path in oversized:
+        rel = path.relative_to(game_dir).as_posix()
+        result['split'].append(rel)
+        result['bytes'] += path.stat().st_size
+        if dry_run or parts_current(path, files.get(rel), part_size):
+            continue
+        files[rel] = split_file(path, part_size)
+    if not dry_run:
+        result['pages'] = write_shim(game_dir, files)
+    return result
+
+
+def verify_game(game_dir):
+    """-> [(relative path, problem)] for parts that don't reassemble to the recorded file"""
+    game_dir = Path(game_dir)
+    problems = []
+    for rel, entry in sorted(load_chunks(game_dir).items()):
+        parent = (game_dir / rel).parent
+        digest, size = hashlib.sha256(), 0
+        for name in entry['parts']:
+            part = parent / name
+            if not part.exists():
+                problems.append((rel, f"missing {name}"))
+                break
+            if part.stat().st_size > PAGES_LIMIT:
+                problems.append((rel, f"{name} is over the Pages limit"))
+            with open(part, 'rb') as f:
+                for data in iter(lambda: f.read(READ_SIZE), b''):
+                    digest.update(data)
+                    size += len(data)
+        else:
+            if size != entry['size'] or digest.hexdigest() != entry['sha256']:
+                problems.append((rel, 'parts do not match the recorded size/hash'))
+    return problems
+
+
+def unsplit_game(game_dir):
+    """Remove parts, manifest, shim and tags. Returns True if anything was removed."""
+    game_dir = Path(game_dir)
+    files = load_chunks(game_dir)
+    for rel in files:
+        remove_parts(game_dir / rel)
+    changed = bool(files)
+    for page in entry_pages(game_dir):
+        with open(page, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            text = f.read()
+        new_text = TAG_RE.sub('', text)
+        if new_text != text:
+            write_atomic(page, new_text)
+            changed = True
+    for name in (CHUNKS_NAME, SHIM_NAME):
+        if (game_dir / name).exists():
+            (game_dir / name).unlink()
+            changed = True
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Split assets over the Pages 25 MiB limit into parts')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('scan', 'List files over the limit'),
+                            ('split', 'Write parts and inject the reassembly shim'),
+                            ('verify', 'Check that parts reassemble to the recorded files'),
+                            ('unsplit', 'Remove parts and the shim')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('dirs', nargs='*', help='Game directories')
+        p.add_argument('--all', action='store_true', help='Every directory game under non-semag/')
+        if name == 'split':
+            p.add_argument('--part-size', type=int, default=PART_SIZE, help=f'Bytes per part (default {PART_SIZE})')
+            p.add_argument('--dry-run', action='store_true', help="Don't write files")
+    args = parser.parse_args()
+
+    dirs = [Path(d) for d in args.dirs]
+    if args.all or (args.command == 'scan' and not dirs):
+        dirs += [game.path for game in iter_games() if game.is_dir]
+    if not dirs:
+        parser.error('give game directories or --all')
+    missing = [d for d in dirs if not d.is_dir()]
+    if missing:
+        print(f"✗ Not a directory: {', '.join(map(str, missing))}")
+        sys.exit(1)
+    if args.command == 'split' and args.part_size > PAGES_LIMIT:
+        parser.error(f'--part-size must be at most {PAGES_LIMIT}')
+
+    if args.command == 'scan':
+        total = 0
+        for game_dir in dirs:
+            chunked = load_chunks(game_dir)
+            for path in oversized_files(game_dir):
+                rel = path.relative_to(game_dir).as_posix()
+                total += 1
+                state = 'split' if rel in chunked else 'not split'
+                print(f"  {display(path)}: {path.stat().st_size / (1024 * 1024):.1f} MiB ({state})")
+        print(f"\n{total} files over {PAGES_LIMIT // (1024 * 1024)} MiB")
+    elif args.command == 'split':
+        for game_dir in dirs:
+            result = split_game(game_dir, args.part_size, dry_run=args.dry_run)
+            if result['skipped']:
+                if args.dirs:
+                    print(f"  - {display(game_dir)}: skipped ({result['skipped']})")
+                continue
+            print(f"  {'~' if args.dry_run else '✓'} {display(game_dir)}: {len(result['split'])} files, "
+                  f"{result['bytes'] / (1024 * 1024):.1f} MiB"
+                  f"{' (' + ', '.join(result['pages']) + ')' if result['pages'] else ''}")
+            for rel in result['split']:
+                print(f"      {rel}")
+    elif args.command == 'verify':
+        bad = 0
+        for game_dir in dirs:
+            files = load_chunks(game_dir)
+            if not files:
+                continue
+            problems = verify_game(game_dir)
+            bad += bool(problems)
+            print(f"  {'✗' if problems else '✓'} {display(game_dir)}: {len(files)} split files")
+            for rel, problem in problems:
+                print(f"      {rel}: {problem}")
+        if bad:
+            sys.exit(1)
+    else:
+        for game_dir in dirs:
+            if unsplit_game(game_dir):
+                print(f"  ✓ {display(game_dir)}: parts removed")
+
+
+if __name__ == "__main__":
+    main()
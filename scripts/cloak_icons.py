@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Move the tab-cloak favicons out of data/cloaks.json into their own files.
+
+cloaks.json inlined every preset's favicon as a base64 data: URL, so
+js/cloaks.js downloaded ~600 KB to show the preset list, and a picked icon
+went into the tabicon cookie as a data: URL far bigger than a cookie can
+hold. This decodes each inlined icon (including gzip-wrapped ones), scales
+it to favicon size (--size, 32px by default, never up) as an optimized PNG,
+and writes it to img/cloaks/<sha256 prefix>.png. Identical icons share a
+file. Each cloaks.json entry keeps its [title, icon URL] shape, so
+js/cloaks.js and setCloak() need no changes: the URL is now a short path.
+
+Without Pillow the decoded bytes are stored as they are (still hashed and
+deduplicated). Files in img/cloaks/ that no entry references are removed.
+
+Usage:
+    python scripts/cloak_icons.py
+    python scripts/cloak_icons.py --size 48
+    python scripts/cloak_icons.py --dry-run
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from urllib.parse import unquote_to_bytes
+
+from novahub_config import DATA_DIR, ROOT_DIR
+
+# Try to import Pillow to resize and re-encode
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+CLOAKS_PATH = DATA_DIR / "cloaks.json"
+ICONS_DIR = ROOT_DIR / "img" / "cloaks"
+ICON_SIZE = 32
+DATA_URL_RE = re.compile(r'^data:([^;,]*)((?:;[^;,]*)*),(.*)$', re.S)
+EXTENSIONS = {'image/png': '.png', 'image/x-icon': '.ico', 'image/vnd.microsoft.icon': '.ico',
+              'image/jpeg': '.jpg', 'image/gif': '.gif', 'image/svg+xml': '.svg', 'image/webp': '.webp'}
+
+
+def decode_data_url(url):
+    """data: URL -> (mime type, bytes), or None if url isn't one"""
+    match = DATA_URL_RE.match(url)
+    if not match:
+        return None
+    mime, params, payload = match.groups()
+    data = base64.b64decode(payload) if ';base64' in params else unquote_to_bytes(payload)
+    # Some exported favicons are gzip-compressed behind an image/x-icon label
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    return mime or 'application/octet-stream', data
+
+
+def optimize(data, size=ICON_SIZE):
+    """Largest frame, scaled down to size x size, as an optimized PNG"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        image = image.convert('RGBA')
+    if max(image.size) > size:
+        image.thumbnail((size, size), Image.LANCZOS)
+    out = io.BytesIO()
+    image.save(out, 'PNG', optimize=True)
+    return out.getvalue()
+
+
+def icon_file(mime, data, size=ICON_SIZE):
+    """-> (file name, bytes) for one decoded icon"""
+    extension = EXTENSIONS.get(mime, '.bin')
+    if PIL_AVAILABLE and extension != '.svg':
+        try:
+            data, extension = optimize(data, size), '.png'
+        except (OSError, ValueError) as e:
+            print(f"    ⚠ Couldn't re-encode ({e}); keeping the original bytes")
+    return hashlib.sha256(data).hexdigest()[:16] + extension, data
+
+
+def format_cloaks(cloaks):
+    """cloaks.json's layout: one [title, icon] pair per entry, 4-space indent"""
+    lines = []
+    for i, (key, value) in enumerate(cloaks.items()):
+        items = ', '.join(json.dumps(v, ensure_ascii=False) for v in value)
+        lines.append(f"    {json.dumps(key)}: [\n        {items}\n    ]" + (',' if i < len(cloaks) - 1 else ''))
+    return '{\n' + '\n'.join(lines) + '\n}\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract inlined cloak favicons into hashed files')
+    parser.add_argument('--size', type=int, default=ICON_SIZE, help=f'Max icon edge in pixels (default {ICON_SIZE})')
+    parser.add_argument('--dry-run', action='store_true', help="Report only, write nothing")
+    args = parser.parse_args()
+
+    if not PIL_AVAILABLE:
+        print("Warning: Pillow not available, icons are stored unresized. Install with: pip install pillow")
+
+    raw = CLOAKS_PATH.read_bytes()
+    cloaks = json.loads(raw.decode('utf-8'))
+    newline = '\r\n' if b'\r\n' in raw else '\n'
+
+    files = {}
+    for key, value in cloaks.items():
+        decoded = decode_data_url(value[1]) if len(value) > 1 else None
+        if not decoded:
+            continue
+        name, data = icon_file(*decoded, size=args.size)
+        shared = ' (shared)' if name in files else ''
+        files[name] = data
+        print(f"  {key:<12} {len(value[1]):>8,} chars -> {name} ({len(data):,} bytes){shared}")
+        value[1] = f"/img/cloaks/{name}"
+
+    referenced = {v[1].rsplit('/', 1)[-1] for v in cloaks.values() if len(v) > 1 and v[1].startswith('/img/cloaks/')}
+    stale = sorted(p for p in ICONS_DIR.glob('*') if p.is_file() and p.name not in referenced) if ICONS_DIR.is_dir() else []
+    text = format_cloaks(cloaks).replace('\n', newline)
+    print(f"\n{len(files)} icons extracted, {len(stale)} unreferenced removed; "
+          f"cloaks.json {len(raw):,} -> {len(text.encode('utf-8')):,} bytes")
+    if args.dry_run:
+        return
+
+    ICONS_DIR.mkdir(parents=True, exist_ok=True)
+    for name, data in files.items():
+        path = ICONS_DIR / name
+        if not path.exists():
+            path.write_bytes(data)
+    tmp_path = CLOAKS_PATH.with_name(CLOAKS_PATH.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, CLOAKS_PATH)
+    for path in stale:
+        path.unlink()
+
+
+if __name__ == "__main__":
+    main()
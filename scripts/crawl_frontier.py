@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier for discovering candidate games across multiple sites in one pass.
+
+Keeps a canonicalized "seen" set so every URL is fetched or recorded once, a
+priority queue per site so category/listing pages are crawled before deep
+pagination, and a JSON state file so a crawl can be stopped and resumed.
+Listing pages are fetched by a pool of workers that rotate between sites.
+
+Usage:
+    python scripts/crawl_frontier.py crawl --site crazygames --site lagged --max-pages 300
+    python scripts/crawl_frontier.py crawl --seed "https://lagged.com/en/funny" --workers 8
+    python scripts/crawl_frontier.py status
+    python scripts/crawl_frontier.py export --new-only > candidates.json
+"""
+import argparse
+import heapq
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+
+from bs4 import BeautifulSoup
+
+import http_client
+from novahub_config import CACHE_DIR, GAMES_JSON_PATH
+
+STATE_PATH = CACHE_DIR / "crawl-frontier.json"
+
+# Query parameters that never change page content
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|ref|fbclid|gclid|source|from)$', re.I)
+
+# Per-site crawl rules. "game" URLs are recorded as candidates (never fetched),
+# "listing" URLs are fetched and mined for more links.
+SITES = {
+    'crazygames': {
+        'hosts': {'www.crazygames.com', 'crazygames.com'},
+        'seeds': [
+            'https://www.crazygames.com/',
+            'https://www.crazygames.com/popular-games',
+            'https://www.crazygames.com/new-games',
+        ],
+        'game': re.compile(r'^/game/[^/]+$'),
+        'listing': re.compile(r'^/(c|t)/[^/]+$|^/(popular|new|updated)-games$|^/$'),
+        'script_links': re.compile(r'["\'](/game/[a-z0-9\-]+)["\']'),
+        'referer': 'https://www.crazygames.com/',
+        'delay': 0.5,
+    },
+    'lagged': {
+        'hosts': {'lagged.com', 'www.lagged.com'},
+        'seeds': ['https://lagged.com/'],
+        'game': re.compile(r'^/en/g/[^/]+$'),
+        'listing': re.compile(r'^/en/[a-z0-9\-]+(/\d+)?$|^/$'),
+        'script_links': None,
+        'referer': 'https://lagged.com/',
+        'delay': 0.5,
+    },
+    'gamemonetize': {
+        'hosts': {'gamemonetize.com', 'www.gamemonetize.com'},
+        'seeds': ['https://gamemonetize.com/'],
+        'game': re.compile(r'^/[a-z0-9\-]+-game$'),
+        'listing': re.compile(r'^/(games|category/[a-z0-9\-]+)(/page/\d+)?$|^/$'),
+        'script_links': None,
+        'referer': 'https://gamemonetize.com/',
+        'delay': 0.5,
+    },
+}
+
+# Fallback rules for ad-hoc seeds on sites without an entry above
+# (same link patterns batch-game-scraper.py looks for)
+GENERIC_GAME = re.compile(r'/(g|games|en/g|en/games|game)/[^/]+$')
+GENERIC_LISTING = re.compile(r'/(category|categories|c|tag|t|page)/')
+
+
+def canonicalize_url(url, base=None):
+    """Normalize a URL so trivially different spellings dedupe to one key.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the remaining query string.
+    """
+    if base:
+        url = urljoin(base, url)
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or 'https').lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and not ((scheme == 'http' and parsed.port == 80) or (scheme == 'https' and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+    path = re.sub(r'/{2,}', '/', parsed.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)]
+    query.sort()
+    return urlunparse((scheme, host, path, '', urlencode(query), ''))
+
+
+def site_for_url(url):
+    """Return the configured site name for a URL, or its host for ad-hoc seeds"""
+    host = (urlparse(url).hostname or '').lower()
+    for name, rules in SITES.items():
+        if host in rules['hosts']:
+            return name
+    return host
+
+
+def classify_url(site, url):
+    """Classify a canonical URL as 'game', 'listing' or None for a site"""
+    parsed = urlparse(url)
+    rules = SITES.get(site)
+    if rules is None:
+        if (parsed.hostname or '') != site:
+            return None
+        if GENERIC_GAME.search(parsed.path) and 'category' not in parsed.path:
+            return 'game'
+        if GENERIC_LISTING.search(parsed.path):
+            return 'listing'
+        return None
+    if parsed.hostname not in rules['hosts']:
+        return None
+    if rules['game'].match(parsed.path):
+        return 'game'
+    if rules['listing'].match(parsed.path):
+        return 'listing'
+    return None
+
+
+def game_slug(url):
+    """Last path segment of a game URL"""
+    return urlparse(url).path.rstrip('/').split('/')[-1].lower()
+
+
+def load_existing_slugs(games_json_path=GAMES_JSON_PATH):
+    """Directories and URL slugs already present in games.json"""
+    slugs = set()
+    if not Path(games_json_path).exists():
+        return slugs
+    with open(games_json_path, 'r', encoding='utf-8') as f:
+        games = json.load(f)
+    for game in games:
+        directory = game.get('directory', '').lower().strip()
+        if directory:
+            slugs.add(directory)
+        url = game.get('gameUrl') or game.get('url') or ''
+        if url:
+            slugs.add(Path(urlparse(url).path).stem.lower())
+    return slugs
+
+
+class CrawlFrontier:
+    """Thread-safe URL frontier with per-site priority queues and a seen set.
+
+    Lower priority values are crawled first. Seeds start at 0 and every hop
+    adds 1, so shallow listing pages are always drained before deeper ones.
+    """
+
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = Path(state_path)
+        self.lock = threading.Lock()
+        self.seen = set()
+        self.queues = {}
+        self.candidates = {}
+        self.fetched = 0
+        self.errors = {}
+        self._counter = 0
+
+    def add(self, url, site=None, priority=0, found_on=None):
+        """Add a URL; returns True if it was new. Game URLs become candidates."""
+        url = canonicalize_url(url)
+        site = site or site_for_url(url)
+        kind = classify_url(site, url)
+        if kind is None:
+            return False
+        with self.lock:
+            if url in self.seen:
+                return False
+            self.seen.add(url)
+            if kind == 'game':
+                self.candidates[url] = {
+                    'site': site,
+                    'url': url,
+                    'slug': game_slug(url),
+                    'found_on': found_on,
+                    'depth': priority,
+                }
+            else:
+                self._counter += 1
+                heapq.heappush(self.queues.setdefault(site, []), (priority, self._counter, url))
+            return True
+
+    def pop(self, site):
+        """Pop the highest-priority listing URL for a site, or None"""
+        with self.lock:
+            queue = self.queues.get(site)
+            if not queue:
+                return None
+            priority, _, url = heapq.heappop(queue)
+            return priority, url
+
+    def pending(self):
+        """Number of listing pages still queued across all sites"""
+        with self.lock:
+            return sum(len(q) for q in self.queues.values())
+
+    def sites(self):
+        with self.lock:
+            return [site for site, q in self.queues.items() if q]
+
+    def save(self):
+        """Persist the frontier so a later run resumes where this one stopped"""
+        with self.lock:
+            state = {
+                'seen': sorted(self.seen),
+                'queues': {site: sorted(q) for site, q in self.queues.items() if q},
+                'candidates': list(self.candidates.values()),
+                'fetched': self.fetched,
+                'errors': self.errors,
+            }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        tmp_path.replace(self.state_path)
+
+    def load(self):
+        """Load persisted state if present; returns True when resumed"""
+        if not self.state_path.exists():
+            return False
+        state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        with self.lock:
+            self.seen = set(state.get('seen', []))
+            self.queues = {}
+            for site, items in state.get('queues', {}).items():
+                queue = [tuple(item) for item in items]
+                heapq.heapify(queue)
+                self.queues[site] = queue
+                self._counter = max([self._counter] + [item[1] for item in queue])
+            self.candidates = {c['url']: c for c in state.get('candidates', [])}
+            self.fetched = state.get('fetched', 0)
+            self.errors = state.get('errors', {})
+        return True
+
+
+def extract_links(site, page_url, html):
+    """Yield absolute links from a listing page, including JS-embedded game paths"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if href.startswith(('javascript:', 'mailto:', '#')):
+            continue
+        yield urljoin(page_url, href)
+    rules = SITES.get(site)
+    if rules and rules['script_links']:
+        for script in soup.find_all('script'):
+            if script.string:
+                for match in rules['script_links'].findall(script.string):
+                    yield urljoin(page_url, match)
+
+
+def fetch_listing(frontier, site, priority, url, max_depth):
+    """Fetch one listing page and push everything it links to"""
+    rules = SITES.get(site, {})
+    headers = {'Referer': rules['referer']} if rules.get('referer') else {}
+    response = http_client.get(url, headers=headers, timeout=30)
+    response.raise_for_status()
+    added = 0
+    for link in extract_links(site, url, response.text):
+        canonical = canonicalize_url(link)
+        if site_for_url(canonical) != site:
+            continue
+        kind = classify_url(site, canonical)
+        if kind == 'listing' and priority + 1 > max_depth:
+            continue
+        if frontier.add(canonical, site=site, priority=priority + 1, found_on=url):
+            added += 1
+    with frontier.lock:
+        frontier.fetched += 1
+    return added
+
+
+def crawl(frontier, max_pages=200, workers=6, max_depth=3, save_every=25):
+    """Drain the frontier with a worker pool, rotating between sites.
+
+    Each site is fetched by at most one worker at a time and waits its
+    configured delay between requests, so adding sites adds throughput
+    without hammering any single host.
+    """
+    busy = set()
+    next_allowed = {}
+    futures = {}
+    fetched_this_run = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            now = time.monotonic()
+            for site in frontier.sites():
+                if len(futures) >= workers or fetched_this_run >= max_pages:
+                    break
+                if site in busy or next_allowed.get(site, 0) > now:
+                    continue
+                item = frontier.pop(site)
+                if item is None:
+                    continue
+                priority, url = item
+                busy.add(site)
+                fetched_this_run += 1
+                futures[executor.submit(fetch_listing, frontier, site, priority, url, max_depth)] = (site, url)
+
+            if not futures:
+                if fetched_this_run >= max_pages or frontier.pending() == 0:
+                    break
+                time.sleep(0.05)
+                continue
+
+            done, _ = wait(futures, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                site, url = futures.pop(future)
+                busy.discard(site)
+                next_allowed[site] = time.monotonic() + SITES.get(site, {}).get('delay', 1.0)
+                try:
+                    added = future.result()
+                    print(f"  ✓ [{site}] {url} (+{added})", flush=True)
+                except Exception as e:
+                    with frontier.lock:
+                        frontier.errors[url] = str(e)[:200]
+                    print(f"  ✗ [{site}] {url}: {e}", flush=True)
+                if frontier.fetched % save_every == 0:
+                    frontier.save()
+
+    frontier.save()
+    return fetched_this_run
+
+
+def cmd_crawl(args):
+    frontier = CrawlFrontier(args.state)
+    if not args.fresh and frontier.load():
+        print(f"📂 Resumed frontier: {len(frontier.seen)} seen, {frontier.pending()} queued, {len(frontier.candidates)} candidates")
+
+    sites = args.site or ([] if args.seed else list(SITES))
+    for site in sites:
+        if site not in SITES:
+            print(f"❌ Unknown site '{site}' (known: {', '.join(SITES)})")
+            sys.exit(1)
+        for seed in SITES[site]['seeds']:
+            frontier.add(seed, site=site, priority=0)
+    for seed in args.seed or []:
+        frontier.add(seed, priority=0)
+
+    print(f"🔍 Crawling {frontier.pending()} queued pages with {args.workers} workers (max {args.max_pages} pages)...\n")
+    started = time.time()
+    fetched = crawl(frontier, args.max_pages, args.workers, args.max_depth)
+    elapsed = time.time() - started
+
+    print(f"\n✅ Fetched {fetched} pages in {elapsed:.1f}s")
+    print(f"📊 Candidates: {len(frontier.candidates)} | queued: {frontier.pending()} | errors: {len(frontier.errors)}")
+    print(f"📁 State: {frontier.state_path}")
+
+
+def cmd_status(args):
+    frontier = CrawlFrontier(args.state)
+    if not frontier.load():
+        print("No frontier state yet. Run: python scripts/crawl_frontier.py crawl")
+        return
+    existing = load_existing_slugs()
+    by_site = {}
+    for candidate in frontier.candidates.values():
+        stats = by_site.setdefault(candidate['site'], {'candidates': 0, 'new': 0})
+        stats['candidates'] += 1
+        if candidate['slug'] not in existing:
+            stats['new'] += 1
+    print(f"Seen URLs:      {len(frontier.seen)}")
+    print(f"Pages fetched:  {frontier.fetched}")
+    print(f"Errors:         {len(frontier.errors)}")
+    for site in sorted(set(by_site) | set(frontier.queues)):
+        stats = by_site.get(site, {'candidates': 0, 'new': 0})
+        queued = len(frontier.queues.get(site, []))
+        print(f"  {site:<15} {stats['candidates']:>6} candidates ({stats['new']} new), {queued} queued")
+
+
+def cmd_export(args):
+    frontier = CrawlFrontier(args.state)
+    frontier.load()
+    candidates = sorted(frontier.candidates.values(), key=lambda c: (c['site'], c['depth'], c['slug']))
+    if args.site:
+        candidates = [c for c in candidates if c['site'] in args.site]
+    if args.new_only:
+        existing = load_existing_slugs()
+        candidates = [c for c in candidates if c['slug'] not in existing]
+    json.dump(candidates, sys.stdout, indent=2)
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-site crawl frontier for game discovery')
+    parser.add_argument('--state', default=str(STATE_PATH), help='Frontier state file (default: .cache/crawl-frontier.json)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_crawl = sub.add_parser('crawl', help='Crawl listing pages and collect candidate games')
+    p_crawl.add_argument('--site', action='append', help=f"Site to crawl (repeatable; default: all of {', '.join(SITES)})")
+    p_crawl.add_argument('--seed', action='append', help='Extra seed URL (repeatable)')
+    p_crawl.add_argument('--max-pages', type=int, default=200, help='Listing pages to fetch this run (default: 200)')
+    p_crawl.add_argument('--max-depth', type=int, default=3, help='Max link hops from a seed (default: 3)')
+    p_crawl.add_argument('--workers', type=int, default=6, help='Parallel workers (default: 6)')
+    p_crawl.add_argument('--fresh', action='store_true', help='Ignore saved state and start over')
+    p_crawl.set_defaults(func=cmd_crawl)
+
+    p_status = sub.add_parser('status', help='Summarize the saved frontier')
+    p_status.set_defaults(func=cmd_status)
+
+    p_export = sub.add_parser('export', help='Print candidates as JSON')
+    p_export.add_argument('--site', action='append', help='Only this site (repeatable)')
+    p_export.add_argument('--new-only', action='store_true', help='Skip games already in games.json')
+    p_export.set_defaults(func=cmd_export)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Apply a text transform to every game in non-semag/ across a process pool.
+
+A transform is a function ``transform(path, text) -> text`` named as
+``module:function`` (any module on scripts/ path, or a hyphenated script file
+like ``remove-yandex-sdk.py:strip_yandex_sdk``). Each game runs in its own
+task, so one broken game can't take the sweep down, and --dry-run prints
+unified diffs instead of writing.
+
+Usage:
+    python scripts/for_each_game.py remove-yandex-sdk.py:strip_yandex_sdk --dry-run
+    python scripts/for_each_game.py my_fixes:fix_base_tag --glob "*.html" --glob "*.js" --workers 8
+    python scripts/for_each_game.py my_fixes:fix_base_tag --only ovo-2 --only sprunki --diff
+    python scripts/for_each_game.py --list
+"""
+import argparse
+import difflib
+import fnmatch
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from novahub_config import GAMES_DIR, ROOT_DIR, SCRIPTS_DIR
+
+# Directories under non-semag/ that hold shared assets, not games
+SKIP_DIRS = {'covers', '.vscode', '.git', 'node_modules'}
+
+# Short names for commonly used transforms
+TRANSFORMS = {
+    'yandex-sdk': 'remove-yandex-sdk.py:strip_yandex_sdk',
+}
+
+
+class Game:
+    """A game is either a directory (index.html + assets) or a single HTML file"""
+
+    __slots__ = ('name', 'path', 'is_dir')
+
+    def __init__(self, name, path, is_dir):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+
+    def files(self, patterns):
+        """Files in this game matching any of the glob patterns"""
+        if not self.is_dir:
+            return [self.path] if any(fnmatch.fnmatch(self.path.name, p) for p in patterns) else []
+        matched = []
+        for dirpath, dirnames, filenames in os.walk(self.path):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for filename in filenames:
+                if any(fnmatch.fnmatch(filename, p) for p in patterns):
+                    matched.append(Path(dirpath) / filename)
+        return sorted(matched)
+
+
+def iter_games(games_dir=GAMES_DIR):
+    """Yield every game under non-semag/.
+
+    Scrapers write games as non-semag/<dir>/index.html; the static catalog
+    lives in non-semag/games/<slug>.html, with a few full directories in
+    non-semag/games/<dir>/.
+    """
+    games_dir = Path(games_dir)
+    for entry in sorted(games_dir.iterdir()):
+        if entry.name in SKIP_DIRS or entry.name.startswith('.'):
+            continue
+        if entry.is_dir() and entry.name != 'games':
+            yield Game(entry.name, entry, True)
+    catalog_dir = games_dir / 'games'
+    if catalog_dir.is_dir():
+        for entry in sorted(catalog_dir.iterdir()):
+            if entry.name in SKIP_DIRS or entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                yield Game(entry.name, entry, True)
+            elif entry.suffix.lower() in ('.html', '.htm'):
+                yield Game(entry.stem, entry, False)
+
+
+def load_callable(spec):
+    """Resolve 'module:function' or 'some-script.py:function' to a function"""
+    spec = TRANSFORMS.get(spec, spec)
+    module_name, _, func_name = spec.partition(':')
+    if not func_name:
+        raise ValueError(f"Transform must look like module:function, got '{spec}'")
+    if module_name.endswith('.py'):
+        path = Path(module_name)
+        if not path.is_absolute() and not path.exists():
+            path = SCRIPTS_DIR / path
+        module_spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        if str(SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPTS_DIR))
+        module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+_transform_cache = {}
+
+
+def _get_transform(spec):
+    # Resolved once per worker process
+    if spec not in _transform_cache:
+        _transform_cache[spec] = load_callable(spec)
+    return _transform_cache[spec]
+
+
+def write_atomic(path, text):
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(text, encoding='utf-8', newline='')
+    os.replace(tmp_path, path)
+
+
+def process_game(game, spec, patterns, dry_run=False, want_diff=False):
+    """Run the transform over one game's files. Never raises; errors are reported per game."""
+    started = time.perf_counter()
+    result = {
+        'game': game.name,
+        'path': str(game.path.relative_to(ROOT_DIR)),
+        'files': 0,
+        'changed': [],
+        'bytes_before': 0,
+        'bytes_after': 0,
+        'diff': '',
+        'error': None,
+    }
+    try:
+        transform = _get_transform(spec)
+        diffs = []
+        for path in game.files(patterns):
+            result['files'] += 1
+            try:
+                with open(path, 'r', encoding='utf-8', newline='') as f:
+                    text = f.read()
+            except UnicodeDecodeError:
+                continue  # Binary file matched by a broad glob
+            new_text = transform(path, text)
+            if new_text is None or new_text == text:
+                continue
+            rel = str(path.relative_to(ROOT_DIR))
+            result['changed'].append(rel)
+            result['bytes_before'] += len(text.encode('utf-8'))
+            result['bytes_after'] += len(new_text.encode('utf-8'))
+            if want_diff:
+                diffs.extend(difflib.unified_diff(
+                    text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                    fromfile=f"a/{rel}", tofile=f"b/{rel}", n=2,
+                ))
+            if not dry_run:
+                write_atomic(path, new_text)
+        result['diff'] = ''.join(diffs)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run(spec, patterns=('*.html',), only=None, dry_run=False, want_diff=False, workers=None, games_dir=GAMES_DIR):
+    """Apply a transform to all (or only the named) games in parallel. Returns per-game results."""
+    load_callable(spec)  # Fail fast on a bad spec before forking
+    games = list(iter_games(games_dir))
+    if only:
+        wanted = set(only)
+        games = [g for g in games if g.name in wanted]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(process_game, game, spec, tuple(patterns), dry_run, want_diff): game
+            for game in games
+        }
+        for future in as_completed(futures):
+            game = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # Worker process died (segfault, OOM); isolate it to this game
+                results.append({'game': game.name, 'path': str(game.path), 'files': 0, 'changed': [],
+                                'bytes_before': 0, 'bytes_after': 0, 'diff': '', 'error': f"worker crashed: {e}"})
+    results.sort(key=lambda r: r['game'])
+    return results
+
+
+def print_summary(results, dry_run, show_diff):
+    changed = [r for r in results if r['changed']]
+    errors = [r for r in results if r['error']]
+    for r in changed:
+        saved = r['bytes_before'] - r['bytes_after']
+        print(f"  {'~' if dry_run else '✓'} {r['game']}: {len(r['changed'])} file(s), {saved:+,} bytes saved")
+        if show_diff and r['diff']:
+            print(r['diff'])
+    for r in errors:
+        print(f"  ✗ {r['game']}: {r['error']}")
+    total_files = sum(r['files'] for r in results)
+    total_saved = sum(r['bytes_before'] - r['bytes_after'] for r in changed)
+    verb = 'would change' if dry_run else 'changed'
+    print(f"\n{len(results)} games, {total_files} files scanned; {verb} {len(changed)} games "
+          f"({total_saved:,} bytes saved), {len(errors)} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply a transform to every game in non-semag/ in parallel')
+    parser.add_argument('transform', nargs='?', help=f"module:function, script.py:function, or one of: {', '.join(TRANSFORMS)}")
+    parser.add_argument('--glob', action='append', help='File pattern to transform (repeatable; default: *.html)')
+    parser.add_argument('--only', action='append', help='Only this game (repeatable)')
+    parser.add_argument('--dry-run', action='store_true', help="Don't write files")
+    parser.add_argument('--diff', action='store_true', help='Print unified diffs of changes')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', help='Write per-game results as JSON to this file')
+    parser.add_argument('--list', action='store_true', help='List discovered games and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        games = list(iter_games())
+        for game in games:
+            print(f"  {'dir ' if game.is_dir else 'file'} {game.name}")
+        print(f"\n{len(games)} games")
+        return
+    if not args.transform:
+        parser.error('a transform is required')
+
+    started = time.time()
+    results = run(args.transform, args.glob or ['*.html'], args.only, args.dry_run,
+                  want_diff=args.diff or bool(args.report), workers=args.workers)
+    print_summary(results, args.dry_run, args.diff)
+    print(f"Done in {time.time() - started:.2f}s")
+    if args.report:
+        Path(args.report).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"📁 Report: {args.report}")
+    if any(r['error'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
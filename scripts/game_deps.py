@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Static dependency graph for every game in non-semag/.
+
+Follows references from each game's HTML to JS/CSS/images/audio/wasm/data,
+including Unity build configs (buildUrl + "/x.data", loader .json files),
+and reports:
+  - missing files: hard references (src/href attributes, CSS url(), Unity
+    build files) that don't exist, i.e. 404s at runtime
+  - unreferenced files: files nothing reaches from any game HTML or from
+    games.json, i.e. dead weight in the tree
+  - external hot-links: hosts each game loads from at runtime
+
+Per-game results are cached in .cache/game-deps.json keyed on the game's file
+sizes and mtimes, so re-runs only re-parse games that changed.
+
+Usage:
+    python scripts/game_deps.py
+    python scripts/game_deps.py --missing --orphans --hosts
+    python scripts/game_deps.py --only ovo-2 --graph
+    python scripts/game_deps.py --json deps-report.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+
+from for_each_game import SKIP_DIRS, iter_games
+from novahub_config import CACHE_DIR, GAMES_DIR, GAMES_JSON_PATH, ROOT_DIR
+
+# Written by verified_download.py next to each game's files
+MANIFEST_NAME = 'nova-manifest.json'
+# chunk_splitter.py's record and the parts its shim fetches by name
+CHUNKS_NAME = 'nova-chunks.json'
+CHUNK_RE = re.compile(r'\.chunk\d{3}$')
+
+CACHE_PATH = CACHE_DIR / "game-deps.json"
+# Editing the extraction rules invalidates every cached result
+CACHE_VERSION = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()[:12]
+
+TEXT_EXTS = {'.html', '.htm', '.js', '.mjs', '.css', '.json'}
+ASSET_EXTS = (
+    'js|mjs|css|png|jpe?g|gif|webp|svg|ico|json|wasm|data|unityweb|br|gz|mem|symbols\\.json|'
+    'mp3|ogg|m4a|wav|mp4|webm|swf|txt|xml|ttf|otf|woff2?|atlas|fnt|bin|pck|zip'
+)
+
+# Hard references: the browser will request these as soon as the page parses.
+# Only tags that load something; <a href> is navigation, not a dependency.
+ASSET_TAG_RE = re.compile(r'<(?:script|link|img|source|video|audio|object|embed|iframe|track|input)\b[^>]*>', re.I)
+ATTR_RE = re.compile(r'\b(?:src|href|data|poster|data-src)\s*=\s*["\']([^"\'<>]+)["\']', re.I)
+SRCSET_RE = re.compile(r'\bsrcset\s*=\s*["\']([^"\']+)["\']', re.I)
+CSS_URL_RE = re.compile(r'url\(\s*["\']?([^"\')]+?)["\']?\s*\)|@import\s+["\']([^"\']+)["\']', re.I)
+BASE_RE = re.compile(r'<base\b[^>]*\bhref\s*=\s*["\']([^"\']*)["\']', re.I)
+# Unity WebGL: var buildUrl = "Build"; ... dataUrl: buildUrl + "/game.data"
+UNITY_BUILD_RE = re.compile(r'buildUrl\s*=\s*["\']([^"\']*)["\']')
+UNITY_PART_RE = re.compile(r'buildUrl\s*\+\s*["\']([^"\']+)["\']')
+# Soft references: asset-looking string literals in scripts/JSON (fetch, XHR, engine configs)
+LITERAL_RE = re.compile(rf'["\'`]([^"\'`\s<>(){{}}]+?\.(?:{ASSET_EXTS}))(?:\?[^"\'`\s]*)?["\'`]', re.I)
+TAG_ATTR_IN_TEXT = re.compile(r'<link\b[^>]*rel\s*=\s*["\'](?:canonical|alternate)["\'][^>]*>', re.I)
+HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+STYLE_RE = re.compile(r'<style\b[^>]*>(.*?)</style>|\bstyle\s*=\s*"([^"]*)"', re.I | re.S)
+
+IGNORED_SCHEMES = ('data:', 'blob:', 'javascript:', 'mailto:', 'about:', 'tel:', '#')
+
+
+def extract_refs(text, ext):
+    """Return (base_href, [(ref, hard), ...]) for one file"""
+    refs = []
+    base = None
+    if ext in ('.html', '.htm'):
+        text = HTML_COMMENT_RE.sub('', text)
+        base_match = BASE_RE.search(text)
+        base = base_match.group(1) if base_match else None
+        cleaned = TAG_ATTR_IN_TEXT.sub('', text)
+        for tag in ASSET_TAG_RE.finditer(cleaned):
+            refs.extend((m.group(1), True) for m in ATTR_RE.finditer(tag.group(0)))
+            for m in SRCSET_RE.finditer(tag.group(0)):
+                refs.extend((part.strip().split(' ')[0], True) for part in m.group(1).split(',') if part.strip())
+        # Only real CSS; url(x) inside scripts is usually a variable, not a path
+        styles = '\n'.join(m.group(1) or m.group(2) or '' for m in STYLE_RE.finditer(text))
+        refs.extend((m.group(1) or m.group(2), True) for m in CSS_URL_RE.finditer(styles))
+    if ext == '.css':
+        refs.extend((m.group(1) or m.group(2), True) for m in CSS_URL_RE.finditer(text))
+    if ext in ('.html', '.htm', '.js', '.mjs'):
+        build = UNITY_BUILD_RE.search(text)
+        if build:
+            refs.extend((posixpath.join(build.group(1), m.group(1).lstrip('/')), True) for m in UNITY_PART_RE.finditer(text))
+    if ext != '.css':
+        refs.extend((m.group(1), False) for m in LITERAL_RE.finditer(text))
+    return base, refs
+
+
+def classify_ref(ref, file_dir, page_dir, base):
+    """Resolve a reference -> ('skip'|'external'|'local', value)
+
+    Local values are paths relative to ROOT_DIR. Root-absolute refs resolve
+    against the site root, like they do in production.
+    """
+    ref = ref.strip()
+    if not ref or ref.startswith(IGNORED_SCHEMES) or '${' in ref or '{{' in ref:
+        return 'skip', None
+    if ref.startswith('//'):
+        ref = 'https:' + ref
+    parsed = urlparse(ref)
+    if parsed.scheme in ('http', 'https'):
+        return 'external', parsed.hostname or ''
+    if parsed.scheme:
+        return 'skip', None
+    if base and urlparse(base).scheme in ('http', 'https'):
+        # Everything relative resolves against the remote base, root-absolute paths included
+        return 'external', urlparse(base).hostname or ''
+    path = unquote(parsed.path)
+    if not path:
+        return 'skip', None
+    if path.startswith('/'):
+        return 'local', posixpath.normpath(path.lstrip('/'))
+    candidates = []
+    start = page_dir
+    if base:
+        start = posixpath.normpath(posixpath.join(page_dir, base))
+    candidates.append(posixpath.normpath(posixpath.join(start, path)))
+    if file_dir != page_dir:
+        candidates.append(posixpath.normpath(posixpath.join(file_dir, path)))
+    return 'local', candidates
+
+
+def game_signature(game):
+    """Hash of (path, size, mtime) for every file in the game"""
+    digest = hashlib.sha1()
+    paths = [game.path] if not game.is_dir else None
+    if paths is None:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(game.path):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            paths.extend(Path(dirpath) / f for f in sorted(filenames))
+    for path in paths:
+        st = path.stat()
+        digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def analyze_game(game):
+    """Walk one game's reference graph starting from its HTML files"""
+    rel = lambda p: Path(p).relative_to(ROOT_DIR).as_posix()
+    if game.is_dir:
+        entries = sorted(rel(p) for p in game.files(['*.html', '*.htm']))
+        own_files = {rel(p) for p in game.files(['*'])}
+    else:
+        entries = [rel(game.path)]
+        own_files = set(entries)
+
+    reachable = set()
+    edges = {}
+    missing = {}
+    hosts = Counter()
+    queue = [(e, posixpath.dirname(e)) for e in entries]
+    seen = set()
+    while queue:
+        path, page_dir = queue.pop()
+        if (path, page_dir) in seen:
+            continue
+        seen.add((path, page_dir))
+        reachable.add(path)
+        ext = posixpath.splitext(path)[1].lower()
+        if ext not in TEXT_EXTS:
+            continue
+        try:
+            text = (ROOT_DIR / path).read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            continue
+        base, refs = extract_refs(text, ext)
+        if ext in ('.html', '.htm'):
+            page_dir = posixpath.dirname(path)
+        file_dir = posixpath.dirname(path)
+        targets = set()
+        for ref, hard in refs:
+            kind, value = classify_ref(ref, file_dir, page_dir, base if ext in ('.html', '.htm') else None)
+            if kind == 'external':
+                if hard:
+                    hosts[value] += 1
+                continue
+            if kind != 'local':
+                continue
+            candidates = value if isinstance(value, list) else [value]
+            found = next((c for c in candidates if (ROOT_DIR / c).is_file()), None)
+            if found:
+                targets.add(found)
+                queue.append((found, page_dir))
+            elif hard:
+                missing.setdefault(candidates[0], path)
+        if targets:
+            edges[path] = sorted(targets)
+
+    return {
+        'game': game.name,
+        'path': rel(game.path),
+        'entries': entries,
+        'files': len(own_files),
+        'reachable': sorted(reachable),
+        'unreachable_own': sorted(own_files - reachable),
+        'edges': edges,
+        'missing': missing,
+        'hosts': dict(hosts),
+    }
+
+
+def load_cache():
+    if CACHE_PATH.exists():
+        cache = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+        if cache.get('version') == CACHE_VERSION:
+            return cache
+    return {'version': CACHE_VERSION, 'games': {}}
+
+
+def save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(cache), encoding='utf-8')
+    tmp_path.replace(CACHE_PATH)
+
+
+def build_graph(only=None, use_cache=True, workers=None):
+    """Analyze all games, re-parsing only those whose files changed. Returns (results, reparsed)."""
+    games = list(iter_games())
+    if only:
+        games = [g for g in games if g.name in set(only)]
+    cache = load_cache() if use_cache else {'version': CACHE_VERSION, 'games': {}}
+
+    results = {}
+    stale = []
+    for game in games:
+        key = str(game.path.relative_to(ROOT_DIR))
+        signature = game_signature(game)
+        cached = cache['games'].get(key)
+        if cached and cached['signature'] == signature:
+            results[key] = cached['result']
+        else:
+            stale.append((key, signature, game))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for (key, signature, _), result in zip(stale, executor.map(analyze_game, [g for _, _, g in stale], chunksize=16)):
+                results[key] = result
+                cache['games'][key] = {'signature': signature, 'result': result}
+    if only is None:
+        live = set(results)
+        cache['games'] = {k: v for k, v in cache['games'].items() if k in live}
+    save_cache(cache)
+    return results, len(stale)
+
+
+def catalog_refs():
+    """Local image/game paths referenced from games.json -> {path: game name}"""
+    refs = {}
+    if not GAMES_JSON_PATH.exists():
+        return refs
+    for game in json.loads(GAMES_JSON_PATH.read_text(encoding='utf-8')):
+        for field in ('gameUrl', 'imagePath', 'url'):
+            value = game.get(field) or ''
+            if value.startswith('/non-semag/') or value.startswith('non-semag/'):
+                refs[unquote(value.lstrip('/'))] = game.get('name', '')
+    return refs
+
+
+def find_orphans(results):
+    """Files under non-semag/ reachable from no game HTML and no games.json entry"""
+    reachable = set()
+    for result in results.values():
+        reachable.update(result['reachable'])
+    reachable.update(catalog_refs())
+    orphans = []
+    for dirpath, dirnames, filenames in os.walk(GAMES_DIR):
+        dirnames[:] = [d for d in dirnames if d not in ('.git', 'node_modules')]
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            rel = path.relative_to(ROOT_DIR).as_posix()
+            if (rel not in reachable and not filename.startswith('.') and filename not in (MANIFEST_NAME, CHUNKS_NAME)
+                    and not CHUNK_RE.search(filename)):
+                orphans.append((rel, path.stat().st_size))
+    return sorted(orphans)
+
+
+def missing_catalog_files():
+    return sorted((path, name) for path, name in catalog_refs().items() if not (ROOT_DIR / path).exists())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reference graph, missing files and orphans for non-semag/ games')
+    parser.add_argument('--only', action='append', help='Only this game (repeatable)')
+    parser.add_argument('--missing', action='store_true', help='List every missing file')
+    parser.add_argument('--orphans', action='store_true', help='List unreferenced files')
+    parser.add_argument('--hosts', action='store_true', help='List external hosts per game')
+    parser.add_argument('--graph', action='store_true', help='Print the reference edges')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every game')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--json', help='Write the full report to this file')
+    args = parser.parse_args()
+
+    started = time.time()
+    results, reparsed = build_graph(args.only, not args.no_cache, args.workers)
+    orphans = [] if args.only else find_orphans(results)
+    catalog_missing = [] if args.only else missing_catalog_files()
+    elapsed = time.time() - started
+
+    with_missing = [r for r in results.values() if r['missing']]
+    hosts = Counter()
+    for r in results.values():
+        hosts.update(r['hosts'].keys())
+
+    if args.graph:
+        for r in results.values():
+            print(f"\n{r['game']}:")
+            for src, targets in sorted(r['edges'].items()):
+                for target in targets:
+                    print(f"  {src} → {target}")
+    if args.missing:
+        for r in with_missing:
+            for path, referrer in sorted(r['missing'].items()):
+                print(f"  ✗ {r['game']}: {path} (from {referrer})")
+        for path, name in catalog_missing:
+            print(f"  ✗ games.json '{name}': {path}")
+    if args.orphans:
+        for path, size in orphans:
+            print(f"  · {path} ({size / 1024:.1f} KB)")
+    if args.hosts:
+        for r in results.values():
+            if r['hosts']:
+                print(f"  {r['game']}: {', '.join(sorted(r['hosts']))}")
+
+    orphan_bytes = sum(size for _, size in orphans)
+    print(f"\n{len(results)} games analyzed in {elapsed:.2f}s ({reparsed} re-parsed, {len(results) - reparsed} cached)")
+    print(f"  Missing files:      {sum(len(r['missing']) for r in with_missing)} in {len(with_missing)} games, "
+          f"{len(catalog_missing)} from games.json")
+    if not args.only:
+        print(f"  Unreferenced files: {len(orphans)} ({orphan_bytes / 1024 / 1024:.1f} MB)")
+    print(f"  External hosts:     {len(hosts)} ({', '.join(h for h, _ in hosts.most_common(5))})")
+
+    if args.json:
+        report = {
+            'games': results,
+            'orphans': [{'path': p, 'size': s} for p, s in orphans],
+            'catalog_missing': [{'path': p, 'name': n} for p, n in catalog_missing],
+            'hosts': dict(hosts),
+        }
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"📁 Report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Live health check for every entry in data/games.json.
+
+Requests each entry's gameUrl and imagePath, then every first-level asset the
+game page references (scripts, styles, images, Unity build files), through an
+async HTTP client with a global and a per-host concurrency limit. Assets are
+tried with HEAD first and fall back to GET when a host rejects HEAD.
+
+non-semag entries are served from scripts/local_server.py on a free port
+(or --local-base, e.g. a running `wrangler pages dev`); /semag/ entries
+come from R2, so they're checked against --semag-base.
+
+Usage:
+    python scripts/health_check.py
+    python scripts/health_check.py --source non-semag --no-assets
+    python scripts/health_check.py --semag-base https://nova-labs.pages.dev --report health.json
+    python scripts/health_check.py --only "OvO 2" --only "Ice Dodo" -v
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin, urlparse
+
+import http_client
+from game_deps import IGNORED_SCHEMES, extract_refs
+from local_server import serve_in_thread
+from novahub_config import GAMES_JSON_PATH, SEMAG_BASE, USER_AGENT
+
+# Try to import aiohttp for the async client
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': '*/*',
+}
+# Hosts that answer HEAD with these statuses usually just don't implement it
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class AiohttpClient:
+    def __init__(self, concurrency, timeout, per_host):
+        self._connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=self._connector, headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        )
+
+    async def fetch(self, method, url, want_body):
+        async with self._session.request(method, url, allow_redirects=True) as resp:
+            body = await resp.read() if want_body else None
+            return resp.status, body
+
+    async def close(self):
+        await self._session.close()
+
+
+class ThreadedClient:
+    """requests in a thread pool, for when aiohttp isn't installed"""
+
+    def __init__(self, concurrency, timeout, per_host):
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        # No automatic retries: HealthChecker decides what to retry
+        self._session = http_client.build_session(pool_maxsize=per_host, retries=False)
+        self._session.headers.update(HEADERS)
+        self._timeout = timeout
+
+    def _fetch(self, method, url, want_body):
+        with self._session.request(method, url, timeout=self._timeout, allow_redirects=True, stream=True) as resp:
+            body = resp.content if want_body else None
+            return resp.status_code, body
+
+    async def fetch(self, method, url, want_body):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._fetch, method, url, want_body)
+
+    async def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+
+class HealthChecker:
+    def __init__(self, client, concurrency=64, per_host=8, retries=1):
+        self.client = client
+        self.retries = retries
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self._results = {}  # url -> Task, so shared CDN assets are requested once
+
+    def check(self, url, want_body=False):
+        key = (url, want_body)
+        if key not in self._results:
+            self._results[key] = asyncio.ensure_future(self._check(url, want_body))
+        return self._results[key]
+
+    async def _check(self, url, want_body):
+        host = urlparse(url).netloc
+        result = {'url': url, 'status': None, 'ok': False, 'method': None, 'ms': None, 'error': None, 'body': None}
+        # Per-host slot first: a request queued behind a slow host mustn't hold a global slot
+        async with self._hosts[host], self._global:
+            for attempt in range(self.retries + 1):
+                started = time.perf_counter()
+                try:
+                    method = 'GET' if want_body else 'HEAD'
+                    status, body = await self.client.fetch(method, url, want_body)
+                    if method == 'HEAD' and status in HEAD_FALLBACK_STATUSES:
+                        method = 'GET'
+                        status, body = await self.client.fetch(method, url, False)
+                    result.update(status=status, ok=200 <= status < 400, method=method, body=body, error=None)
+                except Exception as e:
+                    result['error'] = f"{type(e).__name__}: {e}"[:200]
+                result['ms'] = round((time.perf_counter() - started) * 1000, 1)
+                if result['ok'] or (result['status'] and result['status'] < 500):
+                    break
+        return result
+
+
+def entry_base(game, local_base, semag_base):
+    return semag_base if game.get('source') == 'semag' else local_base
+
+
+def first_level_assets(page_url, html_bytes):
+    """Absolute URLs of everything the page loads directly"""
+    text = html_bytes.decode('utf-8', errors='ignore')
+    base, refs = extract_refs(text, '.html')
+    doc_base = urljoin(page_url, base) if base else page_url
+    urls = []
+    for ref, hard in refs:
+        ref = ref.strip()
+        if not hard or not ref or ref.startswith(IGNORED_SCHEMES) or '${' in ref or '{{' in ref:
+            continue
+        url = urljoin(doc_base, ref).split('#')[0]
+        if url == doc_base:
+            continue  # The <base href> itself
+        if urlparse(url).scheme in ('http', 'https') and url not in urls:
+            urls.append(url)
+    return urls
+
+
+async def check_entry(checker, game, local_base, semag_base, with_assets):
+    base = entry_base(game, local_base, semag_base)
+    report = {'name': game.get('name'), 'source': game.get('source'), 'game': None, 'image': None, 'assets': []}
+
+    async def check_path(path, want_body=False):
+        if not path:
+            return None
+        return await checker.check(base + quote(path, safe="/%?=&:@"), want_body)
+
+    game_task = check_path(game.get('gameUrl'), want_body=with_assets)
+    image_task = check_path(game.get('imagePath'))
+    game_result, image_result = await asyncio.gather(game_task, image_task)
+    report['game'] = game_result
+    report['image'] = image_result
+    if with_assets and game_result and game_result['ok'] and game_result['body']:
+        asset_urls = first_level_assets(game_result['url'], game_result['body'])
+        report['assets'] = list(await asyncio.gather(*(checker.check(u) for u in asset_urls)))
+    return report
+
+
+def summarize_latency(results):
+    latencies = sorted(r['ms'] for r in results if r['ms'] is not None)
+    histogram = Counter()
+    for ms in latencies:
+        bucket = next((b for b in LATENCY_BUCKETS_MS if ms <= b), None)
+        histogram[f"<={bucket}ms" if bucket else f">{LATENCY_BUCKETS_MS[-1]}ms"] += 1
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else None
+    return {
+        'count': len(latencies),
+        'p50': pct(0.50), 'p90': pct(0.90), 'p99': pct(0.99),
+        'max': latencies[-1] if latencies else None,
+        'histogram': {label: histogram[label] for label in
+                      [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]},
+    }
+
+
+def strip_bodies(result):
+    return {k: v for k, v in result.items() if k != 'body'} if result else None
+
+
+async def run_checks(games, local_base, semag_base, with_assets=True, concurrency=64, per_host=8, timeout=20):
+    client_cls = AiohttpClient if AIOHTTP_AVAILABLE else ThreadedClient
+    client = client_cls(concurrency, timeout, per_host)
+    try:
+        checker = HealthChecker(client, concurrency, per_host)
+        reports = await asyncio.gather(*(
+            check_entry(checker, game, local_base, semag_base, with_assets) for game in games
+        ))
+        unique = [await task for task in checker._results.values()]
+    finally:
+        await client.close()
+    for report in reports:
+        report['game'] = strip_bodies(report['game'])
+        report['image'] = strip_bodies(report['image'])
+        report['assets'] = [strip_bodies(a) for a in report['assets']]
+    return reports, [strip_bodies(r) for r in unique]
+
+
+def print_report(reports, unique, latency, elapsed, verbose):
+    broken = []
+    for report in reports:
+        problems = []
+        for label in ('game', 'image'):
+            r = report[label]
+            if r is None:
+                problems.append(f"no {label} path")
+            elif not r['ok']:
+                problems.append(f"{label} {r['status'] or r['error']}: {r['url']}")
+        problems.extend(f"asset {a['status'] or a['error']}: {a['url']}" for a in report['assets'] if not a['ok'])
+        if problems:
+            broken.append((report['name'], problems))
+
+    for name, problems in broken:
+        print(f"  ✗ {name}")
+        for problem in problems[:None if verbose else 3]:
+            print(f"      {problem}")
+        if not verbose and len(problems) > 3:
+            print(f"      … {len(problems) - 3} more")
+
+    print(f"\nLatency ({latency['count']} requests): p50 {latency['p50']}ms, p90 {latency['p90']}ms, "
+          f"p99 {latency['p99']}ms, max {latency['max']}ms")
+    peak = max(latency['histogram'].values() or [1]) or 1
+    for label, count in latency['histogram'].items():
+        print(f"  {label:>9} {'█' * round(30 * count / peak):<30} {count}")
+    failed_urls = sum(1 for r in unique if not r['ok'])
+    print(f"\n{len(reports)} entries, {len(unique)} unique URLs in {elapsed:.1f}s; "
+          f"{len(reports) - len(broken)} healthy, {len(broken)} with problems, {failed_urls} failing URLs")
+    return broken
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that every games.json entry and its assets actually load')
+    parser.add_argument('--source', choices=['non-semag', 'semag'], help='Only check entries from this source')
+    parser.add_argument('--only', action='append', help='Only this game name (repeatable)')
+    parser.add_argument('--local-base', help='Base URL for non-semag entries (default: serve the repo locally)')
+    parser.add_argument('--semag-base', default=SEMAG_BASE, help=f'Base URL for /semag/ entries (default: {SEMAG_BASE})')
+    parser.add_argument('--no-assets', action='store_true', help="Don't check first-level assets")
+    parser.add_argument('--concurrency', type=int, default=64, help='Max requests in flight (default: 64)')
+    parser.add_argument('--per-host', type=int, default=8, help='Max requests in flight per host (default: 8)')
+    parser.add_argument('--timeout', type=float, default=20, help='Per-request timeout in seconds (default: 20)')
+    parser.add_argument('--report', help='Write the full report as JSON to this file')
+    parser.add_argument('-v', '--verbose', action='store_true', help='List every problem, not just the first few')
+    args = parser.parse_args()
+
+    with open(GAMES_JSON_PATH, 'r', encoding='utf-8') as f:
+        games = json.load(f)
+    if args.source:
+        games = [g for g in games if g.get('source') == args.source]
+    if args.only:
+        wanted = {name.lower() for name in args.only}
+        games = [g for g in games if g.get('name', '').lower() in wanted]
+
+    stop_server = None
+    local_base = args.local_base
+    if not local_base:
+        stop_server, local_base = serve_in_thread()
+        print(f"Serving repo at {local_base}")
+    semag_base = args.semag_base.rstrip('/')
+
+    if not AIOHTTP_AVAILABLE:
+        print("Warning: aiohttp not available, falling back to threaded requests. Install with: pip install aiohttp")
+    print(f"Checking {len(games)} entries ({'aiohttp' if AIOHTTP_AVAILABLE else 'threaded requests'}, "
+          f"{args.concurrency} concurrent, {args.per_host} per host)...")
+    started = time.time()
+    try:
+        reports, unique = asyncio.run(run_checks(
+            games, local_base.rstrip('/'), semag_base, not args.no_assets,
+            args.concurrency, args.per_host, args.timeout,
+        ))
+    finally:
+        if stop_server:
+            stop_server()
+    elapsed = time.time() - started
+
+    latency = summarize_latency(unique)
+    broken = print_report(reports, unique, latency, elapsed, args.verbose)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'checked_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'local_base': local_base,
+                'semag_base': semag_base,
+                'seconds': round(elapsed, 2),
+                'latency': latency,
+                'entries': reports,
+            }, f, indent=2)
+        print(f"📁 Report: {args.report}")
+    if broken:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Shared HTTP sessions for the scrapers and tools.
+
+Module-level requests.get() opens a new TCP+TLS connection for every call.
+These helpers keep one pooled session per site profile instead, so an
+asset-heavy game pulled from a single CDN reuses a handful of keep-alive
+connections. Each profile carries the headers/Referer that site expects, and
+resolved addresses are cached for the life of the process.
+
+Sessions are shared between threads: urllib3's pools are thread-safe and
+pool_block=True makes extra threads wait for a free connection rather than
+opening throwaway ones. HTTP/2 (one multiplexed connection per host) is used
+by fetch_bytes() when httpx with h2 is installed.
+
+Usage:
+    from http_client import get, session_for, fetch_bytes
+
+    response = get('https://www.crazygames.com/game/foo', timeout=30)
+    with session_for('lagged').get(url, stream=True) as r: ...
+    data = fetch_bytes('https://cdn.jsdelivr.net/gh/user/repo/game.wasm')
+"""
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from novahub_config import HEADERS
+
+# Try to import httpx for HTTP/2
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT = 30
+DNS_TTL = 300
+# Distinct hosts each session keeps pools for
+POOL_HOSTS = 32
+
+# Per-site connection limits and headers. Hosts match by suffix.
+SITE_PROFILES = {
+    'crazygames': {
+        'hosts': ('crazygames.com', 'crazygames.io'),
+        'headers': {'Referer': 'https://www.crazygames.com/', 'Origin': 'https://www.crazygames.com'},
+        'pool': 4,
+    },
+    'lagged': {
+        'hosts': ('lagged.com',),
+        'headers': {'Referer': 'https://lagged.com/'},
+        'pool': 4,
+    },
+    'gamemonetize': {
+        'hosts': ('gamemonetize.com', 'gamemonetize.co'),
+        'headers': {'Referer': 'https://gamemonetize.com/'},
+        'pool': 4,
+    },
+    'poki': {
+        'hosts': ('poki.com', 'poki-gdn.com'),
+        'headers': {'Referer': 'https://poki.com/'},
+        'pool': 4,
+    },
+    'y8': {
+        'hosts': ('y8.com',),
+        'headers': {'Referer': 'https://www.y8.com/'},
+        'pool': 4,
+    },
+    'codys-shack': {
+        'hosts': ('codys-shack-games.pages.dev',),
+        'headers': {'Referer': 'https://codys-shack-games.pages.dev/'},
+        'pool': 6,
+    },
+    'hypackel': {
+        'hosts': ('hypackel.github.io',),
+        'headers': {},
+        'pool': 6,
+    },
+    # Static CDNs: no Referer needed, more parallelism is fine
+    'cdn': {
+        'hosts': ('jsdelivr.net', 'githack.com', 'githubusercontent.com', 'github.io', 'cloudfront.net', 'r2.dev'),
+        'headers': {'Accept': '*/*'},
+        'pool': 8,
+    },
+}
+DEFAULT_PROFILE = {'hosts': (), 'headers': {}, 'pool': 4}
+
+_sessions = {}
+_http2_clients = {}
+_lock = threading.Lock()
+
+
+def profile_for(url_or_site):
+    """Profile name for a URL (matched by host suffix) or a profile name"""
+    if url_or_site in SITE_PROFILES:
+        return url_or_site
+    host = (urlparse(url_or_site).hostname or '').lower() if url_or_site else ''
+    for name, profile in SITE_PROFILES.items():
+        if any(host == h or host.endswith('.' + h) for h in profile['hosts']):
+            return name
+    return 'default'
+
+
+def _retry_policy():
+    return Retry(
+        total=3, connect=3, read=2, backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=True, raise_on_status=False,
+    )
+
+
+def build_session(site=None, pool_maxsize=None, retries=True):
+    """New pooled requests.Session with a site profile's headers and limits"""
+    enable_dns_cache()
+    profile = SITE_PROFILES.get(profile_for(site), DEFAULT_PROFILE)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers.update(profile['headers'])
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize or profile['pool'],
+                          pool_block=True, max_retries=_retry_policy() if retries else 0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def session_for(url_or_site=None):
+    """Shared session for a site, created once per process"""
+    name = profile_for(url_or_site)
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = _sessions[name] = build_session(name)
+    return session
+
+
+def request(method, url, **kwargs):
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    return session_for(url).request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    """Drop-in for requests.get() that reuses connections"""
+    return request('GET', url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault('allow_redirects', True)
+    return request('HEAD', url, **kwargs)
+
+
+def http2_client(url_or_site=None):
+    """Shared httpx.Client with HTTP/2 for a site, or None if httpx/h2 aren't installed"""
+    if not HTTP2_AVAILABLE:
+        return None
+    name = profile_for(url_or_site)
+    with _lock:
+        client = _http2_clients.get(name)
+        if client is None:
+            enable_dns_cache()
+            profile = SITE_PROFILES.get(name, DEFAULT_PROFILE)
+            client = httpx.Client(
+                http2=True, follow_redirects=True, timeout=DEFAULT_TIMEOUT,
+                headers={**HEADERS, **profile['headers']},
+                limits=httpx.Limits(max_connections=profile['pool'], max_keepalive_connections=profile['pool']),
+            )
+            _http2_clients[name] = client
+    return client
+
+
+def fetch_bytes(url, **kwargs):
+    """GET a whole response body over HTTP/2 when available, pooled HTTP/1.1 otherwise"""
+    client = http2_client(url)
+    if client is not None:
+        response = client.get(url, **kwargs)
+    else:
+        response = get(url, **kwargs)
+    response.raise_for_status()
+    return response.content
+
+
+def connection_stats():
+    """{profile: {'hosts': n, 'connections': n, 'requests': n}} for the open sessions"""
+    stats = {}
+    for name, session in list(_sessions.items()):
+        hosts = connections = requests_made = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                hosts += 1
+                connections += pool.num_connections
+                requests_made += pool.num_requests
+        stats[name] = {'hosts': hosts, 'connections': connections, 'requests': requests_made}
+    return stats
+
+
+def close_all():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        for client in _http2_clients.values():
+            client.close()
+        _sessions.clear()
+        _http2_clients.clear()
+
+
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_original_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        _dns_cache[key] = (now + DNS_TTL, result)
+    return result
+
+
+def enable_dns_cache(ttl=None):
+    """Cache getaddrinfo() results process-wide, so each new connection skips the DNS round-trip"""
+    global DNS_TTL
+    if ttl is not None:
+        DNS_TTL = ttl
+    socket.getaddrinfo = _cached_getaddrinfo
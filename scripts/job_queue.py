@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Durable SQLite-backed job queue for long batch scrape runs.
+
+Every per-game or per-asset task is a row keyed by (queue, key), so enqueueing
+the same work twice is a no-op and a crashed run picks up exactly where it
+stopped. Workers claim jobs with a lease; a job whose worker dies is handed
+out again once its lease expires. Failed jobs are retried with backoff until
+max_attempts, then marked dead. Any number of threads or processes can work
+the same queue file concurrently; a scraper that does should only update
+games.json from the process that finds the queue drained (remaining() == 0).
+
+Usage from a scraper:
+    queue = JobQueue()
+    for url in game_urls:
+        queue.enqueue('codys-shack', url, {'url': url})
+    run_workers(queue, 'codys-shack', handle_game, workers=4)
+
+CLI:
+    python scripts/job_queue.py status
+    python scripts/job_queue.py list codys-shack --state dead
+    python scripts/job_queue.py retry codys-shack
+    python scripts/job_queue.py clear codys-shack
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from novahub_config import CACHE_DIR
+
+DB_PATH = CACHE_DIR / "jobs.sqlite3"
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'   # will be retried after retry_at
+DEAD = 'dead'       # out of attempts
+STATES = (PENDING, RUNNING, DONE, FAILED, DEAD)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue        TEXT NOT NULL,
+    key          TEXT NOT NULL,
+    parent_id    INTEGER,
+    payload      TEXT NOT NULL DEFAULT '{}',
+    state        TEXT NOT NULL DEFAULT 'pending',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_until  REAL,
+    retry_at     REAL NOT NULL DEFAULT 0,
+    worker       TEXT,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (queue, state, retry_at);
+CREATE INDEX IF NOT EXISTS jobs_parent ON jobs (parent_id);
+"""
+
+
+class Job:
+    """A claimed job. payload/result are decoded JSON."""
+
+    __slots__ = ('id', 'queue', 'key', 'parent_id', 'payload', 'attempts', 'max_attempts')
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.queue = row['queue']
+        self.key = row['key']
+        self.parent_id = row['parent_id']
+        self.payload = json.loads(row['payload'])
+        self.attempts = row['attempts']
+        self.max_attempts = row['max_attempts']
+
+    def __repr__(self):
+        return f"Job({self.queue}:{self.key} attempt {self.attempts}/{self.max_attempts})"
+
+
+class JobQueue:
+    """SQLite job queue. One connection per thread; safe across processes."""
+
+    def __init__(self, path=DB_PATH, lease_seconds=300, retry_backoff=30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _conn(self):
+        return _Transaction(self._connect())
+
+    def enqueue(self, queue, key, payload=None, max_attempts=3, parent_id=None):
+        """Add a job unless (queue, key) already exists. Returns True if added."""
+        now = time.time()
+        with self._conn() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (queue, key, parent_id, payload, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (queue, key, parent_id, json.dumps(payload or {}), max_attempts, now, now),
+            )
+            return cursor.rowcount == 1
+
+    def enqueue_many(self, queue, items, max_attempts=3, parent_id=None):
+        """Bulk enqueue [(key, payload), ...] in one transaction. Returns count added."""
+        now = time.time()
+        rows = [(queue, key, parent_id, json.dumps(payload or {}), max_attempts, now, now) for key, payload in items]
+        with self._conn() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (queue, key, parent_id, payload, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def claim(self, queue, worker=None):
+        """Lease the next runnable job: pending, retryable, or with an expired lease"""
+        now = time.time()
+        worker = worker or f"{self.worker_id}:{threading.get_ident()}"
+        with self._conn() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE queue = ? AND ("
+                    "  state = 'pending'"
+                    "  OR (state = 'failed' AND retry_at <= ?)"
+                    "  OR (state = 'running' AND lease_until < ?)"
+                    ") ORDER BY id LIMIT 1",
+                    (queue, now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row['state'] == RUNNING and row['attempts'] >= row['max_attempts']:
+                    # Worker died on its last attempt
+                    conn.execute(
+                        "UPDATE jobs SET state = 'dead', error = 'lease expired', updated_at = ? WHERE id = ?",
+                        (now, row['id']),
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, lease_until = ?, worker = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (now + self.lease_seconds, worker, now, row['id']),
+                )
+                return Job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone())
+
+    def extend(self, job, seconds=None):
+        """Push a running job's lease out (call from long-running handlers)"""
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND state = 'running'",
+                (now + (seconds or self.lease_seconds), now, job.id),
+            )
+
+    def complete(self, job, result=None):
+        """Mark done. Ignored if the lease expired and another worker re-claimed the job."""
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE id = ? AND attempts = ?",
+                (json.dumps(result), time.time(), job.id, job.attempts),
+            )
+
+    def fail(self, job, error):
+        """Record a failure; retried with linear backoff until max_attempts"""
+        now = time.time()
+        state = DEAD if job.attempts >= job.max_attempts else FAILED
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_until = NULL, retry_at = ?, updated_at = ? "
+                "WHERE id = ? AND attempts = ?",
+                (state, str(error)[:500], now + self.retry_backoff * job.attempts, now, job.id, job.attempts),
+            )
+        return state
+
+    def results(self, queue, state=DONE):
+        """Decoded results of jobs in a state, in enqueue order"""
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT key, result FROM jobs WHERE queue = ? AND state = ? ORDER BY id", (queue, state)
+            ).fetchall()
+        return [(row['key'], json.loads(row['result']) if row['result'] else None) for row in rows]
+
+    def stats(self, queue=None):
+        """{queue: {state: count}}"""
+        sql = "SELECT queue, state, COUNT(*) AS n FROM jobs"
+        params = ()
+        if queue:
+            sql += " WHERE queue = ?"
+            params = (queue,)
+        sql += " GROUP BY queue, state"
+        stats = {}
+        with self._conn() as conn:
+            for row in conn.execute(sql, params):
+                stats.setdefault(row['queue'], dict.fromkeys(STATES, 0))[row['state']] = row['n']
+        return stats
+
+    def remaining(self, queue):
+        counts = self.stats(queue).get(queue, {})
+        return counts.get(PENDING, 0) + counts.get(RUNNING, 0) + counts.get(FAILED, 0)
+
+    def list(self, queue, state=None, limit=50):
+        sql = "SELECT * FROM jobs WHERE queue = ?"
+        params = [queue]
+        if state:
+            sql += " AND state = ?"
+            params.append(state)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        with self._conn() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def retry(self, queue, states=(DEAD, FAILED)):
+        """Reset dead/failed jobs to pending with a fresh attempt budget"""
+        marks = ','.join('?' * len(states))
+        with self._conn() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET state = 'pending', attempts = 0, retry_at = 0, error = NULL, updated_at = ? "
+                f"WHERE queue = ? AND state IN ({marks})",
+                (time.time(), queue, *states),
+            )
+            return cursor.rowcount
+
+    def clear(self, queue):
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM jobs WHERE queue = ?", (queue,)).rowcount
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around a block so claims are atomic across processes"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def run_workers(queue, queue_name, handler, workers=4, idle_exit=True, on_result=None):
+    """Work a queue with a thread pool until it is drained.
+
+    Failed jobs waiting out their retry backoff keep the workers polling, so
+    they are retried in this run. With idle_exit, jobs leased by other
+    processes don't; without it, workers also wait for those to finish.
+    handler(job) returns a JSON-serializable result or raises to fail the job.
+    Returns (done, failed) counts for this run.
+    """
+    counts = {'done': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def worker_loop():
+        while True:
+            job = queue.claim(queue_name)
+            if job is None:
+                counts_now = queue.stats(queue_name).get(queue_name, {})
+                if not counts_now.get(FAILED) and (idle_exit or queue.remaining(queue_name) == 0):
+                    return
+                time.sleep(1)
+                continue
+            try:
+                result = handler(job)
+            except Exception as e:
+                state = queue.fail(job, e)
+                with lock:
+                    counts['failed'] += 1
+                print(f"  [FAIL] {job.key}: {str(e)[:80]} ({state}, attempt {job.attempts}/{job.max_attempts})", flush=True)
+                continue
+            queue.complete(job, result)
+            with lock:
+                counts['done'] += 1
+            if on_result:
+                on_result(job, result)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(worker_loop) for _ in range(workers)]:
+            future.result()
+    return counts['done'], counts['failed']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect and manage the scrape job queue')
+    parser.add_argument('--db', default=str(DB_PATH), help='Queue database (default: .cache/jobs.sqlite3)')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_status = sub.add_parser('status', help='Job counts per queue and state')
+    p_status.add_argument('queue', nargs='?')
+    p_list = sub.add_parser('list', help='List jobs in a queue')
+    p_list.add_argument('queue')
+    p_list.add_argument('--state', choices=STATES)
+    p_list.add_argument('--limit', type=int, default=50)
+    p_retry = sub.add_parser('retry', help='Requeue dead and failed jobs')
+    p_retry.add_argument('queue')
+    p_clear = sub.add_parser('clear', help='Delete every job in a queue')
+    p_clear.add_argument('queue')
+    args = parser.parse_args()
+
+    queue = JobQueue(args.db)
+    if args.command == 'status':
+        stats = queue.stats(args.queue)
+        if not stats:
+            print("No jobs.")
+        for name, counts in sorted(stats.items()):
+            total = sum(counts.values())
+            summary = ', '.join(f"{state} {n}" for state, n in counts.items() if n)
+            print(f"  {name:<24} {total:>6} jobs: {summary}")
+    elif args.command == 'list':
+        for row in queue.list(args.queue, args.state, args.limit):
+            error = f"  ({row['error'][:60]})" if row['error'] else ''
+            print(f"  {row['id']:>6} {row['state']:<8} {row['attempts']}/{row['max_attempts']} {row['key']}{error}")
+    elif args.command == 'retry':
+        print(f"✓ Requeued {queue.retry(args.queue)} jobs")
+    elif args.command == 'clear':
+        print(f"✓ Deleted {queue.clear(args.queue)} jobs")
+
+
+if __name__ == "__main__":
+    main()
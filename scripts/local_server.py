@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Local static server that behaves like the production deployment.
+
+Serves the repo the way Cloudflare Pages does (_headers, _redirects,
+index.html and extensionless .html lookup) and /semag/* from a local mirror
+of the R2 bucket with the same headers as functions/semag/[[path]].js. On top
+of that it handles what game engines care about:
+  - Unity-style precompressed files (game.wasm.br, game.data.gz) are sent
+    with Content-Encoding and the Content-Type of the inner file
+  - precompressed sidecars (app.js.br / app.js.gz next to app.js) are picked
+    by Accept-Encoding
+  - ETag / If-None-Match and single byte ranges (Range, If-Range)
+
+Built on asyncio streams with keep-alive, so it's fast enough to be the
+target for health checks, benchmarks and headless load tests.
+
+Usage:
+    python scripts/local_server.py
+    python scripts/local_server.py --port 8080 --semag-dir ../semag-mirror
+    python scripts/local_server.py --host 0.0.0.0 -q
+"""
+import argparse
+import asyncio
+import fnmatch
+import mimetypes
+import os
+import threading
+import time
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from novahub_config import ROOT_DIR, SEMAG_DIR
+
+# R2 responses from functions/semag/[[path]].js
+SEMAG_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+ENCODINGS = {'.br': 'br', '.gz': 'gzip'}
+# Preferred order when a client accepts several
+SIDECAR_ORDER = ('br', 'gzip')
+
+EXTRA_TYPES = {
+    '.wasm': 'application/wasm',
+    '.data': 'application/octet-stream',
+    '.unityweb': 'application/octet-stream',
+    '.mem': 'application/octet-stream',
+    '.swf': 'application/x-shockwave-flash',
+    '.js': 'text/javascript',
+    '.mjs': 'text/javascript',
+    '.json': 'application/json',
+    '.webmanifest': 'application/manifest+json',
+    '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg',
+    '.woff2': 'font/woff2',
+    '.webp': 'image/webp',
+}
+TEXT_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml', 'image/svg+xml')
+
+STATUS_TEXT = {
+    200: 'OK', 206: 'Partial Content', 301: 'Moved Permanently', 302: 'Found', 304: 'Not Modified',
+    307: 'Temporary Redirect', 308: 'Permanent Redirect', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 416: 'Range Not Satisfiable', 500: 'Internal Server Error',
+}
+
+
+def content_type(name):
+    """MIME type for a file name, ignoring a trailing .br/.gz"""
+    stem, ext = os.path.splitext(name.lower())
+    if ext in ENCODINGS:
+        ext = os.path.splitext(stem)[1]
+    mime = EXTRA_TYPES.get(ext) or mimetypes.types_map.get(ext) or 'application/octet-stream'
+    if mime.startswith(TEXT_TYPES) and 'charset' not in mime:
+        mime += '; charset=utf-8'
+    return mime
+
+
+def parse_headers_file(path):
+    """Parse a Cloudflare Pages _headers file into [(pattern, [(name, value), ...])]"""
+    rules = []
+    if not path.exists():
+        return rules
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if not line[0].isspace():
+            rules.append((line.strip(), []))
+        elif rules and ':' in line:
+            name, _, value = line.strip().partition(':')
+            rules[-1][1].append((name.strip(), value.strip()))
+    return rules
+
+
+def parse_redirects_file(path):
+    """Parse a Cloudflare Pages _redirects file into {source: (target, status)}"""
+    redirects = {}
+    if not path.exists():
+        return redirects
+    for line in path.read_text(encoding='utf-8').splitlines():
+        parts = line.split()
+        if len(parts) < 2 or parts[0].startswith('#'):
+            continue
+        redirects[parts[0]] = (parts[1], int(parts[2]) if len(parts) > 2 else 302)
+    return redirects
+
+
+def parse_range(header, size):
+    """Parse a single 'bytes=' range -> (start, end) inclusive, None if absent/multi, False if unsatisfiable"""
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, _, end = header[6:].strip().partition('-')
+    try:
+        if not start:
+            length = int(end)
+            if length <= 0:
+                return False
+            return max(0, size - length), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def make_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+class StaticSite:
+    """Resolves request paths to files and headers, like Pages + the semag function"""
+
+    def __init__(self, root=ROOT_DIR, semag_dir=SEMAG_DIR):
+        self.root = Path(root).resolve()
+        self.semag_dir = Path(semag_dir).resolve()
+        self.header_rules = parse_headers_file(self.root / '_headers')
+        self.redirects = parse_redirects_file(self.root / '_redirects')
+
+    def _safe_join(self, base, rel):
+        path = (base / rel).resolve()
+        if path != base and base not in path.parents:
+            return None
+        return path
+
+    def resolve(self, url_path):
+        """-> (file_path or None, is_semag, redirect or None)"""
+        if url_path in self.redirects:
+            return None, False, self.redirects[url_path]
+        if url_path.startswith('/semag/'):
+            # R2 has no directory indexes: the key must match exactly
+            path = self._safe_join(self.semag_dir, url_path[len('/semag/'):])
+            return (path if path and path.is_file() else None), True, None
+        path = self._safe_join(self.root, url_path.lstrip('/'))
+        if path is None:
+            return None, False, None
+        if path.is_dir():
+            if not url_path.endswith('/'):
+                return None, False, (url_path + '/', 308)
+            path = path / 'index.html'
+        elif not path.exists() and not path.suffix:
+            path = path.with_name(path.name + '.html')
+        return (path if path.is_file() else None), False, None
+
+    def site_headers(self, url_path):
+        headers = []
+        for pattern, rule_headers in self.header_rules:
+            if fnmatch.fnmatchcase(url_path, pattern):
+                headers.extend(rule_headers)
+        return headers
+
+    def representation(self, path, accept_encoding):
+        """Pick the file to send -> (path, content_encoding or None, negotiated)"""
+        encoding = ENCODINGS.get(path.suffix.lower())
+        if encoding:
+            # Unity build files are stored compressed and served as-is
+            return path, encoding, False
+        accepted = {token.split(';')[0].strip() for token in accept_encoding.split(',') if token.strip()}
+        for encoding in SIDECAR_ORDER:
+            if encoding in accepted:
+                sidecar = path.with_name(path.name + ('.br' if encoding == 'br' else '.gz'))
+                if sidecar.is_file():
+                    return sidecar, encoding, True
+        return path, None, bool(self._has_sidecar(path))
+
+    @staticmethod
+    def _has_sidecar(path):
+        return path.with_name(path.name + '.br').is_file() or path.with_name(path.name + '.gz').is_file()
+
+
+class RequestHandler:
+    def __init__(self, site, quiet=False):
+        self.site = site
+        self.quiet = quiet
+        self.connections = set()
+
+    async def __call__(self, reader, writer):
+        self.connections.add(writer)
+        try:
+            while await self._handle_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    async def close_connections(self):
+        """Close idle keep-alive connections so their handlers finish cleanly"""
+        for writer in list(self.connections):
+            writer.transport.abort()
+        deadline = time.monotonic() + 2
+        while self.connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def _handle_one(self, reader, writer):
+        request_line = await reader.readline()
+        if not request_line:
+            return False
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            await self._send_simple(writer, 400, 'Bad request', keep_alive=False)
+            return False
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+        started = time.perf_counter()
+        status, sent = await self._respond(writer, method, target, headers, keep_alive)
+        if not self.quiet:
+            print(f"  {status} {method} {target} {sent:,}B {(time.perf_counter() - started) * 1000:.1f}ms", flush=True)
+        return keep_alive
+
+    async def _send_simple(self, writer, status, text, headers=(), keep_alive=True, head=False):
+        body = text.encode('utf-8')
+        self._write_head(writer, status, [('Content-Type', 'text/plain; charset=utf-8'),
+                                          ('Content-Length', str(len(body))), *headers], keep_alive)
+        if not head:
+            writer.write(body)
+        await writer.drain()
+        return status, 0 if head else len(body)
+
+    def _write_head(self, writer, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Date: {formatdate(usegmt=True)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace'))
+
+    async def _respond(self, writer, method, target, req_headers, keep_alive):
+        head = method == 'HEAD'
+        if method not in ('GET', 'HEAD'):
+            return await self._send_simple(writer, 405, 'Method not allowed', [('Allow', 'GET, HEAD')], keep_alive)
+        url_path = unquote(urlsplit(target).path)
+        path, is_semag, redirect = self.site.resolve(url_path)
+
+        if redirect:
+            location, status = redirect
+            return await self._send_simple(writer, status, '', [('Location', location)], keep_alive, head)
+        if path is None:
+            if is_semag:
+                return await self._send_simple(writer, 404, 'Not found', keep_alive=keep_alive, head=head)
+            not_found = self.site.root / '404.html'
+            if not_found.is_file():
+                body = not_found.read_bytes()
+                self._write_head(writer, 404, [('Content-Type', 'text/html; charset=utf-8'),
+                                               ('Content-Length', str(len(body)))], keep_alive)
+                if not head:
+                    writer.write(body)
+                await writer.drain()
+                return 404, 0 if head else len(body)
+            return await self._send_simple(writer, 404, 'Not found', keep_alive=keep_alive, head=head)
+
+        file_path, encoding, negotiated = self.site.representation(path, req_headers.get('accept-encoding', ''))
+        stat = file_path.stat()
+        etag = make_etag(stat)
+        headers = [('Content-Type', content_type(path.name)), ('ETag', etag), ('Accept-Ranges', 'bytes')]
+        if encoding:
+            headers.append(('Content-Encoding', encoding))
+        if negotiated:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if is_semag:
+            headers.append(('Cache-Control', SEMAG_CACHE_CONTROL))
+        else:
+            headers.append(('Last-Modified', formatdate(stat.st_mtime, usegmt=True)))
+            site_headers = self.site.site_headers(url_path)
+            overridden = {name.lower() for name, _ in site_headers}
+            headers = [h for h in headers if h[0].lower() not in overridden] + site_headers
+
+        if_none_match = req_headers.get('if-none-match')
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(',')] + ['*']:
+            self._write_head(writer, 304, [h for h in headers if h[0] != 'Content-Type'], keep_alive)
+            await writer.drain()
+            return 304, 0
+
+        size = stat.st_size
+        byte_range = parse_range(req_headers.get('range'), size)
+        if_range = req_headers.get('if-range')
+        if if_range and if_range != etag:
+            byte_range = None  # Representation changed since the client's partial copy
+        if byte_range is False:
+            return await self._send_simple(writer, 416, '', [('Content-Range', f'bytes */{size}')], keep_alive, head)
+        status, start, end = (206, *byte_range) if byte_range else (200, 0, size - 1)
+        length = end - start + 1 if size else 0
+        if status == 206:
+            headers.append(('Content-Range', f'bytes {start}-{end}/{size}'))
+        headers.append(('Content-Length', str(length)))
+        self._write_head(writer, status, headers, keep_alive)
+        if not head and length:
+            await self._send_file(writer, file_path, start, length)
+        await writer.drain()
+        return status, 0 if head else length
+
+    async def _send_file(self, writer, file_path, offset, count):
+        loop = asyncio.get_running_loop()
+        with open(file_path, 'rb') as f:
+            await writer.drain()
+            # Zero-copy where the platform allows it, chunked reads otherwise
+            await loop.sendfile(writer.transport, f, offset, count, fallback=True)
+
+
+async def start_server(host='127.0.0.1', port=8000, root=ROOT_DIR, semag_dir=SEMAG_DIR, quiet=False, handler=None):
+    handler = handler or RequestHandler(StaticSite(root, semag_dir), quiet)
+    return await asyncio.start_server(handler, host, port, limit=64 * 1024)
+
+
+def serve_in_thread(root=ROOT_DIR, semag_dir=SEMAG_DIR, host='127.0.0.1', port=0):
+    """Run the server on its own event loop in a daemon thread. Returns (stop, base_url)."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    holder = {}
+    handler = RequestHandler(StaticSite(root, semag_dir), quiet=True)
+
+    def run():
+        asyncio.set_event_loop(loop)
+        holder['server'] = loop.run_until_complete(start_server(host, port, handler=handler))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    bound_port = holder['server'].sockets[0].getsockname()[1]
+
+    async def shutdown():
+        holder['server'].close()
+        await handler.close_connections()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+
+    return stop, f"http://{host}:{bound_port}"
+
+
+async def serve_forever(args):
+    server = await start_server(args.host, args.port, args.root, args.semag_dir, args.quiet)
+    print(f"Serving {Path(args.root).resolve()} at http://{args.host}:{args.port}/")
+    semag_note = '' if Path(args.semag_dir).is_dir() else ' (missing: /semag/ will 404)'
+    print(f"  /semag/ → {Path(args.semag_dir).resolve()}{semag_note}")
+    print("  Press Ctrl+C to stop")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the site locally with production-like headers')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port (default: 8000)')
+    parser.add_argument('--root', default=str(ROOT_DIR), help='Site root (default: repo root)')
+    parser.add_argument('--semag-dir', default=str(SEMAG_DIR), help='Local mirror of the R2 semag/ prefix')
+    parser.add_argument('-q', '--quiet', action='store_true', help="Don't log requests")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(args))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+novahub: one entry point for the catalog tools and scripts.
+
+Subcommands import their module only when they run, so catalog queries start
+in milliseconds instead of paying for requests/bs4/selenium imports that
+only the scrapers need. Tool subcommands take the same arguments as running
+the module directly; `run` executes any of the standalone scripts.
+
+Usage:
+    python scripts/novahub.py games count
+    python scripts/novahub.py games search ovo --source non-semag
+    python scripts/novahub.py games show "Ice Dodo"
+    python scripts/novahub.py deps --missing
+    python scripts/novahub.py serve --port 8080
+    python scripts/novahub.py run scrape-poki-game https://poki.com/en/g/some-game
+    python scripts/novahub.py run --list
+"""
+import argparse
+import importlib
+import json
+import runpy
+import sys
+
+from novahub_config import GAMES_JSON_PATH, SCRIPTS_DIR, load_games
+
+# name -> (module, description); imported on demand
+TOOLS = {
+    'crawl': ('crawl_frontier', 'Multi-site crawl frontier for new game URLs'),
+    'sync': ('catalog_sync', 'Incremental upstream catalog sync'),
+    'jobs': ('job_queue', 'Inspect and retry the persistent job queue'),
+    'each': ('for_each_game', 'Apply a transform to every game in parallel'),
+    'sdk': ('sdk_stripper', 'Scan for or neutralize ad/portal SDKs'),
+    'deps': ('game_deps', 'Dependency graph, missing files and orphans'),
+    'health': ('health_check', 'Live health check of games.json entries'),
+    'serve': ('local_server', 'Local server with production headers'),
+    'profile': ('profile_load_times', 'Headless time-to-first-frame profiler'),
+    'verify': ('verified_download', 'Verify or build per-game download manifests'),
+    'r2': ('r2_sync', 'Upload only changed semag/ files to R2'),
+    'bundle': ('asset_bundler', 'Pack small game assets into one request'),
+    'precache': ('precache_manifest', 'Service Worker precache lists per game'),
+    'split': ('chunk_splitter', 'Split files over the Pages 25 MiB limit'),
+    'search': ('search_index', 'Build the prebuilt search index'),
+    'shards': ('catalog_shards', 'Sharded, content-hashed catalog files'),
+    'tag': ('category_tagger', 'Infer categories/tags and the category index'),
+    'similar': ('similar_games', 'Precompute similar games for loader.html'),
+    'cloaks': ('cloak_icons', 'Extract inlined cloak favicons to hashed files'),
+    'site': ('site_pages', 'Sitemaps, game landing pages and feeds'),
+    'lint': ('catalog_lint', 'Validate and normalize games.json'),
+    'diff': ('catalog_diff', 'Structural games.json diff across git history'),
+    'merge': ('catalog_merge', 'Three-way games.json merge driver'),
+}
+
+
+def run_tool(name, argv):
+    module_name, _ = TOOLS[name]
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    module = importlib.import_module(module_name)
+    sys.argv = [f'novahub {name}', *argv]
+    return module.main()
+
+
+def list_scripts():
+    """Standalone scripts with the first line of their docstring"""
+    scripts = []
+    for path in sorted(SCRIPTS_DIR.glob('*.py')):
+        if path.stem in ('novahub', 'novahub_config') or path.stem in {m for m, _ in TOOLS.values()}:
+            continue
+        summary = ''
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            head = f.read(2048)
+        code_start = min((i for i in (head.find('\nimport '), head.find('\nfrom '), head.find('\ndef ')) if i != -1),
+                         default=len(head))
+        for quote in ('"""', "'''"):
+            start = head.find(quote)
+            if start != -1 and start < code_start:
+                summary = next((line.strip() for line in head[start + 3:].splitlines() if line.strip()), '')
+                summary = summary.split(quote)[0]
+                break
+        scripts.append((path.stem, summary))
+    return scripts
+
+
+def run_script(name, argv):
+    path = SCRIPTS_DIR / (name if name.endswith('.py') else name + '.py')
+    if not path.is_file():
+        print(f"✗ No script named {name} in {SCRIPTS_DIR}", file=sys.stderr)
+        return 2
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    sys.argv = [str(path), *argv]
+    runpy.run_path(str(path), run_name='__main__')
+    return 0
+
+
+def match_games(games, query=None, source=None):
+    query = (query or '').lower()
+    return [
+        g for g in games
+        if (not source or g.get('source') == source)
+        and (not query or query in g.get('name', '').lower() or query in g.get('directory', '').lower())
+    ]
+
+
+def cmd_games(args):
+    games = load_games(args.games_json)
+    if args.action == 'count':
+        by_source = {}
+        for game in games:
+            by_source[game.get('source')] = by_source.get(game.get('source'), 0) + 1
+        print(f"{len(games)} games ({', '.join(f'{s}: {n}' for s, n in sorted(by_source.items()))})")
+    elif args.action in ('list', 'search'):
+        matched = match_games(games, args.query, args.source)
+        if args.json:
+            print(json.dumps(matched, indent='\t', ensure_ascii=False))
+            return
+        for game in matched:
+            print(f"  {game.get('name'):<45} {game.get('source'):<10} {game.get('gameUrl', '')}")
+        print(f"\n{len(matched)} games")
+    elif args.action == 'show':
+        wanted = (args.query or '').lower()
+        exact = [g for g in games if g.get('name', '').lower() == wanted or g.get('directory', '').lower() == wanted]
+        matched = exact or match_games(games, args.query, args.source)
+        if not matched:
+            print(f"✗ No game matching '{args.query}'")
+            return 1
+        print(json.dumps(matched if len(matched) > 1 else matched[0], indent='\t', ensure_ascii=False))
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in TOOLS:
+        return run_tool(argv[0], argv[1:])
+    if argv and argv[0] == 'run' and len(argv) > 1 and not argv[1].startswith('-'):
+        return run_script(argv[1], argv[2:])
+
+    parser = argparse.ArgumentParser(
+        prog='novahub',
+        description='Nova Hub catalog tools',
+        epilog='Tool arguments are passed through unchanged; use "novahub <tool> -h" for their help.',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    games_parser = subparsers.add_parser('games', help='Query data/games.json')
+    games_parser.add_argument('action', choices=['count', 'list', 'search', 'show'])
+    games_parser.add_argument('query', nargs='?', help='Name or directory substring')
+    games_parser.add_argument('--source', choices=['non-semag', 'semag'])
+    games_parser.add_argument('--json', action='store_true', help='Print matching entries as JSON')
+    games_parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help=argparse.SUPPRESS)
+
+    run_parser = subparsers.add_parser('run', help='Run a standalone script from scripts/')
+    run_parser.add_argument('--list', action='store_true', help='List available scripts')
+
+    for name, (_, desc) in TOOLS.items():
+        subparsers.add_parser(name, help=desc, add_help=False)
+
+    args = parser.parse_args(argv)
+    if args.command == 'games':
+        return cmd_games(args)
+    if args.command == 'run':
+        for name, summary in list_scripts():
+            print(f"  {name:<40} {summary}")
+        return
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
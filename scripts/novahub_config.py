@@ -0,0 +1,49 @@
+"""
+Shared paths, headers and catalog helpers for the scripts.
+
+Standard library only: everything that imports this (including the novahub
+CLI) must stay fast to start, so heavy dependencies belong in the modules
+that actually use them.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+DATA_DIR = ROOT_DIR / "data"
+GAMES_DIR = ROOT_DIR / "non-semag"
+GAMES_JSON_PATH = DATA_DIR / "games.json"
+CACHE_DIR = Path(os.environ.get('NOVA_CACHE_DIR', ROOT_DIR / ".cache"))
+# Local mirror of the R2 bucket's semag/ prefix (what upload-game-to-r2.js uploads)
+SEMAG_DIR = Path(os.environ.get('NOVA_SEMAG_DIR', ROOT_DIR / "semag"))
+SEMAG_BASE = os.environ.get('NOVA_SEMAG_BASE', 'https://nova-labs.pages.dev')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+def load_games(path=GAMES_JSON_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_games(games, path=GAMES_JSON_PATH):
+    """Write games.json in the repo's format (tab indent, UTF-8 kept as-is, trailing newline)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(games, f, indent='\t', ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def catalog_hash(games):
+    """Short content hash of a catalog; generated files record it so the frontend can tell they match"""
+    text = json.dumps(games, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
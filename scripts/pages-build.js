@@ -1,8 +1,13 @@
 #!/usr/bin/env node
 /**
  * Cloudflare Pages build: copy site into dist/ but exclude assets over 25 MiB.
- * Pages allows max 25 MiB per file. Exclude Escape Road folders that contain
- * oversized .wasm.unityweb files so the deploy succeeds.
+ * Pages allows max 25 MiB per file. Games split with scripts/chunk_splitter.py
+ * ship their .chunkNNN parts instead of the oversized originals (listed in
+ * nova-chunks.json); any other oversized file is skipped with a warning.
+ *
+ * Files generated from data/games.json (the catalog shards) are rebuilt
+ * first, so a games.json change ships with matching shards and search index
+ * even if nobody re-ran the scripts by hand.
  *
  * In Cloudflare Pages: set Build command to "node scripts/pages-build.js"
  * and Build output directory to "dist".
@@ -10,32 +15,55 @@
 
 const fs = require('fs');
 const path = require('path');
+const { spawnSync } = require('child_process');
 
 const ROOT = path.resolve(__dirname, '..');
 const OUT = path.join(ROOT, 'dist');
 const MAX_BYTES = 25 * 1024 * 1024; // 25 MiB
 
-// Folders under non-semag/ that contain files >25MB (omit from deploy)
+// Folders under non-semag/ that contain files >25MB (omit from deploy until split)
 const EXCLUDE_DIRS = new Set([
   path.join(ROOT, 'non-semag', 'EscapeRoad'),
   path.join(ROOT, 'non-semag', 'EscapeRoad2'),
   path.join(ROOT, 'non-semag', 'EscapeRoadCity'),
 ]);
 
-const IGNORE = new Set(['node_modules', '.git', 'dist', 'scripts']);
+// nova-manifest.json: per-game download manifests (scripts/verified_download.py), not site content
+// nova-chunks.json: split-file records (scripts/chunk_splitter.py); the shim embeds what it needs
+const IGNORE = new Set(['node_modules', '.git', 'dist', 'scripts', 'nova-manifest.json', 'nova-chunks.json']);
+const CHUNKS_NAME = 'nova-chunks.json';
+const PYTHON = process.env.PYTHON || 'python3';
+// Regenerated from data/games.json before copying; each only rewrites what changed
+const GENERATORS = ['scripts/catalog_shards.py', 'scripts/search_index.py'];
+
+// Originals replaced by .chunkNNN parts
+const chunkedFiles = new Set();
+const skippedLarge = [];
 
 function shouldExclude(abs) {
   const normalized = path.normalize(abs);
+  if (chunkedFiles.has(normalized)) return true;
   for (const d of EXCLUDE_DIRS) {
+    if (fs.existsSync(path.join(d, CHUNKS_NAME))) continue;
     if (normalized === d || normalized.startsWith(d + path.sep)) return true;
   }
   return false;
 }
 
+function readChunks(dir) {
+  const file = path.join(dir, CHUNKS_NAME);
+  if (!fs.existsSync(file)) return;
+  const { files } = JSON.parse(fs.readFileSync(file, 'utf8'));
+  for (const rel of Object.keys(files || {})) {
+    chunkedFiles.add(path.normalize(path.join(dir, rel)));
+  }
+}
+
 function copyRecurse(src, dest) {
   const stat = fs.statSync(src);
   if (stat.isDirectory()) {
     if (!fs.existsSync(dest)) fs.mkdirSync(dest, { recursive: true });
+    readChunks(src);
     for (const name of fs.readdirSync(src)) {
       if (IGNORE.has(name)) continue;
       const s = path.join(src, name);
@@ -43,6 +71,8 @@ function copyRecurse(src, dest) {
       if (shouldExclude(s)) continue;
       copyRecurse(s, d);
     }
+  } else if (stat.size > MAX_BYTES) {
+    skippedLarge.push(path.relative(ROOT, src));
   } else {
     const dir = path.dirname(dest);
     if (!fs.existsSync(dir)) fs.mkdirSync(dir, { recursive: true });
@@ -50,6 +80,21 @@ function copyRecurse(src, dest) {
   }
 }
 
+function regenerate() {
+  for (const script of GENERATORS) {
+    const result = spawnSync(PYTHON, [script], { cwd: ROOT, stdio: 'inherit' });
+    if (result.error) {
+      // No Python on this machine: ship the committed files as they are
+      console.warn(`  could not run ${PYTHON} ${script} (${result.error.code}); using the committed output`);
+    } else if (result.status !== 0) {
+      console.error(`${script} failed (exit ${result.status})`);
+      process.exit(1);
+    }
+  }
+}
+
+regenerate();
+
 if (fs.existsSync(OUT)) fs.rmSync(OUT, { recursive: true });
 fs.mkdirSync(OUT, { recursive: true });
 
@@ -62,24 +107,18 @@ for (const name of fs.readdirSync(ROOT)) {
   copyRecurse(s, d);
 }
 
-// Generate sitemap.xml for SEO
-const SITE_URL = process.env.SITE_URL || 'https://nova-labs.pages.dev';
-const PAGES = [
-  '', 'index.html', 'projects.html', 'games-list.html', 'starred-games.html',
-  'loader.html', 'about.html', 'apps.html', 'settings.html', 'suggest.html',
-  'support.html', 'contact.html', 'privacy-policy.html', 'terms-of-service.html',
-  'cookie-policy.html', 'ad.html', 'blank.html', 'other.html',
-  'admin/git-scanner.html', 'admin/deployer.html', 'admin/git-fetcher.html',
-  'tools/backgrounds.html', 'tools/dev-tools.html'
-];
-const sitemap = `<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-${PAGES.map(p => {
-  const loc = p ? `${SITE_URL}/${p}` : SITE_URL + '/';
-  return `  <url><loc>${loc}</loc><changefreq>weekly</changefreq><priority>${p === '' ? '1.0' : p === 'index.html' ? '1.0' : p === 'projects.html' || p === 'games-list.html' ? '0.9' : '0.7'}</priority></url>`;
-}).join('\n')}
-</urlset>`;
-fs.writeFileSync(path.join(OUT, 'sitemap.xml'), sitemap);
-console.log('Pages build output written to dist/ (EscapeRoad, EscapeRoad2, EscapeRoadCity excluded).');
-console.log('sitemap.xml generated.');
+// sitemap.xml, sitemaps/, play/ and the feeds are generated by scripts/site_pages.py
+// and copied above like any other file
+if (!fs.existsSync(path.join(ROOT, 'sitemaps'))) {
+  console.warn('  no sitemaps/ yet: run scripts/site_pages.py to list the games in sitemap.xml');
+}
+console.log('Pages build output written to dist/' + (chunkedFiles.size ? ` (${chunkedFiles.size} oversized files shipped as parts).` : '.'));
+for (const d of EXCLUDE_DIRS) {
+  if (fs.existsSync(d) && !fs.existsSync(path.join(d, CHUNKS_NAME))) {
+    console.log(`  excluded ${path.relative(ROOT, d)} (run scripts/chunk_splitter.py split on it to ship it)`);
+  }
+}
+for (const rel of skippedLarge) {
+  console.warn(`  skipped ${rel}: over 25 MiB (split it with scripts/chunk_splitter.py)`);
+}
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Generate per-game Service Worker precache lists.
+
+For every directory game (non-semag/ and the local semag/ mirror) this writes
+precache/<game path>.json: the game's same-origin files with a content
+revision (sha256 prefix, taken from nova-manifest.json when it's current) and
+size. precache/index.json maps each game's URL directory to its list. When a
+game is opened, loader.html looks the game up in the index and hands the list
+to /nova-sw.js, which caches the files and serves them on later launches, so
+a second start comes from disk and works offline. Changed files get a new
+revision and are re-fetched; everything else stays cached.
+
+Budgets keep the cache sane: files over --max-file (giant Unity .data/.wasm)
+are left to the network unless the game is opted in with --large, and a game
+stops adding files at --max-game. Opt-ins are remembered in the index.
+
+Usage:
+    python scripts/precache_manifest.py
+    python scripts/precache_manifest.py --large happywheels --max-file 33554432
+    python scripts/precache_manifest.py --only some-game --dry-run
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+from chunk_splitter import CHUNKS_NAME, load_chunks
+from for_each_game import SKIP_DIRS, iter_games
+from novahub_config import ROOT_DIR, SEMAG_DIR
+from verified_download import MANIFEST_NAME, Manifest, file_sha256
+
+PRECACHE_DIR = ROOT_DIR / "precache"
+INDEX_PATH = PRECACHE_DIR / "index.json"
+# Files bigger than this are only precached for games opted in with --large
+MAX_FILE = 10 * 1024 * 1024
+# Per-game total
+MAX_GAME = 100 * 1024 * 1024
+# Never worth caching: build leftovers and tool metadata
+SKIP_NAMES = {MANIFEST_NAME, CHUNKS_NAME, '.DS_Store', 'Thumbs.db'}
+SKIP_SUFFIXES = ('.part', '.tmp', '.map')
+
+
+def find_games(semag_dir=SEMAG_DIR):
+    """[(name, URL directory, Path)] for every game directory with an index.html"""
+    games = []
+    for game in iter_games():
+        if game.is_dir and (game.path / 'index.html').is_file():
+            games.append((game.name, '/' + game.path.relative_to(ROOT_DIR).as_posix() + '/', game.path))
+    if Path(semag_dir).is_dir():
+        for path in sorted(Path(semag_dir).iterdir()):
+            if path.is_dir() and (path / 'index.html').is_file():
+                games.append((path.name, f"/semag/{path.name}/", path))
+    return games
+
+
+def game_files(game_dir):
+    """[(relative path, Path, size)] in a stable order: the page first, then by path"""
+    # Split originals aren't deployed; their .chunkNNN parts are
+    chunked = set(load_chunks(game_dir))
+    files = []
+    for dirpath, dirnames, filenames in os.walk(game_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename in SKIP_NAMES or filename.endswith(SKIP_SUFFIXES):
+                continue
+            path = Path(dirpath) / filename
+            rel = path.relative_to(game_dir).as_posix()
+            if rel not in chunked:
+                files.append((rel, path, path.stat().st_size))
+    files.sort(key=lambda f: (f[0] != 'index.html', f[0]))
+    return files
+
+
+def revisions(game_dir, files):
+    """{relative path: sha256 prefix}, reusing nova-manifest.json hashes whose size still matches"""
+    manifest = Manifest(game_dir)
+    result = {}
+    for rel, path, size in files:
+        entry = manifest.files.get(rel)
+        sha256 = entry['sha256'] if entry and entry['size'] == size else file_sha256(path)
+        result[rel] = sha256[:16]
+    return result
+
+
+def build_list(url_dir, game_dir, max_file=MAX_FILE, max_game=MAX_GAME, large=False):
+    """-> (precache list dict, [skipped relative paths])"""
+    files = game_files(game_dir)
+    revs = revisions(game_dir, files)
+    entries, skipped, total = [], [], 0
+    for rel, _, size in files:
+        if (size > max_file and not large) or total + size > max_game:
+            skipped.append(rel)
+            continue
+        entries.append([url_dir + quote(rel), revs[rel], size])
+        total += size
+    version = hashlib.sha256(json.dumps(entries, separators=(',', ':')).encode()).hexdigest()[:12]
+    return {'dir': url_dir, 'version': version, 'bytes': total, 'files': entries}, skipped
+
+
+def list_path(url_dir):
+    return PRECACHE_DIR / (url_dir.strip('/') + '.json')
+
+
+def load_index():
+    try:
+        return json.loads(INDEX_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json(path, data, compact=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    text = json.dumps(data, separators=(',', ':')) if compact else json.dumps(data, indent='\t')
+    tmp_path.write_text(text + '\n', encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def format_size(size):
+    return f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Service Worker precache lists for directory games')
+    parser.add_argument('--only', action='append', help='Only this game (repeatable)')
+    parser.add_argument('--large', action='append', default=[], help='Also precache files over --max-file for this game')
+    parser.add_argument('--no-large', action='append', default=[], help='Drop a remembered --large opt-in')
+    parser.add_argument('--max-file', type=int, default=MAX_FILE, help=f'Per-file limit in bytes (default {MAX_FILE})')
+    parser.add_argument('--max-game', type=int, default=MAX_GAME, help=f'Per-game limit in bytes (default {MAX_GAME})')
+    parser.add_argument('--dry-run', action='store_true', help="Print what would be written")
+    args = parser.parse_args()
+
+    start = time.time()
+    old_index = load_index()
+    index = {} if not args.only else dict(old_index)
+    games = find_games()
+    if args.only:
+        games = [g for g in games if g[0] in set(args.only)]
+        if not games:
+            print(f"✗ No directory game named {', '.join(args.only)}")
+            sys.exit(1)
+
+    changed = 0
+    for name, url_dir, game_dir in games:
+        large = (name in args.large or old_index.get(url_dir, {}).get('large', False)) and name not in args.no_large
+        precache, skipped = build_list(url_dir, game_dir, args.max_file, args.max_game, large)
+        path = list_path(url_dir)
+        entry = {'list': '/' + path.relative_to(ROOT_DIR).as_posix(), 'version': precache['version'],
+                 'files': len(precache['files']), 'bytes': precache['bytes']}
+        if large:
+            entry['large'] = True
+        index[url_dir] = entry
+        is_new = old_index.get(url_dir, {}).get('version') != precache['version']
+        changed += is_new
+        note = f", {len(skipped)} over budget" if skipped else ''
+        print(f"  {'✓' if is_new else '='} {url_dir}: {len(precache['files'])} files, "
+              f"{format_size(precache['bytes'])}{note}")
+        if (is_new or not path.exists()) and not args.dry_run:
+            write_json(path, precache, compact=True)
+
+    # Lists of games that no longer exist
+    for url_dir in set(old_index) - set(index):
+        stale = list_path(url_dir)
+        print(f"  - {url_dir}: removed")
+        if not args.dry_run and stale.exists():
+            stale.unlink()
+    if not args.dry_run:
+        write_json(INDEX_PATH, dict(sorted(index.items())))
+    print(f"\n{len(index)} games in {INDEX_PATH.relative_to(ROOT_DIR)}, {changed} lists updated "
+          f"in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
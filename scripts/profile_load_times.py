@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Headless load-time profiler for games in data/games.json.
+
+Opens each game through loader.html (the same hash the game list builds),
+presses Play, and measures:
+  - time to first frame: from the Play click to the first draw call on any
+    canvas (WebGL draw*/clear or 2D draw/fill/putImageData) in the game frame
+  - the network waterfall after the click: request count, bytes transferred,
+    failures, per-host totals and the slowest requests
+
+Games are served by scripts/local_server.py, so numbers reflect our files,
+not the network. The ranked report shows which games pay off most from
+precompression, trimming assets or moving them off a slow CDN.
+
+Usage:
+    python scripts/profile_load_times.py --source non-semag --limit 20
+    python scripts/profile_load_times.py --only "OvO 2" --only "Ice Dodo" --report load-profile.json
+    python scripts/profile_load_times.py --semag-dir ../semag-mirror --timeout 60 --warm
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote, urlparse
+
+from local_server import serve_in_thread
+from novahub_config import GAMES_JSON_PATH, SEMAG_DIR
+
+# Try to import Selenium for the headless browser
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    # Try to use webdriver-manager for automatic ChromeDriver management
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        USE_WEBDRIVER_MANAGER = True
+    except ImportError:
+        USE_WEBDRIVER_MANAGER = False
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+    USE_WEBDRIVER_MANAGER = False
+
+# Injected into every frame before any page script runs. Records the wall-clock
+# time of the first canvas draw call on the top window (same-origin frames can
+# reach it) and on the frame itself.
+FIRST_FRAME_HOOK = r"""
+(() => {
+  if (window.__novaHooked) return;
+  window.__novaHooked = true;
+  const mark = (kind) => {
+    const t = performance.timeOrigin + performance.now();
+    for (const w of [window, (() => { try { return window.top.document && window.top; } catch (e) { return null; } })()]) {
+      if (w && !w.__novaFirstFrame) { w.__novaFirstFrame = t; w.__novaFirstFrameKind = kind; }
+    }
+  };
+  const wrap = (proto, names, kind) => {
+    if (!proto) return;
+    for (const name of names) {
+      const original = proto[name];
+      if (typeof original !== 'function') continue;
+      proto[name] = function () {
+        if (!window.__novaFirstFrame) mark(kind);
+        return original.apply(this, arguments);
+      };
+    }
+  };
+  wrap(window.WebGLRenderingContext && WebGLRenderingContext.prototype, ['drawArrays', 'drawElements', 'clear'], 'webgl');
+  wrap(window.WebGL2RenderingContext && WebGL2RenderingContext.prototype,
+       ['drawArrays', 'drawElements', 'drawArraysInstanced', 'drawElementsInstanced', 'clear'], 'webgl2');
+  wrap(window.CanvasRenderingContext2D && CanvasRenderingContext2D.prototype,
+       ['drawImage', 'fillRect', 'putImageData', 'fill', 'fillText'], '2d');
+})();
+"""
+
+
+def loader_hash(game):
+    """Same encoding as js/games.js: btoa(encodeURIComponent(JSON.stringify([...])))"""
+    payload = [game.get('directory'), game.get('image'), game.get('name'), game.get('source'), game]
+    encoded = quote(json.dumps(payload, separators=(',', ':'), ensure_ascii=False), safe="-_.!~*'()")
+    return base64.b64encode(encoded.encode('ascii')).decode('ascii')
+
+
+def create_driver():
+    chrome_options = Options()
+    chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--window-size=1280,800')
+    chrome_options.add_argument('--autoplay-policy=no-user-gesture-required')
+    # Software WebGL so Unity/Three.js games can render without a GPU
+    chrome_options.add_argument('--use-angle=swiftshader')
+    chrome_options.add_argument('--enable-unsafe-swiftshader')
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    if USE_WEBDRIVER_MANAGER:
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': FIRST_FRAME_HOOK})
+    driver.execute_cdp_cmd('Network.enable', {})
+    return driver
+
+
+def collect_network(log_entries, since_wall, site_host):
+    """Turn Chrome performance-log events into per-request rows, keeping requests sent after since_wall"""
+    requests_by_id = {}
+    clock_offset = None  # wallTime - monotonic timestamp, from the first requestWillBeSent
+    for entry in log_entries:
+        message = json.loads(entry['message'])['message']
+        method, params = message.get('method'), message.get('params', {})
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            if clock_offset is None:
+                clock_offset = params['wallTime'] - params['timestamp']
+            if params['wallTime'] * 1000 < since_wall:
+                continue
+            requests_by_id[request_id] = {
+                'url': params['request']['url'], 'start': params['timestamp'], 'end': None,
+                'status': None, 'bytes': 0, 'type': params.get('type'), 'error': None, 'cached': False,
+            }
+        elif request_id in requests_by_id:
+            row = requests_by_id[request_id]
+            if method == 'Network.responseReceived':
+                response = params['response']
+                row['status'] = response.get('status')
+                row['cached'] = bool(response.get('fromDiskCache') or response.get('fromServiceWorker'))
+            elif method == 'Network.loadingFinished':
+                row['end'] = params['timestamp']
+                row['bytes'] = int(params.get('encodedDataLength') or 0)
+            elif method == 'Network.loadingFailed':
+                row['end'] = params['timestamp']
+                row['error'] = params.get('errorText')
+
+    rows = []
+    for row in requests_by_id.values():
+        if row['url'].startswith('data:'):
+            continue
+        row['ms'] = round((row['end'] - row['start']) * 1000, 1) if row['end'] else None
+        row['offset_ms'] = round(((row['start'] + (clock_offset or 0)) * 1000 - since_wall), 1)
+        row['external'] = urlparse(row['url']).netloc != site_host
+        rows.append(row)
+    rows.sort(key=lambda r: r['offset_ms'])
+    return rows
+
+
+def profile_game(driver, base_url, game, timeout, settle, warm):
+    result = {
+        'name': game.get('name'), 'source': game.get('source'), 'gameUrl': game.get('gameUrl'),
+        'ttff_ms': None, 'frame_kind': None, 'requests': 0, 'bytes': 0, 'failed': 0,
+        'external_bytes': 0, 'waterfall_ms': None, 'hosts': {}, 'slowest': [], 'error': None,
+    }
+    try:
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': not warm})
+        driver.get('about:blank')
+        driver.get_log('performance')  # Drop events from the previous game
+        driver.get(f"{base_url}/loader.html#{loader_hash(game)}")
+
+        deadline = time.time() + timeout
+        clicked_at = None
+        while time.time() < deadline and clicked_at is None:
+            clicked_at = driver.execute_script("""
+                const button = document.getElementById('playButton');
+                if (!button || document.readyState === 'loading') return null;
+                const t = performance.timeOrigin + performance.now();
+                button.click();
+                return t;
+            """)
+            if clicked_at is None:
+                time.sleep(0.05)
+        if clicked_at is None:
+            raise TimeoutError('Play button never appeared')
+
+        first_frame = None
+        while time.time() < deadline:
+            first_frame, kind = driver.execute_script(
+                "return [window.__novaFirstFrame || null, window.__novaFirstFrameKind || null];")
+            if first_frame:
+                result['ttff_ms'] = round(first_frame - clicked_at, 1)
+                result['frame_kind'] = kind
+                break
+            time.sleep(0.05)
+        if first_frame:
+            time.sleep(settle)  # Let the post-first-frame loading finish for the waterfall totals
+
+        rows = collect_network(driver.get_log('performance'), clicked_at, urlparse(base_url).netloc)
+        hosts = Counter()
+        for row in rows:
+            hosts[urlparse(row['url']).netloc] += row['bytes']
+        ends = [r['offset_ms'] + r['ms'] for r in rows if r['ms'] is not None]
+        result.update(
+            requests=len(rows),
+            bytes=sum(r['bytes'] for r in rows),
+            failed=sum(1 for r in rows if r['error'] or (r['status'] or 0) >= 400),
+            external_bytes=sum(r['bytes'] for r in rows if r['external']),
+            waterfall_ms=round(max(ends), 1) if ends else None,
+            hosts=dict(hosts.most_common()),
+            slowest=[{k: r[k] for k in ('url', 'status', 'bytes', 'ms', 'offset_ms', 'error')}
+                     for r in sorted(rows, key=lambda r: r['ms'] or 0, reverse=True)[:5]],
+        )
+        if not first_frame:
+            result['error'] = f'no canvas frame within {timeout}s'
+    except (WebDriverException, TimeoutError) as e:
+        result['error'] = f"{type(e).__name__}: {str(e).splitlines()[0][:200]}"
+    return result
+
+
+def print_ranking(results):
+    ranked = sorted(results, key=lambda r: (r['ttff_ms'] is not None, r['ttff_ms'] or 0), reverse=True)
+    ranked = [r for r in ranked if r['ttff_ms'] is not None] + [r for r in ranked if r['ttff_ms'] is None]
+    print(f"\n{'Game':<40} {'TTFF':>9} {'Reqs':>5} {'MB':>8} {'Ext MB':>7} {'Fail':>4}")
+    for r in ranked:
+        ttff = f"{r['ttff_ms'] / 1000:.2f}s" if r['ttff_ms'] is not None else '—'
+        print(f"{r['name'][:40]:<40} {ttff:>9} {r['requests']:>5} {r['bytes'] / 1048576:>8.2f} "
+              f"{r['external_bytes'] / 1048576:>7.2f} {r['failed']:>4}"
+              + (f"  ({r['error']})" if r['error'] else ''))
+    measured = sorted(r['ttff_ms'] for r in results if r['ttff_ms'] is not None)
+    if measured:
+        print(f"\nMedian TTFF {measured[len(measured) // 2] / 1000:.2f}s over {len(measured)} games; "
+              f"{len(results) - len(measured)} without a canvas frame")
+    return ranked
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure time-to-first-frame and network cost of each game')
+    parser.add_argument('--source', choices=['non-semag', 'semag'], help='Only profile entries from this source')
+    parser.add_argument('--only', action='append', help='Only this game name (repeatable)')
+    parser.add_argument('--limit', type=int, help='Profile at most this many games')
+    parser.add_argument('--semag-dir', default=str(SEMAG_DIR), help='Local mirror of the R2 semag/ prefix')
+    parser.add_argument('--timeout', type=float, default=30, help='Seconds to wait for a first frame (default: 30)')
+    parser.add_argument('--settle', type=float, default=2, help='Seconds to keep recording after the first frame (default: 2)')
+    parser.add_argument('--warm', action='store_true', help='Keep the browser cache between games')
+    parser.add_argument('--report', help='Write ranked results as JSON to this file')
+    args = parser.parse_args()
+
+    if not SELENIUM_AVAILABLE:
+        print("❌ Selenium is required to drive Chrome. Install with: pip install selenium")
+        sys.exit(1)
+
+    with open(GAMES_JSON_PATH, 'r', encoding='utf-8') as f:
+        games = json.load(f)
+    if args.source:
+        games = [g for g in games if g.get('source') == args.source]
+    if args.only:
+        wanted = {name.lower() for name in args.only}
+        games = [g for g in games if g.get('name', '').lower() in wanted]
+    if not Path(args.semag_dir).is_dir():
+        skipped = sum(1 for g in games if g.get('source') == 'semag')
+        games = [g for g in games if g.get('source') != 'semag']
+        if skipped:
+            print(f"⏭ Skipping {skipped} semag games: no local mirror at {args.semag_dir}")
+    if args.limit:
+        games = games[:args.limit]
+
+    stop_server, base_url = serve_in_thread(semag_dir=args.semag_dir)
+    print(f"Serving site at {base_url}; profiling {len(games)} games...")
+    driver = create_driver()
+    results = []
+    started = time.time()
+    try:
+        for i, game in enumerate(games, 1):
+            result = profile_game(driver, base_url, game, args.timeout, args.settle, args.warm)
+            results.append(result)
+            ttff = f"{result['ttff_ms'] / 1000:.2f}s" if result['ttff_ms'] is not None else '—'
+            print(f"  [{i}/{len(games)}] {'✓' if not result['error'] else '✗'} {game.get('name')}: "
+                  f"{ttff}, {result['requests']} requests, {result['bytes'] / 1048576:.2f} MB", flush=True)
+    except KeyboardInterrupt:
+        print("\nInterrupted, reporting what finished")
+    finally:
+        driver.quit()
+        stop_server()
+
+    ranked = print_ranking(results)
+    print(f"Done in {time.time() - started:.1f}s")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'base_url': base_url, 'warm': args.warm, 'games': ranked}, f, indent=2)
+        print(f"📁 Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Incremental upload of semag/ games to the R2 bucket.
+
+upload-game-to-r2.js puts every file of a game again on each deploy. This
+compares the local files with a listing of the bucket (S3 API) and only
+uploads objects whose bytes changed, plus new ones; with --delete it also
+removes objects that no longer exist locally. Objects are compared by ETag:
+a plain MD5 for single-part uploads, MD5-of-part-MD5s for multipart ones,
+both computed locally in one pass and cached by size+mtime in
+.cache/r2-sync.json, so an unchanged tree isn't re-hashed.
+
+Uploads run in parallel (multipart for big Unity .data/.wasm files) with
+Content-Type/Content-Encoding set the way local_server.py serves them, so
+game.wasm.br lands as application/wasm + Content-Encoding: br.
+
+Credentials come from R2_ACCESS_KEY_ID / R2_SECRET_ACCESS_KEY and the
+endpoint from R2_ACCOUNT_ID (or R2_ENDPOINT for any S3-compatible server,
+e.g. a local MinIO for testing).
+
+Usage:
+    python scripts/r2_sync.py semag                    # Plan + upload all games
+    python scripts/r2_sync.py semag/happywheels --dry-run
+    python scripts/r2_sync.py semag --delete --workers 16
+    python scripts/r2_sync.py semag --endpoint http://localhost:9000 --bucket test
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from local_server import ENCODINGS, SEMAG_CACHE_CONTROL, content_type
+from novahub_config import CACHE_DIR, SEMAG_DIR
+from verified_download import MANIFEST_NAME
+
+# Try to import boto3 for the S3 API
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+BUCKET = os.environ.get('R2_BUCKET', 'nova-hub')
+R2_PREFIX = 'semag'
+CACHE_PATH = CACHE_DIR / "r2-sync.json"
+# Must match the TransferConfig used for uploads, or multipart ETags won't compare
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+SKIP_NAMES = {MANIFEST_NAME, '.DS_Store', 'Thumbs.db'}
+DELETE_BATCH = 1000
+
+
+def local_files(path):
+    """{R2 key: local path} for a semag/ mirror or a single game inside it"""
+    path = Path(path).resolve()
+    if path == SEMAG_DIR.resolve() or (path.name == 'semag' and not (path / 'index.html').exists()):
+        games = [p for p in sorted(path.iterdir()) if p.is_dir()]
+    else:
+        games = [path]
+    files = {}
+    for game in games:
+        for file_path in sorted(game.rglob('*')):
+            if file_path.is_file() and file_path.name not in SKIP_NAMES and not file_path.name.endswith(('.part', '.tmp')):
+                files[f"{R2_PREFIX}/{game.name}/{file_path.relative_to(game).as_posix()}"] = file_path
+    return files, [f"{R2_PREFIX}/{game.name}/" for game in games]
+
+
+def file_etags(path):
+    """(single-part MD5 ETag, multipart ETag or None) for a file"""
+    whole = hashlib.md5()
+    parts = []
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(PART_SIZE), b''):
+            whole.update(chunk)
+            parts.append(hashlib.md5(chunk).digest())
+    size = path.stat().st_size
+    if size < MULTIPART_THRESHOLD:
+        return whole.hexdigest(), None
+    return whole.hexdigest(), f"{hashlib.md5(b''.join(parts)).hexdigest()}-{len(parts)}"
+
+
+def load_cache():
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_PATH.with_name(CACHE_PATH.name + '.tmp')
+    tmp_path.write_text(json.dumps(cache), encoding='utf-8')
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def hash_local(files, workers=8):
+    """{key: {'size', 'md5', 'multipart'}}, re-hashing only files whose size/mtime changed"""
+    cache = load_cache()
+    result, todo = {}, []
+    for key, path in files.items():
+        stat = path.stat()
+        cached = cache.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            result[key] = cached
+        else:
+            todo.append((key, path, stat))
+
+    def work(item):
+        key, path, stat = item
+        md5, multipart = file_etags(path)
+        return key, {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': md5, 'multipart': multipart}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, entry in pool.map(work, todo):
+            result[key] = cache[key] = entry
+    save_cache(cache)
+    return result, len(todo)
+
+
+def make_client(endpoint=None):
+    if not BOTO3_AVAILABLE:
+        print("✗ boto3 is required to talk to R2: pip install boto3")
+        sys.exit(1)
+    account = os.environ.get('R2_ACCOUNT_ID')
+    endpoint = endpoint or os.environ.get('R2_ENDPOINT') or (account and f"https://{account}.r2.cloudflarestorage.com")
+    if not endpoint:
+        print("✗ Set R2_ACCOUNT_ID (or R2_ENDPOINT / --endpoint for another S3-compatible server)")
+        sys.exit(1)
+    return boto3.client(
+        's3', endpoint_url=endpoint, region_name='auto',
+        aws_access_key_id=os.environ.get('R2_ACCESS_KEY_ID') or os.environ.get('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.environ.get('R2_SECRET_ACCESS_KEY') or os.environ.get('AWS_SECRET_ACCESS_KEY'),
+    )
+
+
+def list_remote(client, bucket, prefixes):
+    """{key: {'size', 'etag'}} for every object under the given prefixes"""
+    remote = {}
+    paginator = client.get_paginator('list_objects_v2')
+    for prefix in prefixes:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                remote[obj['Key']] = {'size': obj['Size'], 'etag': obj['ETag'].strip('"')}
+    return remote
+
+
+def same_object(local, remote):
+    if remote['size'] != local['size']:
+        return False
+    if '-' in remote['etag']:
+        return remote['etag'] == local['multipart']
+    return remote['etag'] == local['md5']
+
+
+def plan_sync(local, remote, delete=False):
+    """{'upload': [keys], 'unchanged': [keys], 'delete': [keys]}"""
+    plan = {'upload': [], 'unchanged': [], 'delete': []}
+    for key, entry in sorted(local.items()):
+        if key in remote and same_object(entry, remote[key]):
+            plan['unchanged'].append(key)
+        else:
+            plan['upload'].append(key)
+    if delete:
+        plan['delete'] = sorted(set(remote) - set(local))
+    return plan
+
+
+def object_metadata(path):
+    """ExtraArgs for an upload: the headers local_server.py would send for this file"""
+    extra = {'ContentType': content_type(path.name), 'CacheControl': SEMAG_CACHE_CONTROL}
+    encoding = ENCODINGS.get(path.suffix.lower())
+    if encoding:
+        extra['ContentEncoding'] = encoding
+    return extra
+
+
+def upload(client, bucket, files, keys, workers=8, part_concurrency=4):
+    """Upload keys in parallel; -> (uploaded bytes, [(key, error)])"""
+    config = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, multipart_chunksize=PART_SIZE,
+                            max_concurrency=part_concurrency, use_threads=True)
+    sent, failed = 0, []
+
+    def put(key):
+        path = files[key]
+        client.upload_file(str(path), bucket, key, ExtraArgs=object_metadata(path), Config=config)
+        return path.stat().st_size
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(put, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                size = future.result()
+                sent += size
+                print(f"  ✓ {key} ({size:,} bytes)")
+            except Exception as e:
+                failed.append((key, str(e)))
+                print(f"  ✗ {key}: {e}")
+    return sent, failed
+
+
+def delete(client, bucket, keys):
+    for i in range(0, len(keys), DELETE_BATCH):
+        batch = keys[i:i + DELETE_BATCH]
+        client.delete_objects(Bucket=bucket, Delete={'Objects': [{'Key': k} for k in batch], 'Quiet': True})
+        for key in batch:
+            print(f"  - {key}")
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload only changed semag/ files to R2')
+    parser.add_argument('path', nargs='?', default=str(SEMAG_DIR), help='semag/ mirror or one game inside it')
+    parser.add_argument('--bucket', default=BUCKET)
+    parser.add_argument('--endpoint', help='S3 endpoint URL (default: R2 for $R2_ACCOUNT_ID)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan without uploading')
+    parser.add_argument('--delete', action='store_true', help='Delete remote objects missing locally')
+    parser.add_argument('--workers', type=int, default=8, help='Files uploaded in parallel')
+    parser.add_argument('--part-concurrency', type=int, default=4, help='Parallel parts per multipart upload')
+    parser.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.is_dir():
+        print(f"✗ Not a directory: {path}")
+        sys.exit(1)
+
+    start = time.time()
+    files, prefixes = local_files(path)
+    local, rehashed = hash_local(files, args.workers)
+    client = make_client(args.endpoint)
+    remote = list_remote(client, args.bucket, prefixes)
+    plan = plan_sync(local, remote, args.delete)
+
+    if args.json:
+        print(json.dumps(plan, indent=2))
+    upload_bytes = sum(local[k]['size'] for k in plan['upload'])
+    total_bytes = sum(entry['size'] for entry in local.values())
+    print(f"{len(local)} local files ({rehashed} hashed), {len(remote)} remote objects in {time.time() - start:.1f}s")
+    print(f"  upload:    {len(plan['upload'])} files, {format_size(upload_bytes)} of {format_size(total_bytes)}")
+    print(f"  unchanged: {len(plan['unchanged'])} files")
+    if args.delete:
+        print(f"  delete:    {len(plan['delete'])} objects")
+    if args.dry_run:
+        if not args.json:
+            for key in plan['upload']:
+                print(f"    + {key}")
+            for key in plan['delete']:
+                print(f"    - {key}")
+        return
+
+    sent, failed = upload(client, args.bucket, files, plan['upload'], args.workers, args.part_concurrency)
+    if plan['delete']:
+        delete(client, args.bucket, plan['delete'])
+    print(f"\nDone in {time.time() - start:.1f}s: {len(plan['upload']) - len(failed)} uploaded "
+          f"({format_size(sent)}), {len(failed)} failed, {len(plan['delete'])} deleted")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,8 @@ Remove Yandex SDK references from game HTML files
 import re
 from pathlib import Path
 
-def remove_yandex_sdk(html_path):
-    """Remove Yandex SDK references from HTML file"""
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    original_len = len(content)
-    
+def strip_yandex_sdk(html_path, content):
+    """Return content with Yandex SDK references removed (for_each_game.py transform)"""
     # Remove Yandex SDK script tag
     content = re.sub(r'<!-- Yandex Games SDK -->\s*<script src="sdk\.js"></script>', '', content)
     
@@ -55,6 +50,15 @@ def remove_yandex_sdk(html_path):
     content = re.sub(r'if \(ysdk == null\)', 'if (true) // Yandex SDK removed', content)
     content = re.sub(r'if \(!ysdk\)', 'if (true) // Yandex SDK removed', content)
     content = re.sub(r'if \(ysdk !== null\)', 'if (false) // Yandex SDK removed', content)
+    return content
+
+def remove_yandex_sdk(html_path):
+    """Remove Yandex SDK references from HTML file"""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    original_len = len(content)
+    content = strip_yandex_sdk(html_path, content)
     
     # Save the cleaned content
     with open(html_path, 'w', encoding='utf-8') as f:
@@ -2,14 +2,22 @@
 """
 Scrape all games from codys-shack-games.pages.dev/projects
 Download all files, not iframe, and skip games we already have
+
+Progress is kept in the job queue (.cache/jobs.sqlite3), so an interrupted
+run resumes where it stopped. Run it from several terminals to scrape in
+parallel (the last one to finish writes games.json); --fresh starts over.
 """
+import argparse
 import json
 import re
+import threading
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
-import requests
 import time
+import http_client
+from job_queue import JobQueue, run_workers
+from novahub_config import load_games, save_games
 
 GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 GAMES_JSON_PATH = Path(__file__).parent.parent / "data" / "games.json"
@@ -18,6 +26,7 @@ HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'en-US,en;q=0.9',
 }
+QUEUE_NAME = 'codys-shack'
 
 def sanitize_filename(name):
     """Sanitize filename"""
@@ -27,7 +36,7 @@ def download_file(url, filepath, show_progress=False, current=0, total=0):
     """Download a file with progress"""
     try:
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=60)
+        r = http_client.get(url, headers=HEADERS, stream=True, timeout=60)
         r.raise_for_status()
         
         total_size = int(r.headers.get('content-length', 0))
@@ -79,7 +88,7 @@ def scrape_codys_game(game_url, existing_dirs, existing_urls, existing_names):
     """Scrape a single game from codys-shack-games.pages.dev"""
     try:
         # Fetch the game page
-        response = requests.get(game_url, headers=HEADERS, timeout=30)
+        response = http_client.get(game_url, headers=HEADERS, timeout=30)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -300,9 +309,18 @@ def scrape_codys_game(game_url, existing_dirs, existing_urls, existing_names):
         return None, f"Error: {str(e)[:100]}"
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape all games from codys-shack-games.pages.dev")
+    parser.add_argument('--workers', type=int, default=1, help='Parallel workers in this process (default: 1)')
+    parser.add_argument('--fresh', action='store_true', help='Forget previous progress and start over')
+    args = parser.parse_args()
+
     print("Scraping all games from codys-shack-games.pages.dev/projects...")
     print("=" * 60, flush=True)
     
+    queue = JobQueue()
+    if args.fresh:
+        queue.clear(QUEUE_NAME)
+    
     # Get existing games
     existing_dirs, existing_urls, existing_names = get_existing_games()
     print(f"Found {len(existing_dirs)} existing games", flush=True)
@@ -313,7 +331,7 @@ def main():
     
     try:
         api_url = "https://api.github.com/repos/theinfamouscoder5/codys-shack-games/contents/projects"
-        response = requests.get(api_url, headers=HEADERS, timeout=30)
+        response = http_client.get(api_url, headers=HEADERS, timeout=30)
         if response.status_code == 200:
             projects = response.json()
             base_url = "https://codys-shack-games.pages.dev/projects"
@@ -332,76 +350,78 @@ def main():
     if len(game_urls) == 0:
         print("  [WARN] No games found via GitHub API, trying projects page...", flush=True)
         projects_url = "https://codys-shack-games.pages.dev/projects"
-        response = requests.get(projects_url, headers=HEADERS, timeout=30)
+        response = http_client.get(projects_url, headers=HEADERS, timeout=30)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
+        seen = set()
         for link in soup.find_all('a', href=True):
             href = link.get('href', '')
             if '/projects/' in href:
                 full_url = urljoin(projects_url, href)
-                if full_url not in game_urls and full_url != projects_url:
+                if full_url not in seen and full_url != projects_url:
+                    seen.add(full_url)
                     game_urls.append(full_url)
     
-    print(f"  Total: {len(game_urls)} game URLs to process", flush=True)
+    added = queue.enqueue_many(QUEUE_NAME, [(url, {'url': url}) for url in game_urls])
+    remaining = queue.remaining(QUEUE_NAME)
+    print(f"  Total: {len(game_urls)} game URLs ({added} newly queued, {remaining} left to process)", flush=True)
     
     # Scrape games
     print(f"\nStep 2: Scraping games (showing progress)...", flush=True)
-    scraped_games = []
-    skipped = 0
-    failed = 0
+    lock = threading.Lock()
+    counter = {'n': 0}
     
-    for idx, game_url in enumerate(game_urls, 1):
-        print(f"\n[{idx}/{len(game_urls)}] Processing: {game_url[:60]}...", flush=True)
+    def handle(job):
+        game_url = job.payload['url']
+        with lock:
+            counter['n'] += 1
+            print(f"\n[{counter['n']}/{remaining}] Processing: {game_url[:60]}...", flush=True)
         
         game_entry, status = scrape_codys_game(game_url, existing_dirs, existing_urls, existing_names)
+        time.sleep(0.5)  # Small delay to avoid rate limiting
         
         if game_entry:
-            scraped_games.append(game_entry)
-            existing_dirs.add(game_entry['directory'].lower())
-            existing_urls.add(game_entry['url'].lower())
-            existing_names.add(game_entry['name'].lower())
-            existing_names.add(sanitize_filename(game_entry['name']))
+            with lock:
+                existing_dirs.add(game_entry['directory'].lower())
+                existing_urls.add(game_entry['url'].lower())
+                existing_names.add(game_entry['name'].lower())
+                existing_names.add(sanitize_filename(game_entry['name']))
             print(f"  [OK] {game_entry['name']} - {status}", flush=True)
-            print(f"    Progress: {len(scraped_games)} games scraped", flush=True)
-        elif "Already exists" in status:
-            skipped += 1
+            return {'status': 'scraped', 'entry': game_entry}
+        if "Already exists" in status:
             print(f"  [SKIP] {status}", flush=True)
-        else:
-            failed += 1
-            print(f"  [FAIL] {status}", flush=True)
-        
-        time.sleep(0.5)  # Small delay to avoid rate limiting
+            return {'status': 'skipped', 'reason': status}
+        raise RuntimeError(status)
     
-    # Update games.json
-    if scraped_games:
+    run_workers(queue, QUEUE_NAME, handle, workers=args.workers)
+    
+    # Collect results from this and any earlier interrupted runs
+    results = [result for _, result in queue.results(QUEUE_NAME)]
+    scraped_games = [r['entry'] for r in results if r['status'] == 'scraped']
+    skipped = sum(1 for r in results if r['status'] == 'skipped')
+    counts = queue.stats(QUEUE_NAME).get(QUEUE_NAME, {})
+    failed = counts.get('dead', 0) + counts.get('failed', 0)
+    
+    # Update games.json; with several terminals on one queue, only the one that drains it writes
+    others_running = queue.remaining(QUEUE_NAME) > 0
+    if scraped_games and others_running:
+        print(f"\nStep 3: Other workers still hold jobs; the last one to finish updates games.json", flush=True)
+    elif scraped_games:
         print(f"\nStep 3: Updating games.json...", flush=True)
-        if GAMES_JSON_PATH.exists():
-            with open(GAMES_JSON_PATH, 'r', encoding='utf-8') as f:
-                games_data = json.load(f)
-        else:
-            games_data = []
-        
-        if isinstance(games_data, dict):
-            games_list = games_data.get("games", [])
-        else:
-            games_list = games_data
-        
-        # Remove existing entries
-        for new_game in scraped_games:
-            games_list = [g for g in games_list if g.get("directory") != new_game['directory']]
+        games_list = load_games() if GAMES_JSON_PATH.exists() else []
         
-        games_list.extend(scraped_games)
+        # The queue keeps every earlier run's results too; only add games the catalog doesn't have yet,
+        # so entries already there keep their place and any later edits (categories, fixes)
+        known_dirs = {g.get("directory") for g in games_list}
+        new_games = [g for g in scraped_games if g['directory'] not in known_dirs]
         
-        if isinstance(games_data, dict):
-            games_data["games"] = games_list
+        if new_games:
+            games_list.extend(new_games)
+            save_games(games_list)
+            print(f"  [OK] Added {len(new_games)} games to games.json", flush=True)
         else:
-            games_data = games_list
-        
-        with open(GAMES_JSON_PATH, 'w', encoding='utf-8') as f:
-            json.dump(games_data, f, indent='\t', ensure_ascii=False)
-        
-        print(f"  [OK] Added {len(scraped_games)} games to games.json", flush=True)
+            print(f"  [OK] games.json already has all {len(scraped_games)} scraped games", flush=True)
     
     # Summary
     print("\n" + "=" * 60, flush=True)
@@ -409,8 +429,8 @@ def main():
     print("=" * 60, flush=True)
     print(f"Successfully scraped: {len(scraped_games)} games", flush=True)
     print(f"Skipped (already exist): {skipped} games", flush=True)
-    print(f"Failed: {failed} games", flush=True)
-    print(f"Total processed: {len(game_urls)} URLs", flush=True)
+    print(f"Failed: {failed} games (retry with: python scripts/job_queue.py retry {QUEUE_NAME})", flush=True)
+    print(f"Total processed: {len(results)}/{len(game_urls)} URLs", flush=True)
     
     if scraped_games:
         print(f"\nScraped games:", flush=True)
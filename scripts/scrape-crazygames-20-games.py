@@ -9,6 +9,7 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import requests
 import time
+from crawl_frontier import canonicalize_url
 
 GAMES_DIR = Path(__file__).parent.parent / "non-semag"
 GAMES_JSON_PATH = Path(__file__).parent.parent / "data" / "games.json"
@@ -76,28 +77,24 @@ def find_game_urls_from_homepage():
         game_urls = []
         seen = set()
         
+        def add(href):
+            clean_url = canonicalize_url(href, base="https://www.crazygames.com")
+            if clean_url not in seen:
+                seen.add(clean_url)
+                game_urls.append(clean_url)
+        
         # Method 1: Find links with /game/ in href
         for link in soup.find_all('a', href=True):
             href = link.get('href', '')
-            if '/game/' in href and href not in seen:
-                full_url = urljoin("https://www.crazygames.com", href)
-                # Clean URL (remove query params and fragments)
-                clean_url = full_url.split('?')[0].split('#')[0].rstrip('/')
-                if clean_url not in seen:
-                    seen.add(clean_url)
-                    game_urls.append(clean_url)
+            if '/game/' in href:
+                add(href)
         
         # Method 2: Look in script tags for game data
         for script in soup.find_all('script'):
             if script.string:
                 # Look for JSON data with game URLs
-                matches = re.findall(r'["\'](/game/[^"\']+)["\']', script.string)
-                for match in matches:
-                    full_url = urljoin("https://www.crazygames.com", match)
-                    clean_url = full_url.split('?')[0].split('#')[0].rstrip('/')
-                    if clean_url not in seen:
-                        seen.add(clean_url)
-                        game_urls.append(clean_url)
+                for match in re.findall(r'["\'](/game/[^"\']+)["\']', script.string):
+                    add(match)
         
         # Method 3: Try popular games page
         try:
@@ -107,15 +104,11 @@ def find_game_urls_from_homepage():
                 for link in popular_soup.find_all('a', href=True):
                     href = link.get('href', '')
                     if '/game/' in href:
-                        full_url = urljoin("https://www.crazygames.com", href)
-                        clean_url = full_url.split('?')[0].split('#')[0].rstrip('/')
-                        if clean_url not in seen:
-                            seen.add(clean_url)
-                            game_urls.append(clean_url)
+                        add(href)
         except:
             pass
         
-        return list(seen)[:100]  # Return up to 100 URLs to try
+        return game_urls[:100]  # Return up to 100 URLs to try
         
     except Exception as e:
         print(f"  ✗ Error fetching homepage: {e}", flush=True)
@@ -438,8 +431,7 @@ def main():
             for link in popular_soup.find_all('a', href=True):
                 href = link.get('href', '')
                 if '/game/' in href:
-                    full_url = urljoin("https://www.crazygames.com", href)
-                    clean_url = full_url.split('?')[0].split('#')[0].rstrip('/')
+                    clean_url = canonicalize_url(href, base="https://www.crazygames.com")
                     if clean_url not in seen_urls:
                         seen_urls.add(clean_url)
                         all_game_urls.append(clean_url)
@@ -455,8 +447,7 @@ def main():
             for link in new_soup.find_all('a', href=True):
                 href = link.get('href', '')
                 if '/game/' in href:
-                    full_url = urljoin("https://www.crazygames.com", href)
-                    clean_url = full_url.split('?')[0].split('#')[0].rstrip('/')
+                    clean_url = canonicalize_url(href, base="https://www.crazygames.com")
                     if clean_url not in seen_urls:
                         seen_urls.add(clean_url)
                         all_game_urls.append(clean_url)
@@ -21,6 +21,8 @@ import time
 import sys
 import os
 
+from verified_download import download as verified_download
+
 # Try to import tqdm for progress bars
 try:
     from tqdm import tqdm
@@ -65,26 +67,20 @@ def sanitize_filename(name):
     return name.strip('-')
 
 def download_file(url, filepath, show_progress=True):
-    """Download a file from URL with progress bar"""
+    """Download a file from URL with progress bar.
+
+    The download is size/hash/content-type checked while streaming and
+    recorded in the game's nova-manifest.json (see verified_download.py).
+    """
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=30)
-        r.raise_for_status()
-        
-        total_size = int(r.headers.get('content-length', 0))
-        
-        if TQDM_AVAILABLE and show_progress and total_size > 0:
-            with open(filepath, 'wb') as f:
-                with tqdm(total=total_size, unit='B', unit_scale=True, desc=f"      Downloading {filepath.name}", leave=False) as pbar:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            pbar.update(len(chunk))
+        if TQDM_AVAILABLE and show_progress:
+            with tqdm(unit='B', unit_scale=True, desc=f"      Downloading {filepath.name}", leave=False) as pbar:
+                def progress(done, total):
+                    pbar.total = total or None
+                    pbar.update(done - pbar.n)
+                verified_download(url, filepath, headers=HEADERS, progress=progress)
         else:
-            with open(filepath, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            verified_download(url, filepath, headers=HEADERS)
         return True
     except Exception as e:
         print(f"      ✗ Error downloading {url}: {e}", flush=True)
@@ -7,12 +7,12 @@ import json
 import os
 import re
 import time
-import ssl
-import urllib.request
 from pathlib import Path
 from urllib.parse import urljoin, urlparse, unquote
 from html.parser import HTMLParser
 
+from http_client import session_for
+
 # d3rtzzzsiu7gdr.cloudfront.net returns 404 - using hypackel.github.io (same Hypackel content)
 BASE_URL = "https://hypackel.github.io/fork/0/g/"
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "Hypackel"
@@ -22,21 +22,19 @@ GAMES_JSON_URL = "https://hypackel.github.io/fork/0/g/games.json"
 def sanitize_dir(name):
     return re.sub(r'[<>:"/\\|?*]', '_', name).strip()
 
-def get_opener():
-    ctx = ssl.create_default_context()
-    return urllib.request.build_opener(urllib.request.HTTPSHandler(context=ctx))
+def get_session():
+    # Pooled keep-alive session: every asset comes from the same GitHub Pages host
+    return session_for(BASE_URL)
 
-def download_file(opener, url, filepath):
+def download_file(session, url, filepath):
     """Download a file from URL to filepath"""
     try:
-        req = urllib.request.Request(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        })
-        with opener.open(req, timeout=60) as resp:
+        with session.get(url, stream=True, timeout=60) as resp:
+            resp.raise_for_status()
             filepath.parent.mkdir(parents=True, exist_ok=True)
             with open(filepath, 'wb') as f:
-                f.write(resp.read())
+                for chunk in resp.iter_content(chunk_size=65536):
+                    f.write(chunk)
         return True
     except Exception as e:
         print(f"  ✗ Failed {url}: {e}")
@@ -96,7 +94,7 @@ def url_to_local_path(url, base_url, dirname):
         return path[len(dirname):].lstrip('/')
     return path
 
-def scrape_game(opener, game_info, games_list):
+def scrape_game(session, game_info, games_list):
     """Scrape a single game's assets"""
     url = game_info.get('url', '')
     name = game_info.get('name', '')
@@ -128,7 +126,7 @@ def scrape_game(opener, game_info, games_list):
     # Download index.html
     index_url = game_base + 'index.html'
     index_path = game_dir / 'index.html'
-    if download_file(opener, index_url, index_path):
+    if download_file(session, index_url, index_path):
         downloaded.add('index.html')
         with open(index_path, 'r', encoding='utf-8', errors='replace') as f:
             html = f.read()
@@ -140,7 +138,7 @@ def scrape_game(opener, game_info, games_list):
             if local_path and not local_path.startswith('../'):
                 fp = game_dir / local_path
                 if fp.suffix or '?' not in asset_url:
-                    if download_file(opener, asset_url, fp):
+                    if download_file(session, asset_url, fp):
                         downloaded.add(local_path)
     else:
         # Try index.htm or default
@@ -149,7 +147,7 @@ def scrape_game(opener, game_info, games_list):
                 alt_url = game_base + alt
             else:
                 alt_url = game_base
-            if download_file(opener, alt_url, index_path):
+            if download_file(session, alt_url, index_path):
                 break
     
     # Determine cover image path for games.json and download
@@ -165,19 +163,19 @@ def scrape_game(opener, game_info, games_list):
         else:
             cover_path = Path(rel_path).name
             img_path = game_dir / rel_path
-        if download_file(opener, img_url, img_path):
+        if download_file(session, img_url, img_path):
             downloaded.add(rel_path)
     elif not image_src.startswith('http'):
         # Local path like "tanuki-sunset.png"
         img_url = urljoin(game_base, image_src)
         img_path = game_dir / image_src
-        if download_file(opener, img_url, img_path):
+        if download_file(session, img_url, img_path):
             cover_path = image_src
             downloaded.add(image_src)
     else:
         # External image - download to game dir
         cover_name = Path(urlparse(image_src).path).name or 'cover.png'
-        if download_file(opener, image_src, game_dir / cover_name):
+        if download_file(session, image_src, game_dir / cover_name):
             cover_path = cover_name
     
     games_list.append({
@@ -196,14 +194,14 @@ def main():
     print()
     
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    opener = get_opener()
+    session = get_session()
     
     # Fetch games list
     print("Fetching games.json...")
     try:
-        req = urllib.request.Request(GAMES_JSON_URL, headers={'User-Agent': 'Mozilla/5.0'})
-        with opener.open(req, timeout=30) as resp:
-            games = json.loads(resp.read().decode())
+        resp = session.get(GAMES_JSON_URL, timeout=30)
+        resp.raise_for_status()
+        games = resp.json()
     except Exception as e:
         print(f"Failed to fetch games: {e}")
         return
@@ -227,7 +225,7 @@ def main():
             skipped += 1
             continue
             
-        result = scrape_game(opener, game, games_for_json)
+        result = scrape_game(session, game, games_for_json)
         if result:
             scraped += 1
             print(f"  [{scraped}] {game['name']} -> {result}")
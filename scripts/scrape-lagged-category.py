@@ -11,6 +11,7 @@ import json
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+from crawl_frontier import canonicalize_url
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -85,14 +86,19 @@ def find_lagged_games(category_url, max_games=20):
         soup = BeautifulSoup(response.text, 'html.parser')
         
         game_links = []
+        seen = set()
+        
+        def add(href):
+            full_url = canonicalize_url(href, base=category_url)
+            if full_url not in seen:
+                seen.add(full_url)
+                game_links.append(full_url)
         
         # Lagged uses /en/g/ for game pages
         for link in soup.find_all('a', href=re.compile(r'/en/g/')):
             href = link.get('href', '')
             if href and '/en/g/' in href:
-                full_url = urljoin(category_url, href)
-                if full_url not in game_links:
-                    game_links.append(full_url)
+                add(href)
         
         # Also check for game thumbnails which link to games
         for thumb in soup.find_all(['div', 'a'], class_=re.compile('thumb|game', re.I)):
@@ -100,11 +106,9 @@ def find_lagged_games(category_url, max_games=20):
             if link:
                 href = link.get('href', '')
                 if '/en/g/' in href:
-                    full_url = urljoin(category_url, href)
-                    if full_url not in game_links:
-                        game_links.append(full_url)
+                    add(href)
         
-        unique_links = list(set(game_links))[:max_games]
+        unique_links = game_links[:max_games]
         print(f"✓ Found {len(unique_links)} game links")
         return unique_links
         
@@ -21,6 +21,8 @@ import time
 import sys
 import os
 
+from verified_download import download as verified_download
+
 # Try to import tqdm for progress bars
 try:
     from tqdm import tqdm
@@ -65,38 +67,28 @@ def sanitize_filename(name):
     return name.strip('-')
 
 def download_file(url, filepath, show_progress=True):
-    """Download a file from URL with progress indicator"""
+    """Download a file from URL with progress indicator.
+
+    The download is size/hash/content-type checked while streaming and
+    recorded in the game's nova-manifest.json (see verified_download.py).
+    """
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        r = requests.get(url, headers=HEADERS, stream=True, timeout=30)
-        r.raise_for_status()
-        
-        total_size = int(r.headers.get('content-length', 0))
-        downloaded = 0
         filename = filepath.name
-        
-        if TQDM_AVAILABLE and show_progress and total_size > 0:
+        if TQDM_AVAILABLE and show_progress:
             # Use tqdm for progress bar
-            with open(filepath, 'wb') as f:
-                with tqdm(total=total_size, unit='B', unit_scale=True, unit_divisor=1024, desc=f"      {filename[:40]:<40}", leave=False) as pbar:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            pbar.update(len(chunk))
+            with tqdm(unit='B', unit_scale=True, unit_divisor=1024, desc=f"      {filename[:40]:<40}", leave=False) as pbar:
+                def progress(done, total):
+                    pbar.total = total or None
+                    pbar.update(done - pbar.n)
+                verified_download(url, filepath, headers=HEADERS, progress=progress)
         else:
             # Simple progress without tqdm
-            with open(filepath, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if show_progress and total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            print(f"\r      {filename[:40]:<40} {percent:.1f}%", end='', flush=True)
-        
-        if show_progress and not TQDM_AVAILABLE and total_size > 0:
-            print()  # New line after progress
+            def progress(done, total):
+                if show_progress and total > 0:
+                    print(f"\r      {filename[:40]:<40} {done / total * 100:.1f}%", end='', flush=True)
+            result = verified_download(url, filepath, headers=HEADERS, progress=progress)
+            if show_progress and result['status'] == 'downloaded':
+                print()  # New line after progress
         
         return True
     except Exception as e:
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Neutralize ad/portal SDKs (Yandex, Poki, CrazyGames, GameMonetize, GameDistribution)
+in mirrored games.
+
+All vendor rules are compiled into one alternation regex, so each file is
+scanned once no matter how many rules there are (remove-yandex-sdk.py runs a
+dozen DOTALL regexes one after another). A matched SDK <script src> tag is
+replaced in place by a small stub that fakes the vendor API, so the game
+keeps its call order but never touches the SDK's network endpoints. SDK URLs
+inside inline loaders are swapped for an empty data: script, with the stub
+injected at the top of <head> (or, in a .js file, at the top of the file).
+
+Usage:
+    python scripts/sdk_stripper.py scan
+    python scripts/sdk_stripper.py strip --dry-run --diff
+    python scripts/sdk_stripper.py strip --vendor poki --vendor crazygames --only some-game
+    python scripts/for_each_game.py sdk_stripper:neutralize_sdks --glob "*.html" --glob "*.js"
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import for_each_game
+
+# Vendor URL fragments (regex, no capturing groups). Only the real vendor
+# endpoints are listed; already-patched local copies like patch/poki-sdk.js
+# are left alone.
+VENDOR_URLS = {
+    'yandex': [
+        r'yandex\.ru/games/sdk/v2',
+        r'sdk\.games\.s3\.yandex\.net/sdk\.js',
+    ],
+    'poki': [
+        r'game-cdn\.poki\.com/scripts/v2/poki-sdk(?:-core)?[\w.\-]*\.js',
+    ],
+    'crazygames': [
+        r'sdk\.crazygames\.com/crazygames-(?:gameframe-)?sdk-v\d[\w.\-]*\.js',
+    ],
+    'gamemonetize': [
+        r'(?:html5\.)?api\.gamemonetize\.com/sdk\.js',
+    ],
+    'gamedistribution': [
+        r'html5\.api\.gamedistribution\.com/(?:main\.min|libs/gd/api)\.js',
+    ],
+}
+
+# Cheap substring checks; files containing none of these skip the regex entirely
+VENDOR_MARKERS = {
+    'yandex': ('yandex',),
+    'poki': ('poki.com',),
+    'crazygames': ('crazygames.com',),
+    'gamemonetize': ('gamemonetize.com',),
+    'gamedistribution': ('gamedistribution.com',),
+}
+
+# Extra one-off rules: (vendor, pattern, kind)
+EXTRA_RULES = [
+    # playhop/Yandex builds that ship the SDK as a local sdk.js (see remove-yandex-sdk.py)
+    ('yandex', r'<!--\s*Yandex Games SDK\s*-->\s*<script\s+src=["\']sdk\.js["\']\s*>\s*</script>', 'tag'),
+]
+
+# Returns a Proxy so any SDK method we didn't stub resolves instead of throwing
+STUB_PRELUDE = (
+    "window.__novaStub=window.__novaStub||function(o){return new Proxy(o,{get:function(t,k){"
+    "if(k in t||k==='then'||typeof k==='symbol')return t[k];"
+    "return function(){return Promise.resolve()}}})};"
+)
+
+STUBS = {
+    'yandex': (
+        "window.YaGames=window.YaGames||{init:function(){var p=function(v){return Promise.resolve(v)};"
+        "var player=__novaStub({getMode:function(){return'lite'},getName:function(){return''},"
+        "getUniqueID:function(){return'local'},getData:function(){return p(JSON.parse(localStorage.getItem('ysdk-data')||'{}'))},"
+        "setData:function(d){localStorage.setItem('ysdk-data',JSON.stringify(d||{}));return p()},"
+        "getStats:function(){return p({})},setStats:function(){return p()}});"
+        "return p(__novaStub({environment:{i18n:{lang:'en',tld:'com'},app:{id:'0'},payload:''},"
+        "deviceInfo:__novaStub({type:'desktop',isMobile:function(){return false},isDesktop:function(){return true}}),"
+        "features:{LoadingAPI:{ready:function(){}},GameplayAPI:{start:function(){},stop:function(){}}},"
+        "adv:__novaStub({showFullscreenAdv:function(o){var c=o&&o.callbacks||{};c.onClose&&c.onClose(false)},"
+        "showRewardedVideo:function(o){var c=o&&o.callbacks||{};c.onOpen&&c.onOpen();c.onRewarded&&c.onRewarded();c.onClose&&c.onClose()}}),"
+        "getPlayer:function(){return p(player)},getPayments:function(){return Promise.reject(new Error('payments disabled'))},"
+        "getLeaderboards:function(){return p(__novaStub({}))},getFlags:function(){return p({})},"
+        "feedback:{canReview:function(){return p({value:false})},requestReview:function(){return p({feedbackSent:false})}},"
+        "on:function(){},off:function(){},dispatchEvent:function(){}}))}};"
+    ),
+    'poki': (
+        "window.PokiSDK=window.PokiSDK||__novaStub({init:function(){return Promise.resolve()},"
+        "gameLoadingFinished:function(){},gameplayStart:function(){},gameplayStop:function(){},"
+        "commercialBreak:function(cb){cb&&cb();return Promise.resolve()},"
+        "rewardedBreak:function(cb){cb&&cb();return Promise.resolve(true)},"
+        "setDebug:function(){},isAdBlocked:function(){return false},getURLParam:function(){return''},"
+        "shareableURL:function(){return Promise.resolve(location.href)}});"
+    ),
+    'crazygames': (
+        "(function(){var p=function(v){return Promise.resolve(v)};"
+        "var ad=__novaStub({requestAd:function(t,cb){cb=cb||{};cb.adStarted&&cb.adStarted();cb.adFinished&&cb.adFinished();return p()},"
+        "hasAdblock:function(){return p(false)}});"
+        "var sdk=__novaStub({environment:'disabled',init:function(){return p()},ad:ad,"
+        "game:__novaStub({gameplayStart:function(){},gameplayStop:function(){},happytime:function(){},loadingStart:function(){},loadingStop:function(){}}),"
+        "user:__novaStub({isUserAccountAvailable:false,getUser:function(){return p(null)},getUserToken:function(){return p(null)}}),"
+        "data:{getItem:function(k){return localStorage.getItem(k)},setItem:function(k,v){localStorage.setItem(k,v)},"
+        "removeItem:function(k){localStorage.removeItem(k)},clear:function(){}}});"
+        "var legacy=__novaStub({init:function(){return p()},addEventListener:function(){},removeEventListener:function(){},"
+        "requestAd:function(){},hasAdblock:function(){return p(false)},gameplayStart:function(){},gameplayStop:function(){},happytime:function(){}});"
+        "window.CrazyGames=window.CrazyGames||{};window.CrazyGames.SDK=window.CrazyGames.SDK||sdk;"
+        "window.CrazyGames.CrazySDK=window.CrazyGames.CrazySDK||{getInstance:function(){return legacy}};"
+        "window.CrazySDK=window.CrazySDK||legacy})();"
+    ),
+    'gamemonetize': (
+        "(function(){var fire=function(n){try{var o=window.SDK_OPTIONS;o&&o.onEvent&&o.onEvent({name:n})}catch(e){}};"
+        "window.sdk=window.sdk||__novaStub({showBanner:function(){fire('SDK_GAME_PAUSE');setTimeout(function(){fire('SDK_GAME_START')},0)},play:function(){}});"
+        "document.addEventListener('DOMContentLoaded',function(){fire('SDK_READY')})})();"
+    ),
+    'gamedistribution': (
+        "(function(){var fire=function(n){try{var o=window.GD_OPTIONS;o&&o.onEvent&&o.onEvent({name:n})}catch(e){}};"
+        "window.gdsdk=window.gdsdk||__novaStub({AdType:{Rewarded:'rewarded',Interstitial:'interstitial',Display:'display'},"
+        "showAd:function(){fire('SDK_GAME_PAUSE');fire('SDK_GAME_START');return Promise.resolve()},"
+        "preloadAd:function(){return Promise.resolve()}});"
+        "document.addEventListener('DOMContentLoaded',function(){fire('SDK_READY')})})();"
+    ),
+}
+
+STUB_MARKER = 'data-nova-sdk-stub'
+EMPTY_SCRIPT = 'data:text/javascript,'
+
+
+def stub_tag(vendor):
+    # Each stub carries the (idempotent) prelude so stubs work in any order
+    return f'<script {STUB_MARKER}="{vendor}">{STUB_PRELUDE}{STUBS[vendor]}</script>'
+
+
+def stub_js(vendor):
+    """The same stub as plain JS, for the top of a .js file (the comment keeps reruns idempotent)"""
+    return f'/* {STUB_MARKER}="{vendor}" */{STUB_PRELUDE}{STUBS[vendor]}\n'
+
+
+class RuleSet:
+    """All rules for the selected vendors compiled into one scanning regex"""
+
+    def __init__(self, vendors=None):
+        self.vendors = tuple(vendors or VENDOR_URLS)
+        self.rules = []  # (vendor, kind) indexed by group number
+        parts = []
+        for vendor in self.vendors:
+            urls = '|'.join(VENDOR_URLS[vendor])
+            # Whole <script src=...></script> tag
+            parts.append((vendor, 'tag',
+                          rf'<script\b[^>]*\bsrc\s*=\s*["\'][^"\'>]*(?:{urls})[^"\'>]*["\'][^>]*>\s*</script>'))
+            # URL string literal used by an inline loader
+            parts.append((vendor, 'url', rf'(?<=["\'])(?:https?:)?//(?:{urls})[^"\'\s]*(?=["\'])'))
+        for vendor, pattern, kind in EXTRA_RULES:
+            if vendor in self.vendors:
+                parts.append((vendor, kind, pattern))
+        for i, (vendor, kind, pattern) in enumerate(parts):
+            self.rules.append((vendor, kind))
+            parts[i] = f'(?P<r{i}>{pattern})'
+        self.regex = re.compile('|'.join(parts), re.IGNORECASE)
+        self.markers = [m for v in self.vendors for m in VENDOR_MARKERS[v]]
+
+    def apply(self, text, is_html=True):
+        """Return (new_text, Counter of vendor hits)"""
+        lowered = text.lower()
+        if not any(m in lowered for m in self.markers):
+            return text, Counter()
+
+        hits = Counter()
+        emitted = set(re.findall(rf'{STUB_MARKER}="(\w+)"', text))
+        need_head = []
+
+        def replace(match):
+            vendor, kind = self.rules[int(match.lastgroup[1:])]
+            hits[vendor] += 1
+            if not is_html:
+                # A .js file has no <head>: its stubs go at the top of the file
+                if vendor not in emitted:
+                    emitted.add(vendor)
+                    need_head.append(vendor)
+                return EMPTY_SCRIPT if kind == 'url' else ''
+            if kind == 'url':
+                if vendor not in emitted:
+                    emitted.add(vendor)
+                    need_head.append(vendor)
+                return EMPTY_SCRIPT
+            if vendor in emitted:
+                return ''
+            emitted.add(vendor)
+            return stub_tag(vendor)
+
+        new_text = self.regex.sub(replace, text)
+        if need_head and not is_html:
+            new_text = ''.join(stub_js(v) for v in need_head) + new_text
+        elif need_head:
+            stubs = ''.join(stub_tag(v) for v in need_head)
+            head = re.search(r'<head\b[^>]*>', new_text, re.IGNORECASE)
+            if head:
+                new_text = new_text[:head.end()] + stubs + new_text[head.end():]
+            else:
+                new_text = stubs + new_text
+        return new_text, hits
+
+
+_rulesets = {}
+
+
+def get_ruleset():
+    """RuleSet for the vendors in $NOVA_SDK_VENDORS (all by default), cached per process"""
+    key = os.environ.get('NOVA_SDK_VENDORS', '')
+    if key not in _rulesets:
+        _rulesets[key] = RuleSet([v for v in key.split(',') if v] or None)
+    return _rulesets[key]
+
+
+def neutralize_sdks(path, text):
+    """for_each_game.py transform: strip SDK loads and inject stubs"""
+    is_html = Path(path).suffix.lower() in ('.html', '.htm')
+    return get_ruleset().apply(text, is_html)[0]
+
+
+def cmd_scan(args):
+    """Count SDK references per vendor across the catalog (single process, read-only)"""
+    ruleset = RuleSet(args.vendor)
+    totals = Counter()
+    games = Counter()
+    started = time.time()
+    for game in for_each_game.iter_games():
+        game_hits = Counter()
+        for path in game.files(args.glob or ['*.html']):
+            try:
+                text = path.read_text(encoding='utf-8')
+            except UnicodeDecodeError:
+                continue
+            _, hits = ruleset.apply(text, path.suffix.lower() in ('.html', '.htm'))
+            game_hits.update(hits)
+        if game_hits:
+            print(f"  {game.name}: {', '.join(f'{v} ×{n}' for v, n in game_hits.items())}")
+            totals.update(game_hits)
+            games.update(game_hits.keys())
+    print(f"\nScanned in {time.time() - started:.2f}s")
+    for vendor in ruleset.vendors:
+        print(f"  {vendor:<17} {totals[vendor]:>4} references in {games[vendor]} games")
+
+
+def cmd_strip(args):
+    if args.vendor:
+        os.environ['NOVA_SDK_VENDORS'] = ','.join(args.vendor)
+    started = time.time()
+    results = for_each_game.run('sdk_stripper:neutralize_sdks', args.glob or ['*.html'], args.only,
+                                args.dry_run, want_diff=args.diff, workers=args.workers)
+    for_each_game.print_summary(results, args.dry_run, args.diff)
+    print(f"Done in {time.time() - started:.2f}s")
+    if any(r['error'] for r in results):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strip ad/portal SDKs from mirrored games and inject stubs')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('scan', 'Report SDK references without changing files'),
+                            ('strip', 'Replace SDK loads with stubs')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('--vendor', action='append', choices=list(VENDOR_URLS), help='Only this vendor (repeatable)')
+        p.add_argument('--glob', action='append', help='File pattern (repeatable; default: *.html)')
+        if name == 'strip':
+            p.add_argument('--only', action='append', help='Only this game (repeatable)')
+            p.add_argument('--dry-run', action='store_true', help="Don't write files")
+            p.add_argument('--diff', action='store_true', help='Print unified diffs')
+            p.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+    cmd_scan(args) if args.command == 'scan' else cmd_strip(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Build the prebuilt search index used by js/search.js.
+
+js/search.js used to read every card's <h1> text and upper-case it on each
+keystroke. This writes data/search-index.json instead: the games' directory
+ids (in catalog order) and a sorted list of search tokens, each with the
+games it belongs to. Tokens are the words of each game's name, directory,
+spaceless name, initials and any aliases/categories/tags fields. Each query
+word is looked up by binary search as a token prefix ("slo" -> slope,
+slope3, ...), so the cost follows the matches, not the catalog size; when
+nothing starts with a word, tokens containing it are used instead, so
+mid-word searches still find something.
+
+Normalization must stay identical to normalize() in js/search.js: NFKD, drop
+combining marks, lower-case, runs of anything but [a-z0-9] become one space.
+Postings are delta-encoded base-36 numbers joined by '.'.
+
+The index records catalog_hash() of the games.json it was built from, as
+does data/catalog.json (scripts/catalog_shards.py). js/search.js only uses
+the index when the two match, so a games.json edit that keeps the count
+(a rename, a retag) can't search a stale index; it scans the cards
+instead. scripts/pages-build.js regenerates both.
+
+Usage:
+    python scripts/search_index.py
+    python scripts/search_index.py --check     # Exit 1 if the index is stale
+    python scripts/search_index.py --query "slope"
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+
+from novahub_config import DATA_DIR, GAMES_JSON_PATH, catalog_hash, load_games
+
+INDEX_PATH = DATA_DIR / "search-index.json"
+INDEX_VERSION = 2
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return NON_ALNUM_RE.sub(' ', text.lower()).strip()
+
+
+def aliases(game):
+    """Normalized strings a game should be found by"""
+    name = normalize(game.get('name'))
+    words = name.split()
+    found = [name, normalize(game.get('directory', '').replace('-', ' ').replace('_', ' ')), name.replace(' ', '')]
+    if len(words) >= 3:
+        found.append(''.join(w[0] for w in words))
+    for field in ('aliases', 'categories', 'tags'):
+        found.extend(normalize(value) for value in game.get(field) or [])
+    return list(dict.fromkeys(a for a in found if a))
+
+
+def to_base36(n):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    out = ''
+    while True:
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+        if not n:
+            return out
+
+
+def encode_postings(doc_ids):
+    previous, parts = 0, []
+    for doc in doc_ids:
+        parts.append(to_base36(doc - previous))
+        previous = doc
+    return '.'.join(parts)
+
+
+def decode_postings(encoded):
+    docs, current = [], 0
+    for part in encoded.split('.'):
+        current += int(part, 36)
+        docs.append(current)
+    return docs
+
+
+def build_index(games):
+    postings = defaultdict(set)
+    for doc, game in enumerate(games):
+        for alias in aliases(game):
+            for token in alias.split():
+                postings[token].add(doc)
+    tokens = sorted(postings)
+    return {
+        'v': INDEX_VERSION,
+        'count': len(games),
+        'catalog': catalog_hash(games),
+        'ids': [game.get('directory', '') for game in games],
+        'tokens': tokens,
+        'docs': [encode_postings(sorted(postings[token])) for token in tokens],
+    }
+
+
+def word_docs(index, word):
+    """Games with a token starting with word, else with a token containing it"""
+    tokens = index['tokens']
+    # Tokens are [a-z0-9]; '{' sorts after all of them
+    lo, hi = bisect.bisect_left(tokens, word), bisect.bisect_left(tokens, word + '{')
+    positions = range(lo, hi) if lo < hi else [i for i, t in enumerate(tokens) if word in t]
+    docs = set()
+    for i in positions:
+        docs.update(decode_postings(index['docs'][i]))
+    return docs
+
+
+def search(index, query):
+    """Directory ids matching query, the way js/search.js does it"""
+    words = normalize(query).split()
+    if not words:
+        return list(index['ids'])
+    matched = None
+    for word in sorted(set(words), key=len, reverse=True):
+        docs = word_docs(index, word)
+        matched = docs if matched is None else matched & docs
+        if not matched:
+            return []
+    return [index['ids'][doc] for doc in sorted(matched)]
+
+
+def serialize(index):
+    return json.dumps(index, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build data/search-index.json from games.json')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help='Path to games.json')
+    parser.add_argument('--output', default=str(INDEX_PATH), help='Where to write the index')
+    parser.add_argument('--check', action='store_true', help="Don't write; exit 1 if the index is out of date")
+    parser.add_argument('--query', help='Search the freshly built index and print the matches')
+    args = parser.parse_args()
+
+    index = build_index(load_games(args.games_json))
+    text = serialize(index)
+
+    if args.query is not None:
+        matches = search(index, args.query)
+        for directory in matches:
+            print(f"  {directory}")
+        print(f"\n{len(matches)} matches for '{args.query}'")
+        return
+
+    try:
+        with open(args.output, 'r', encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if args.check:
+        if current != text:
+            print(f"✗ {args.output} is out of date; run scripts/search_index.py")
+            sys.exit(1)
+        print(f"✓ {args.output} is up to date")
+        return
+    if current == text:
+        print(f"= {args.output} unchanged ({len(text.encode('utf-8')):,} bytes)")
+        return
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, args.output)
+    print(f"✓ Wrote {args.output}: {index['count']} games, {len(index['tokens'])} tokens, "
+          f"{len(text.encode('utf-8')):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,28 @@
 """
 Download and set up Lagged games locally
 Reads from lagged-games-list.json and sets up games in non-semag directory
+Progress is kept in the job queue, so re-running resumes an interrupted setup
 """
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import re
 import json
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import http_client
+from job_queue import JobQueue, run_workers
+from novahub_config import save_games
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
 }
+QUEUE_NAME = 'lagged-setup'
 
 def download_file(url, filepath):
     """Download a file from URL"""
     try:
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=30)
+        response = http_client.get(url, headers=HEADERS, stream=True, timeout=30)
         response.raise_for_status()
         
         with open(filepath, 'wb') as f:
@@ -49,7 +52,7 @@ def setup_lagged_game(game_data, non_semag_dir):
     # Try to get the play URL if we have it
     if not play_url and game_url:
         try:
-            response = requests.get(game_url, headers=HEADERS, timeout=30)
+            response = http_client.get(game_url, headers=HEADERS, timeout=30)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Look for game iframe or play button
@@ -73,7 +76,7 @@ def setup_lagged_game(game_data, non_semag_dir):
     # If we have a play URL, fetch the game page
     if play_url:
         try:
-            response = requests.get(play_url, headers=HEADERS, timeout=30)
+            response = http_client.get(play_url, headers=HEADERS, timeout=30)
             response.raise_for_status()
             game_html = response.text
             soup = BeautifulSoup(game_html, 'html.parser')
@@ -108,7 +111,7 @@ def setup_lagged_game(game_data, non_semag_dir):
     
     # Try to get a cover image
     try:
-        response = requests.get(game_url, headers=HEADERS, timeout=30)
+        response = http_client.get(game_url, headers=HEADERS, timeout=30)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Look for og:image or game thumbnail
@@ -272,9 +275,9 @@ def add_to_games_json(games_data, games_json_path):
             existing_games.append(new_game)
             added_count += 1
         
-        # Save updated games.json
-        with open(games_json_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_games, f, indent='\t', ensure_ascii=False)
+        # Results from earlier runs are already in games.json; leave it untouched if nothing is new
+        if added_count:
+            save_games(existing_games, games_json_path)
         
         print(f"\n✅ Added {added_count} games to games.json")
         return added_count
@@ -307,23 +310,23 @@ def main():
     
     print(f"📋 Setting up {len(successful_games)} games...\n")
     
-    # Set up games
-    results = []
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        futures = {
-            executor.submit(setup_lagged_game, game, non_semag_dir): game 
-            for game in successful_games
-        }
-        
-        for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
-            if result.get('status') == 'success':
-                print(f"  ✓ {result['slug']}")
+    # Set up games (already-finished slugs from an earlier run are skipped)
+    queue = JobQueue()
+    queue.enqueue_many(QUEUE_NAME, [(game['slug'], game) for game in successful_games if game.get('slug')])
+    
+    def handle(job):
+        result = setup_lagged_game(job.payload, non_semag_dir)
+        if result.get('status') != 'success':
+            raise RuntimeError(result.get('error', 'setup failed'))
+        print(f"  ✓ {result['slug']}")
+        return result
+    
+    run_workers(queue, QUEUE_NAME, handle, workers=3)
+    results = [result for _, result in queue.results(QUEUE_NAME)]
     
-    # Add to games.json
+    # Add to games.json, unless another process is still working the queue (it writes when done)
     successful = [r for r in results if r.get('status') == 'success']
-    if successful:
+    if successful and queue.remaining(QUEUE_NAME) == 0:
         add_to_games_json(successful, games_json_path)
     
     print(f"\n✅ Complete! Set up {len(successful)}/{len(successful_games)} games locally")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Precompute the "similar games" shown under a game in loader.html.
+
+loader.html used to pick three random games. This builds a TF-IDF vector per
+games.json entry from its name, directory, categories, tags and description
+(category and tag terms weighted up), takes cosine similarities with NumPy,
+and keeps the top --k neighbours of every game. With --images, cover art is
+blended in: each local cover becomes a small colour-layout embedding (8x8
+RGB thumbnail, mean-centred) and its cosine similarity is mixed in with
+--image-weight, for pairs where both covers exist locally.
+
+data/similar.json is compact: "ids" lists the directories and
+"neighbors"[i] holds indexes into it, best first. Games with nothing in
+common with anything get an empty list; loader.html fills up with random
+picks as before.
+
+Usage:
+    python scripts/similar_games.py
+    python scripts/similar_games.py --images --image-weight 0.25
+    python scripts/similar_games.py --show slope
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from novahub_config import DATA_DIR, GAMES_JSON_PATH, ROOT_DIR, load_games
+from search_index import normalize
+
+# Try to import Pillow for cover embeddings
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+OUTPUT_PATH = DATA_DIR / "similar.json"
+OUTPUT_VERSION = 1
+TOP_K = 8
+# Pairs below this similarity aren't worth recommending
+MIN_SIMILARITY = 0.05
+IMAGE_WEIGHT = 0.2
+THUMB_SIZE = 8
+# Term weights by field; categories/tags say more about a game than a title word
+FIELD_WEIGHTS = {'name': 1.0, 'category': 1.5, 'tag': 1.0, 'description': 0.5}
+# Words that say nothing about the game itself
+STOPWORDS = {'the', 'a', 'an', 'of', 'and', 'to', 'in', 'on', 'at', 'vs', 'game', 'games', 'online',
+             'unblocked', 'free', 'play', 'new', 'remastered', 'classic', 'edition', 'lite', 'html5'}
+DIGITS_RE = re.compile(r'^\d+$')
+
+
+def terms(game):
+    """Weighted term counts for one game: {term: weight}"""
+    counts = Counter()
+
+    def add(text, field):
+        for word in normalize(text).split():
+            if word not in STOPWORDS and not DIGITS_RE.match(word) and len(word) > 1:
+                counts[word] += FIELD_WEIGHTS[field]
+
+    add(f"{game.get('name', '')} {game.get('directory', '').replace('-', ' ').replace('_', ' ')}", 'name')
+    # Categories get their own namespace so "Racing" the category and "racing" in a title stay distinct
+    for category in game.get('categories') or []:
+        counts['cat:' + normalize(category)] += FIELD_WEIGHTS['category']
+    for tag in game.get('tags') or []:
+        add(tag, 'tag')
+    add(game.get('description', ''), 'description')
+    return counts
+
+
+def tfidf_matrix(games):
+    """-> L2-normalized (games x vocabulary) float32 matrix"""
+    docs = [terms(game) for game in games]
+    vocabulary = {term: i for i, term in enumerate(sorted({t for doc in docs for t in doc}))}
+    df = np.zeros(len(vocabulary), dtype=np.float32)
+    for doc in docs:
+        for term in doc:
+            df[vocabulary[term]] += 1
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    matrix = np.zeros((len(docs), len(vocabulary)), dtype=np.float32)
+    for row, doc in enumerate(docs):
+        for term, weight in doc.items():
+            # Sublinear tf: a word repeated in name and directory shouldn't count double
+            matrix[row, vocabulary[term]] = (1 + math.log(weight)) if weight >= 1 else weight
+    matrix *= idf
+    return normalize_rows(matrix)
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def cover_path(game):
+    image_path = game.get('imagePath') or ''
+    if image_path.startswith('/'):
+        path = ROOT_DIR / image_path.lstrip('/')
+        if path.is_file():
+            return path
+    return None
+
+
+def cover_embeddings(games):
+    """-> (L2-normalized embedding matrix, bool mask of games with a local cover)"""
+    embeddings = np.zeros((len(games), THUMB_SIZE * THUMB_SIZE * 3), dtype=np.float32)
+    present = np.zeros(len(games), dtype=bool)
+    for i, game in enumerate(games):
+        path = cover_path(game)
+        if not path:
+            continue
+        try:
+            with Image.open(path) as image:
+                thumb = image.convert('RGBA').convert('RGB').resize((THUMB_SIZE, THUMB_SIZE), Image.BILINEAR)
+        except (OSError, ValueError):
+            continue
+        vector = np.asarray(thumb, dtype=np.float32).ravel() / 255.0
+        embeddings[i] = vector - vector.mean()
+        present[i] = True
+    return normalize_rows(embeddings), present
+
+
+def top_neighbors(matrix, k=TOP_K, min_similarity=MIN_SIMILARITY, image=None, image_weight=IMAGE_WEIGHT,
+                  block=256):
+    """[[neighbour index, ...] best first] per row, computed block by block to bound memory"""
+    neighbors = []
+    n = matrix.shape[0]
+    for start in range(0, n, block):
+        scores = matrix[start:start + block] @ matrix.T
+        if image is not None:
+            embeddings, present = image
+            visual = embeddings[start:start + block] @ embeddings.T
+            both = present[start:start + block, None] & present[None, :]
+            scores = np.where(both, (1 - image_weight) * scores + image_weight * visual, scores)
+        for offset in range(scores.shape[0]):
+            scores[offset, start + offset] = -1  # Not similar to itself
+        count = min(k, n - 1)
+        if count <= 0:
+            neighbors.extend([] for _ in range(scores.shape[0]))
+            continue
+        best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+        for offset, candidates in enumerate(best):
+            row = scores[offset]
+            # Ties broken by catalog order so reruns are stable
+            ranked = sorted(candidates, key=lambda j: (-row[j], j))
+            neighbors.append([int(j) for j in ranked if row[j] >= min_similarity])
+    return neighbors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute similar games for loader.html')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help='Path to games.json')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='Where to write the neighbour table')
+    parser.add_argument('--k', type=int, default=TOP_K, help=f'Neighbours per game (default {TOP_K})')
+    parser.add_argument('--min-similarity', type=float, default=MIN_SIMILARITY,
+                        help=f'Drop neighbours below this cosine similarity (default {MIN_SIMILARITY})')
+    parser.add_argument('--images', action='store_true', help='Blend in cover-image similarity (needs Pillow)')
+    parser.add_argument('--image-weight', type=float, default=IMAGE_WEIGHT,
+                        help=f'Share of the score from covers when --images is on (default {IMAGE_WEIGHT})')
+    parser.add_argument('--show', metavar='DIRECTORY', help="Print one game's neighbours instead of writing")
+    args = parser.parse_args()
+
+    start = time.time()
+    games = load_games(args.games_json)
+    image = None
+    if args.images:
+        if not PIL_AVAILABLE:
+            print("❌ --images needs Pillow. Install with: pip install pillow")
+            sys.exit(1)
+        image = cover_embeddings(games)
+        print(f"  {int(image[1].sum())}/{len(games)} local covers embedded")
+    neighbors = top_neighbors(tfidf_matrix(games), args.k, args.min_similarity, image, args.image_weight)
+    ids = [game.get('directory', '') for game in games]
+
+    if args.show:
+        if args.show not in ids:
+            print(f"✗ No game with directory '{args.show}'")
+            sys.exit(1)
+        for j in neighbors[ids.index(args.show)]:
+            print(f"  {games[j].get('name')} ({ids[j]})")
+        return
+
+    table = {'v': OUTPUT_VERSION, 'k': args.k, 'ids': ids, 'neighbors': neighbors}
+    text = json.dumps(table, separators=(',', ':'), ensure_ascii=False) + '\n'
+    tmp_path = args.output + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, args.output)
+    empty = sum(1 for row in neighbors if not row)
+    print(f"✓ Wrote {args.output}: {len(ids)} games, {empty} without neighbours, "
+          f"{len(text.encode('utf-8')):,} bytes in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
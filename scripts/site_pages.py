@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Generate the sitemap, per-game landing pages and feeds from games.json.
+
+sitemap.xml used to list only the static pages, so none of the games were
+findable by crawlers. This writes, into the repo (pages-build.js copies them
+like everything else):
+
+    sitemap.xml              sitemap index
+    sitemaps/pages.xml       the site's static pages
+    sitemaps/games-N.xml     one <url> per game landing page, 50,000 per file
+    play/<directory>.html    a small static page per game: title, cover,
+                             description, structured data, a Play link into
+                             loader.html and links to similar games
+    feed.xml, feed.json      RSS 2.0 / JSON Feed of the newest games
+
+Every file is streamed to a temporary file while its sha256 is computed and
+only replaces the existing one when the hash differs, so a re-run after a
+one-game change rewrites that game's page, one sitemap file and the feeds,
+and nothing is held in memory but one entry at a time. Pages of games that
+left the catalog are deleted.
+
+Usage:
+    python scripts/site_pages.py
+    python scripts/site_pages.py --site-url https://example.pages.dev
+    python scripts/site_pages.py --dry-run
+"""
+import argparse
+import base64
+import hashlib
+import html
+import json
+import os
+import time
+from pathlib import Path
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from novahub_config import DATA_DIR, GAMES_JSON_PATH, ROOT_DIR, load_games
+
+SITE_URL = os.environ.get('SITE_URL', 'https://nova-labs.pages.dev')
+SITEMAP_PATH = ROOT_DIR / "sitemap.xml"
+SITEMAPS_DIR = ROOT_DIR / "sitemaps"
+PLAY_DIR = ROOT_DIR / "play"
+FEED_PATH = ROOT_DIR / "feed.xml"
+JSON_FEED_PATH = ROOT_DIR / "feed.json"
+SIMILAR_PATH = DATA_DIR / "similar.json"
+# Sitemap protocol limit per file
+SITEMAP_LIMIT = 50000
+FEED_SIZE = 50
+SIMILAR_LINKS = 6
+CHUNK_SIZE = 64 * 1024
+
+# (path, changefreq, priority); '' is the site root
+PAGES = [
+    ('', 'weekly', '1.0'), ('index.html', 'weekly', '1.0'),
+    ('projects.html', 'weekly', '0.9'), ('games-list.html', 'weekly', '0.9'),
+    ('starred-games.html', 'weekly', '0.7'), ('loader.html', 'weekly', '0.7'),
+    ('about.html', 'monthly', '0.7'), ('apps.html', 'weekly', '0.7'),
+    ('settings.html', 'monthly', '0.7'), ('suggest.html', 'monthly', '0.7'),
+    ('support.html', 'monthly', '0.7'), ('contact.html', 'monthly', '0.7'),
+    ('privacy-policy.html', 'yearly', '0.7'), ('terms-of-service.html', 'yearly', '0.7'),
+    ('cookie-policy.html', 'yearly', '0.7'), ('ad.html', 'monthly', '0.7'),
+    ('blank.html', 'monthly', '0.7'), ('other.html', 'monthly', '0.7'),
+    ('admin/git-scanner.html', 'monthly', '0.7'), ('admin/deployer.html', 'monthly', '0.7'),
+    ('admin/git-fetcher.html', 'monthly', '0.7'), ('tools/backgrounds.html', 'monthly', '0.7'),
+    ('tools/dev-tools.html', 'monthly', '0.7'),
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html class="sl-theme-dark" lang="en">
+  <head>
+    <meta charset="UTF-8">
+    <title>{title} | Nova Hub</title>
+    <meta name="description" content="{description}" />
+    <meta name="viewport" content="width=device-width,initial-scale=1" />
+    <link rel="canonical" href="{url}" />
+    <meta property="og:type" content="website" />
+    <meta property="og:title" content="{title}" />
+    <meta property="og:description" content="{description}" />
+    <meta property="og:image" content="{image}" />
+    <meta property="og:url" content="{url}" />
+    <link rel="icon" href="/nova-favicon.ico" />
+    <link rel="stylesheet" href="/style.css" />
+    <link rel="stylesheet" href="/css/gaming-theme.css" />
+    <script src="/js/all.min.js"></script>
+    <script type="application/ld+json">{ld_json}</script>
+  </head>
+  <body>
+    <main class="game-landing">
+      <img src="{image_src}" alt="{title} logo" width="160" height="160" />
+      <h1>{title}</h1>
+      <p>{description}</p>
+      <p><a class="play-button" href="{play}">Play {title}</a></p>
+{similar}      <p><a href="/games-list.html">All games</a></p>
+    </main>
+  </body>
+</html>
+"""
+
+
+def encode_uri_component(text):
+    """JavaScript's encodeURIComponent"""
+    return quote(text, safe="-_.!~*'()")
+
+
+def loader_link(game):
+    """The loader.html#... link redirectGame() in js/games.js builds"""
+    source = game.get('source') or 'semag'
+    # loader.html reads gameUrl/imagePath from the game object in slot 5 (non-semag games have no index.html)
+    extra = {field: game[field] for field in ('gameUrl', 'imagePath') if game.get(field)}
+    data = [game.get('directory'), game.get('image'), game.get('name'), source, extra]
+    payload = encode_uri_component(json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+    return "/loader.html#" + base64.b64encode(payload.encode('ascii')).decode('ascii')
+
+
+def image_path(game):
+    if game.get('imagePath'):
+        return game['imagePath']
+    source = game.get('source') or 'semag'
+    return f"/{source}/{game.get('directory')}/{game.get('image')}"
+
+
+def page_url(site_url, game):
+    return f"{site_url}/play/{quote(game.get('directory', ''))}.html"
+
+
+def description(game):
+    if game.get('description'):
+        return game['description']
+    categories = ', '.join(game.get('categories') or [])
+    kind = f"{categories.lower()} game" if categories else "game"
+    return f"Play {game.get('name')}, a free unblocked {kind}, in your browser on Nova Hub."
+
+
+def game_page(site_url, game, similar):
+    title = game.get('name', '')
+    image_src = image_path(game)
+    image = image_src if image_src.startswith('http') else site_url + image_src
+    ld = {'@context': 'https://schema.org', '@type': 'VideoGame', 'name': title,
+          'url': page_url(site_url, game), 'image': image, 'description': description(game),
+          'gamePlatform': 'Web browser'}
+    if game.get('categories'):
+        ld['genre'] = game['categories']
+    links = ''
+    if similar:
+        items = ''.join(f'        <li><a href="/play/{quote(g.get("directory", ""))}.html">{html.escape(g.get("name", ""))}</a></li>\n'
+                        for g in similar)
+        links = f"      <h2>Similar games</h2>\n      <ul>\n{items}      </ul>\n"
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title), description=html.escape(description(game)), url=page_url(site_url, game),
+        image=html.escape(image), image_src=html.escape(image_src), play=html.escape(loader_link(game)),
+        # Keep "</script>" in a name from closing the JSON-LD block
+        ld_json=json.dumps(ld, ensure_ascii=False).replace('</', '<\\/'), similar=links)
+
+
+def sitemap_pages(site_url):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, changefreq, priority in PAGES:
+        loc = f"{site_url}/{path}"
+        yield f"  <url><loc>{escape(loc)}</loc><changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>\n"
+    yield '</urlset>\n'
+
+
+def sitemap_games(site_url, games):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for game in games:
+        yield f"  <url><loc>{escape(page_url(site_url, game))}</loc><changefreq>monthly</changefreq><priority>0.6</priority></url>\n"
+    yield '</urlset>\n'
+
+
+def sitemap_index(site_url, names):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for name in names:
+        yield f"  <sitemap><loc>{escape(site_url)}/sitemaps/{name}</loc></sitemap>\n"
+    yield '</sitemapindex>\n'
+
+
+def rss_feed(site_url, games):
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0">\n<channel>\n'
+           f"  <title>Nova Hub - New Games</title>\n  <link>{escape(site_url)}/</link>\n"
+           "  <description>The newest games on Nova Hub</description>\n")
+    for game in games:
+        url = page_url(site_url, game)
+        yield (f"  <item><title>{escape(game.get('name', ''))}</title><link>{escape(url)}</link>"
+               f"<guid isPermaLink=\"true\">{escape(url)}</guid><description>{escape(description(game))}</description>"
+               + ''.join(f"<category>{escape(c)}</category>" for c in game.get('categories') or [])
+               + "</item>\n")
+    yield '</channel>\n</rss>\n'
+
+
+def json_feed(site_url, games):
+    head = {'version': 'https://jsonfeed.org/version/1.1', 'title': 'Nova Hub - New Games',
+            'home_page_url': site_url + '/', 'feed_url': site_url + '/feed.json'}
+    yield json.dumps(head, indent=2, ensure_ascii=False)[:-2] + ',\n  "items": [\n'
+    for i, game in enumerate(games):
+        image = image_path(game)
+        item = {'id': page_url(site_url, game), 'url': page_url(site_url, game), 'title': game.get('name', ''),
+                'content_text': description(game), 'image': image if image.startswith('http') else site_url + image,
+                'tags': game.get('categories') or []}
+        yield '    ' + json.dumps(item, ensure_ascii=False) + (',\n' if i < len(games) - 1 else '\n')
+    yield '  ]\n}\n'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_if_changed(path, chunks, dry_run=False):
+    """Stream chunks to path, replacing it only if the content differs. -> True if it changed."""
+    path = Path(path)
+    old = file_sha256(path) if path.is_file() else None
+    digest = hashlib.sha256()
+    tmp_path = path.with_name(path.name + '.tmp')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            digest.update(data)
+            f.write(data)
+    if digest.hexdigest() == old or dry_run:
+        tmp_path.unlink()
+        return digest.hexdigest() != old
+    os.replace(tmp_path, path)
+    return True
+
+
+def load_similar(games):
+    """{directory: [similar game, ...]} from data/similar.json, if it's there"""
+    try:
+        table = json.loads(SIMILAR_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    by_directory = {g.get('directory'): g for g in games}
+    similar = {}
+    for directory, neighbors in zip(table.get('ids', []), table.get('neighbors', [])):
+        found = [by_directory[table['ids'][i]] for i in neighbors if table['ids'][i] in by_directory]
+        similar[directory] = found[:SIMILAR_LINKS]
+    return similar
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate sitemaps, game landing pages and feeds')
+    parser.add_argument('--games-json', default=str(GAMES_JSON_PATH), help='Path to games.json')
+    parser.add_argument('--site-url', default=SITE_URL, help=f'Public site URL (default {SITE_URL}, or $SITE_URL)')
+    parser.add_argument('--feed-size', type=int, default=FEED_SIZE, help=f'Games in the feeds (default {FEED_SIZE})')
+    parser.add_argument('--dry-run', action='store_true', help="Report what would change, write nothing")
+    args = parser.parse_args()
+
+    start = time.time()
+    site_url = args.site_url.rstrip('/')
+    games = [g for g in load_games(args.games_json) if g.get('directory')]
+    similar = load_similar(games)
+    changed = []
+
+    def write(path, chunks):
+        if write_if_changed(path, chunks, args.dry_run):
+            changed.append(Path(path).relative_to(ROOT_DIR).as_posix())
+
+    for game in games:
+        write(PLAY_DIR / f"{game['directory']}.html", [game_page(site_url, game, similar.get(game['directory']))])
+    wanted = {f"{g['directory']}.html" for g in games}
+    stale = [p for p in PLAY_DIR.glob('*.html') if p.name not in wanted] if PLAY_DIR.is_dir() else []
+
+    names = ['pages.xml']
+    write(SITEMAPS_DIR / 'pages.xml', sitemap_pages(site_url))
+    for n, offset in enumerate(range(0, len(games), SITEMAP_LIMIT), 1):
+        names.append(f"games-{n}.xml")
+        write(SITEMAPS_DIR / names[-1], sitemap_games(site_url, games[offset:offset + SITEMAP_LIMIT]))
+    stale += [p for p in SITEMAPS_DIR.glob('*.xml') if p.name not in names] if SITEMAPS_DIR.is_dir() else []
+    write(SITEMAP_PATH, sitemap_index(site_url, names))
+
+    # games.json is appended to as games are added, so its tail is the newest
+    newest = games[::-1][:args.feed_size]
+    write(FEED_PATH, rss_feed(site_url, newest))
+    write(JSON_FEED_PATH, json_feed(site_url, newest))
+
+    for path in stale:
+        print(f"  - {path.relative_to(ROOT_DIR).as_posix()}")
+        if not args.dry_run:
+            path.unlink()
+    for rel in changed[:20]:
+        print(f"  ✓ {rel}")
+    if len(changed) > 20:
+        print(f"  ... and {len(changed) - 20} more")
+    print(f"\n{len(games)} games: {len(changed)} files {'would change' if args.dry_run else 'written'}, "
+          f"{len(stale)} removed in {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@
  *   node scripts/upload-game-to-r2.js semag/happywheels  # Upload single game
  *
  * R2 keys: semag/{gameName}/index.html, semag/{gameName}/image.png, etc.
+ *
+ * Re-uploads every file. For deploys of an existing game, scripts/r2_sync.py
+ * uploads only the files that changed.
  */
 
 const { execSync } = require('child_process');
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Downloads that are checked while they stream, plus a per-game manifest.
+
+download() hashes (sha256) and counts bytes as the response streams to a
+temp file, compares the byte count with Content-Length, sniffs the first
+bytes against the file extension (an HTML error page saved as game.js, a
+truncated or non-wasm .wasm, an S3 AccessDenied XML as an image) and only
+then moves the file into place. Every file that lands is recorded in
+<game>/nova-manifest.json with its size, hash, mime, source URL and
+validators, so the next run sends If-None-Match/If-Modified-Since and skips
+files that haven't changed upstream, and files whose new bytes hash the same
+aren't rewritten.
+
+Usage:
+    python scripts/verified_download.py verify non-semag/some-game
+    python scripts/verified_download.py verify --all
+    python scripts/verified_download.py build non-semag/some-game
+    python scripts/verified_download.py fetch https://example.com/game.wasm non-semag/some-game/Build/game.wasm
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import http_client
+from novahub_config import GAMES_DIR, ROOT_DIR
+
+MANIFEST_NAME = 'nova-manifest.json'
+# Rewriting the manifest after every file is quadratic for games with hundreds of assets.
+# A crash loses at most this many records; those files are simply fetched unconditionally next time.
+SAVE_EVERY = 50
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 512
+
+# First-bytes signatures -> kind
+MAGIC = [
+    (b'\x00asm', 'wasm'),
+    (b'\x89PNG', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF8', 'gif'),
+    (b'\x1f\x8b', 'gzip'),
+    (b'PK\x03\x04', 'zip'),
+    (b'UnityWebData', 'unitydata'),
+    (b'UnityFS', 'unitybundle'),
+    (b'FWS', 'swf'), (b'CWS', 'swf'), (b'ZWS', 'swf'),
+    (b'OggS', 'ogg'),
+    (b'ID3', 'mp3'),
+    (b'wOFF', 'font'), (b'wOF2', 'font'), (b'\x00\x01\x00\x00', 'font'), (b'OTTO', 'font'),
+    (b'\x00\x00\x01\x00', 'ico'),
+]
+
+# What each extension may legitimately contain. Extensions not listed only
+# have to not be an HTML/XML error page.
+EXPECTED = {
+    '.wasm': {'wasm'},
+    '.png': {'png'},
+    '.jpg': {'jpeg'}, '.jpeg': {'jpeg'},
+    '.gif': {'gif'},
+    '.webp': {'webp'},
+    '.ico': {'ico', 'png'},
+    '.swf': {'swf'},
+    '.ogg': {'ogg'},
+    '.gz': {'gzip'},
+    '.zip': {'zip'},
+    '.woff': {'font'}, '.woff2': {'font'}, '.ttf': {'font'}, '.otf': {'font'},
+    '.mp3': {'mp3', 'binary'},
+    '.m4a': {'mp4'}, '.mp4': {'mp4'},
+    '.html': {'html', 'text'}, '.htm': {'html', 'text'},
+    '.svg': {'svg', 'xml', 'text'},
+    '.xml': {'xml', 'text'},
+}
+# Formats that are never legitimately an HTML page
+NOT_HTML = {'.js', '.mjs', '.css', '.json', '.wasm', '.data', '.unityweb', '.br', '.mem', '.txt', '.atlas',
+            '.bin', '.pck', '.fnt'}
+
+MIME_BY_KIND = {
+    'wasm': 'application/wasm', 'png': 'image/png', 'jpeg': 'image/jpeg', 'gif': 'image/gif',
+    'webp': 'image/webp', 'gzip': 'application/gzip', 'zip': 'application/zip', 'swf': 'application/x-shockwave-flash',
+    'ogg': 'audio/ogg', 'mp3': 'audio/mpeg', 'mp4': 'video/mp4', 'font': 'font/woff2', 'ico': 'image/x-icon',
+    'html': 'text/html', 'xml': 'application/xml', 'svg': 'image/svg+xml', 'json': 'application/json',
+    'unitydata': 'application/octet-stream', 'unitybundle': 'application/octet-stream',
+    'text': 'text/plain', 'binary': 'application/octet-stream',
+}
+
+
+class IntegrityError(Exception):
+    """Downloaded bytes don't look like what the URL/extension promised"""
+
+
+def sniff(head):
+    """Guess the kind of content from its first bytes"""
+    for magic, kind in MAGIC:
+        if head.startswith(magic):
+            return kind
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    if head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'mp3'
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith((b'<!doctype html', b'<html', b'<head', b'<body')):
+        return 'html'
+    if text.startswith(b'<svg') or (text.startswith(b'<?xml') and b'<svg' in text):
+        return 'svg'
+    if text.startswith(b'<?xml') or text.startswith(b'<error'):
+        return 'xml'
+    if text[:1] in (b'{', b'['):
+        return 'json'
+    try:
+        head.decode('utf-8')
+        return 'text'
+    except UnicodeDecodeError:
+        return 'binary'
+
+
+def check_kind(path, kind, head):
+    """Raise IntegrityError when the sniffed kind can't be right for this file"""
+    ext = path.suffix.lower()
+    lowered = head.lower()
+    if kind in ('html', 'xml') and (b'accessdenied' in lowered or b'access denied' in lowered or b'nosuchkey' in lowered):
+        raise IntegrityError(f"got an access-denied/error page instead of {path.name}")
+    expected = EXPECTED.get(ext)
+    if expected is not None and kind not in expected:
+        raise IntegrityError(f"{path.name} looks like {kind}, expected {'/'.join(sorted(expected))}")
+    if ext in NOT_HTML and kind in ('html', 'xml'):
+        raise IntegrityError(f"got an HTML/XML page instead of {path.name}")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def game_root(path):
+    """Directory that owns the manifest for a file under non-semag/"""
+    path = Path(path).resolve()
+    games_dir = GAMES_DIR.resolve()
+    try:
+        parts = path.relative_to(games_dir).parts
+    except ValueError:
+        return path.parent
+    if parts[0] == 'games' and len(parts) > 2:
+        return games_dir / 'games' / parts[1]
+    return games_dir / parts[0] if len(parts) > 1 else games_dir
+
+
+class Manifest:
+    """<game>/nova-manifest.json: {relative path: {size, sha256, mime, url, etag, last_modified, fetched}}"""
+
+    def __init__(self, game_dir):
+        self.game_dir = Path(game_dir)
+        self.path = self.game_dir / MANIFEST_NAME
+        self.lock = threading.Lock()
+        self.files = {}
+        self.unsaved = 0
+        if self.path.exists():
+            self.files = json.loads(self.path.read_text(encoding='utf-8')).get('files', {})
+
+    def key(self, file_path):
+        return Path(file_path).resolve().relative_to(self.game_dir.resolve()).as_posix()
+
+    def get(self, file_path):
+        return self.files.get(self.key(file_path))
+
+    def record(self, file_path, entry):
+        """Add one file; the manifest is written every SAVE_EVERY records and by flush()"""
+        with self.lock:
+            self.files[self.key(file_path)] = entry
+            self.unsaved += 1
+            if self.unsaved >= SAVE_EVERY:
+                self.save()
+
+    def flush(self):
+        with self.lock:
+            if self.unsaved:
+                self.save()
+
+    def save(self):
+        self.unsaved = 0
+        self.game_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps({'version': 1, 'files': dict(sorted(self.files.items()))}, indent=2),
+                            encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def verify(self):
+        """-> [(relative path, problem)] for files missing or changed since they were recorded"""
+        problems = []
+        for rel, entry in sorted(self.files.items()):
+            path = self.game_dir / rel
+            if not path.exists():
+                problems.append((rel, 'missing'))
+            elif path.stat().st_size != entry['size']:
+                problems.append((rel, f"size {path.stat().st_size} != {entry['size']}"))
+            elif file_sha256(path) != entry['sha256']:
+                problems.append((rel, 'hash mismatch'))
+        return problems
+
+
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+
+def manifest_for(file_path):
+    root = game_root(file_path)
+    with _manifests_lock:
+        if root not in _manifests:
+            if not _manifests:
+                atexit.register(flush_manifests)
+            _manifests[root] = Manifest(root)
+        return _manifests[root]
+
+
+def flush_manifests():
+    """Write every manifest download() has pending records for (also runs at exit)"""
+    with _manifests_lock:
+        manifests = list(_manifests.values())
+    for manifest in manifests:
+        manifest.flush()
+
+
+def download(url, dest, session=None, headers=None, timeout=30, use_manifest=True, progress=None):
+    """Stream url to dest, verifying as it goes.
+
+    Returns the manifest entry plus 'status' ('downloaded', 'unchanged' or
+    'not-modified'). Raises IntegrityError or requests exceptions; on any
+    failure dest is left as it was.
+    """
+    dest = Path(dest)
+    manifest = manifest_for(dest) if use_manifest else None
+    previous = manifest.get(dest) if manifest else None
+    request_headers = dict(headers or {})
+    if previous and previous.get('url') == url and dest.exists() and dest.stat().st_size == previous['size']:
+        if previous.get('etag'):
+            request_headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            request_headers['If-Modified-Since'] = previous['last_modified']
+
+    session = session or http_client.session_for(url)
+    with session.get(url, headers=request_headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return dict(previous, status='not-modified')
+        response.raise_for_status()
+        expected_wire = int(response.headers.get('Content-Length') or 0)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(dest.name + '.part')
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    if len(head) < SNIFF_BYTES:
+                        head = (head + chunk)[:SNIFF_BYTES]
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                    if progress:
+                        progress(size, expected_wire)
+            # Content-Length counts bytes on the wire, which differ from size when requests decodes gzip
+            wire = response.raw.tell() if response.headers.get('Content-Encoding') else size
+            if expected_wire and wire < expected_wire:
+                raise IntegrityError(f"truncated: got {wire} of {expected_wire} bytes")
+            kind = sniff(head)
+            check_kind(dest, kind, head)
+            sha256 = digest.hexdigest()
+            entry = {
+                'size': size,
+                'sha256': sha256,
+                'mime': (response.headers.get('Content-Type') or MIME_BY_KIND.get(kind, 'application/octet-stream')).split(';')[0],
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            }
+            if previous and previous['sha256'] == sha256 and dest.exists() and dest.stat().st_size == size:
+                tmp_path.unlink()
+                status = 'unchanged'  # Same bytes; keep the file (and its mtime) as it is
+            else:
+                os.replace(tmp_path, dest)
+                status = 'downloaded'
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    if manifest:
+        manifest.record(dest, entry)
+    return dict(entry, status=status)
+
+
+def build_manifest(game_dir):
+    """Record every file already in a game directory (no source URLs)"""
+    manifest = Manifest(game_dir)
+    for path in sorted(Path(game_dir).rglob('*')):
+        if not path.is_file() or path.name in (MANIFEST_NAME, MANIFEST_NAME + '.tmp'):
+            continue
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+        kind = sniff(head)
+        old = manifest.files.get(manifest.key(path), {})
+        manifest.files[manifest.key(path)] = {
+            'size': path.stat().st_size,
+            'sha256': file_sha256(path),
+            'mime': old.get('mime') or MIME_BY_KIND.get(kind, 'application/octet-stream'),
+            'url': old.get('url'),
+            'etag': old.get('etag'),
+            'last_modified': old.get('last_modified'),
+            'fetched': old.get('fetched'),
+        }
+    manifest.save()
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verified downloads and per-game manifests')
+    sub = parser.add_subparsers(dest='command', required=True)
+    verify_parser = sub.add_parser('verify', help='Check files against their manifest')
+    verify_parser.add_argument('dirs', nargs='*', help='Game directories')
+    verify_parser.add_argument('--all', action='store_true', help='Every game directory with a manifest')
+    build_parser = sub.add_parser('build', help='Create/refresh a manifest from files on disk')
+    build_parser.add_argument('dirs', nargs='+', help='Game directories')
+    fetch_parser = sub.add_parser('fetch', help='Download one URL with verification')
+    fetch_parser.add_argument('url')
+    fetch_parser.add_argument('dest')
+    args = parser.parse_args()
+
+    if args.command == 'fetch':
+        try:
+            result = download(args.url, args.dest)
+        except Exception as e:
+            print(f"✗ {args.url}: {e}")
+            sys.exit(1)
+        print(f"✓ {result['status']}: {args.dest} ({result['size']:,} bytes, sha256 {result['sha256'][:12]}…)")
+    elif args.command == 'build':
+        for game_dir in args.dirs:
+            manifest = build_manifest(game_dir)
+            print(f"✓ {manifest.path.relative_to(ROOT_DIR) if manifest.path.is_relative_to(ROOT_DIR) else manifest.path}: "
+                  f"{len(manifest.files)} files")
+    else:
+        dirs = [Path(d) for d in args.dirs]
+        if args.all:
+            dirs += [p.parent for p in sorted(GAMES_DIR.rglob(MANIFEST_NAME))]
+        bad = 0
+        for game_dir in dirs:
+            manifest = Manifest(game_dir)
+            if not manifest.files:
+                print(f"  ? {game_dir}: no manifest")
+                continue
+            problems = manifest.verify()
+            bad += bool(problems)
+            print(f"  {'✗' if problems else '✓'} {game_dir}: {len(manifest.files)} files, {len(problems)} problems")
+            for rel, problem in problems:
+                print(f"      {rel}: {problem}")
+        if bad:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()